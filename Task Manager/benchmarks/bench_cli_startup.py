@@ -0,0 +1,72 @@
+# benchmarks/bench_cli_startup.py
+"""
+Wall time of fresh `python -m cli` processes.
+
+    python benchmarks/bench_cli_startup.py [--runs 20] [--tasks 1000]
+
+Each run is a new interpreter (cold imports, new SQLite connection)
+listing one user's open tasks. A bare `python -c pass` gives the floor,
+and `import PyQt5.QtWidgets` shows what the GUI entry point pays before
+doing anything. Also checks that the CLI never imports Qt or asyncio.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from db import database as db  # noqa: E402
+
+
+def _time_runs(cmd, runs, env):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times), statistics.median(times)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--tasks", type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db.configure(path)
+        db.init_db()
+        db.add_user("bench", "pw")
+        me = db.validate_user("bench", "pw")[0]
+        db.add_tasks_bulk(me, ((f"task {i}", "", f"2026-{i % 12 + 1:02d}-01") for i in range(args.tasks)))
+        db.close()
+
+        env = dict(os.environ, TASK5_PASSWORD="pw")
+        cli = [sys.executable, "-m", "cli", "--db", path, "--user", "bench", "list", "--status", "open"]
+
+        trace = subprocess.run([sys.executable, "-X", "importtime"] + cli[1:], cwd=ROOT, env=env,
+                               check=True, capture_output=True, text=True).stderr
+        heavy = sorted({line.rsplit("|", 1)[-1].strip().split(".")[0]
+                        for line in trace.splitlines()
+                        if line.rsplit("|", 1)[-1].strip().startswith(("PyQt5", "asyncio"))})
+        print("heavy imports:", ", ".join(heavy) or "none")
+
+        print(f"{'command':<28} {'min ms':>8} {'median ms':>10}")
+        for name, cmd in (
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("python -m cli ... list", cli),
+            ("import PyQt5.QtWidgets", [sys.executable, "-c", "import PyQt5.QtWidgets"]),
+        ):
+            best, median = _time_runs(cmd, args.runs, env)
+            print(f"{name:<28} {best:>8.1f} {median:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_get_tasks.py
+"""
+get_tasks cost for one user while *other* users' rows grow.
+
+    python benchmarks/bench_get_tasks.py [--own 500] [--sizes 0,20000,200000]
+
+With idx_tasks_user_due the time should stay flat across sizes; pass
+--no-index to drop the index and see the full-scan + sort baseline.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import database as db  # noqa: E402
+
+
+def _fill(cur, user_id, n, rnd):
+    cur.executemany(
+        "INSERT INTO tasks (user_id, title, description, due_date) VALUES (?, ?, '', ?)",
+        ((user_id, f"task {i}", f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}")
+         for i in range(n)),
+    )
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--own", type=int, default=500, help="tasks owned by the measured user")
+    ap.add_argument("--sizes", default="0,20000,200000", help="other users' rows, comma separated")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--no-index", action="store_true")
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure(os.path.join(tmp, "bench.db"))
+        db.init_db()
+        if args.no_index:
+            with db.get_manager().write() as cur:
+                cur.execute("DROP INDEX idx_tasks_user_due")
+        db.add_user("me", "x")
+        me = db.validate_user("me", "x")[0]
+        others = []
+        for i in range(50):
+            db.add_user(f"other{i}", "x")
+            others.append(db.validate_user(f"other{i}", "x")[0])
+        with db.get_manager().write() as cur:
+            _fill(cur, me, args.own, rnd)
+
+        print(f"{'other rows':>12}  {'get_tasks ms':>12}")
+        have = 0
+        for size in (int(s) for s in args.sizes.split(",")):
+            with db.get_manager().write() as cur:
+                # spread the extra rows over 50 other users
+                while have < size:
+                    batch = min(10_000, size - have)
+                    _fill(cur, others[(have // batch) % len(others)], batch, rnd)
+                    have += batch
+            ms = _time(lambda: db.get_tasks(me), args.repeat) * 1000
+            print(f"{size:>12}  {ms:>12.3f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_search.py
+"""
+find_tasks(search=...) latency for one user while the table grows.
+
+    python benchmarks/bench_search.py [--own 2000] [--sizes 0,20000,200000]
+
+Compares the tasks_fts path with the LIKE fallback (forced by pretending
+FTS5 is missing).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import database as db  # noqa: E402
+
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu")
+
+
+def _vocabulary(rnd, size=5000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))))
+    words = sorted(words)
+    rnd.shuffle(words)
+    return words
+
+
+def _fill(cur, user_id, n, rnd, vocab, weights):
+    # Zipf-ish word frequencies, like real task text
+    cur.executemany(
+        "INSERT INTO tasks (user_id, title, description, due_date) VALUES (?, ?, ?, NULL)",
+        ((user_id, " ".join(rnd.choices(vocab, weights, k=3)),
+          " ".join(rnd.choices(vocab, weights, k=12)))
+         for _ in range(n)),
+    )
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--own", type=int, default=5000)
+    ap.add_argument("--sizes", default="0,20000,200000")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(7)
+    vocab = _vocabulary(rnd)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    # a common word, a mid-frequency word, a two-word prefix query, a miss
+    queries = (vocab[20], vocab[400], f"{vocab[60][:4]} {vocab[90][:4]}", "qqqq")
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure(os.path.join(tmp, "bench.db"))
+        db.init_db()
+        db.add_user("me", "x")
+        db.add_user("other", "x")
+        me = db.validate_user("me", "x")[0]
+        other = db.validate_user("other", "x")[0]
+        with db.get_manager().write() as cur:
+            _fill(cur, me, args.own, rnd, vocab, weights)
+
+        print(f"{'other rows':>10}  {'query':<14} {'hits':>6} {'fts ms':>8} {'like ms':>8}")
+        have = 0
+        for size in (int(s) for s in args.sizes.split(",")):
+            with db.get_manager().write() as cur:
+                _fill(cur, other, size - have, rnd, vocab, weights)
+            have = size
+            for q in queries:
+                hits = len(db.find_tasks(me, search=q))
+                fts = _best_ms(lambda: db.find_tasks(me, search=q), args.repeat)
+                db._fts = False
+                like = _best_ms(lambda: db.find_tasks(me, search=q), args.repeat)
+                db._fts = None
+                print(f"{size:>10}  {q:<14} {hits:>6} {fts:>8.2f} {like:>8.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_service.py
+"""
+TaskService under many concurrent coroutines.
+
+    python benchmarks/bench_service.py [--calls 5000] [--workers 4]
+
+Times N concurrent add() calls (coalesced into bulk inserts per loop
+iteration) against the same N calls each running db.add_task on the
+executor, then N concurrent query() calls.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import database as db  # noqa: E402
+from services.task_service import TaskService  # noqa: E402
+
+
+async def _timed(coros):
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*coros)
+    return time.perf_counter() - t0, results
+
+
+async def _scenarios(service, user_id, n):
+    rows = [(f"task {i}", "bench", f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}") for i in range(n)]
+
+    secs, tasks = await _timed(service.add(*row) for row in rows)
+    assert len({t.id for t in tasks}) == n
+    yield "add (batched)", secs
+
+    loop = asyncio.get_running_loop()
+    secs, _ = await _timed(
+        loop.run_in_executor(service._executor, db.add_task, user_id, *row) for row in rows
+    )
+    yield "add_task per call", secs
+
+    secs, _ = await _timed(service.query(status="open", due_on=row[2]) for row in rows)
+    yield "query", secs
+
+
+async def _main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure(os.path.join(tmp, "bench.db"))
+        db.init_db()
+        db.add_user("me", "x")
+        me = db.validate_user("me", "x")[0]
+        async with TaskService(me, max_workers=args.workers, config_dir=tmp) as service:
+            print(f"{'scenario':<20} {'calls':>7} {'total ms':>10} {'calls/s':>10}")
+            async for name, secs in _scenarios(service, me, args.calls):
+                print(f"{name:<20} {args.calls:>7} {secs * 1000:>10.1f} {args.calls / secs:>10.0f}")
+        db.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--calls", type=int, default=5000)
+    ap.add_argument("--workers", type=int, default=4)
+    asyncio.run(_main(ap.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_task_memory.py
+"""
+Memory and load time of one user's tasks: sqlite3.Row vs db.models.Task.
+
+    python benchmarks/bench_task_memory.py [--rows 100000] [--days 365]
+
+Row keeps every due date as its own string and leaves parsing to each
+reader; Task parses it once on load and shares equal dates, priorities
+and group names between records.
+"""
+import argparse
+import gc
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import database as db  # noqa: E402
+from db.models import Task  # noqa: E402
+
+
+def _load(conn, user_id, factory):
+    cur = conn.cursor()
+    cur.row_factory = factory
+    return cur.execute(
+        f"SELECT {db.TASK_COLUMNS} FROM {db.TASK_FROM} WHERE t.user_id = ?", (user_id,)
+    ).fetchall()
+
+
+def _measure(conn, user_id, factory, parse):
+    """(rows, ms, KiB held) for loading every task and reading each due date once."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows = _load(conn, user_id, factory)
+    dues = [parse(r) for r in rows]
+    ms = (time.perf_counter() - t0) * 1000
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dues
+    return len(rows), ms, held / 1024
+
+
+def _row_due(row):
+    return date.fromisoformat(row["due_date"]) if row["due_date"] else None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--days", type=int, default=365, help="distinct due dates to spread tasks over")
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(42)
+    start = date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure(os.path.join(tmp, "bench.db"))
+        db.init_db()
+        db.add_user("me", "x")
+        me = db.validate_user("me", "x")[0]
+        db.add_tasks_bulk(me, (
+            (f"task {i}", "", (start + timedelta(days=rnd.randrange(args.days))).isoformat(),
+             rnd.choice(("low", "medium", "high")), rnd.choice((None, "School", "Work", "Home")))
+            for i in range(args.rows)
+        ))
+
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        print(f"{'record':<12} {'rows':>8} {'ms':>9} {'KiB held':>10}")
+        for name, factory, parse in (
+            ("sqlite3.Row", sqlite3.Row, _row_due),
+            ("Task", Task.from_row, lambda t: t.due),
+        ):
+            n, ms, kib = _measure(conn, me, factory, parse)
+            print(f"{name:<12} {n:>8} {ms:>9.1f} {kib:>10.0f}")
+        conn.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
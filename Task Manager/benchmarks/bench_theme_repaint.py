@@ -0,0 +1,112 @@
+# benchmarks/bench_theme_repaint.py
+"""
+Repaint cost of each theme / render mode, and of re-applying stylesheets.
+
+    python benchmarks/bench_theme_repaint.py [--tasks 2000] [--frames 50]
+
+Builds a MainWindow under the offscreen Qt platform and, for every
+theme x render mode, times full-window repaints (repaint() and grab())
+plus scrolling repaints of the task list. Aurora in quality mode carries
+the QGraphicsDropShadowEffect glow; performance mode is flat with no
+effects. Also times building a stylesheet against a compiled_qss() hit,
+a theme switch against re-applying the same key (skipped), and an accent
+switch (the main window's own small sheet).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from db import database as db  # noqa: E402
+from ui.themes import RENDER_MODES, compiled_qss  # noqa: E402
+
+THEMES = ("aurora", "dark", "light")
+
+
+def _ms_per(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / n
+
+
+def _settle(app, w):
+    w.workers.drain()
+    for _ in range(5):
+        app.processEvents()
+
+
+def _scroll_frame(app, w):
+    bar = w.task_list.verticalScrollBar()
+    bar.setValue((bar.value() + bar.pageStep()) % max(1, bar.maximum()))
+    w.task_list.viewport().repaint()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--tasks", type=int, default=2000)
+    ap.add_argument("--frames", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)   # app_settings.json and per-user config land here
+        db.configure(os.path.join(tmp, "bench.db"))
+        db.init_db()
+        db.add_user("bench", "pw")
+        user = db.validate_user("bench", "pw")
+        db.add_tasks_bulk(user[0], ((f"task {i}", "description " * (i % 5), f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+                                    for i in range(args.tasks)))
+
+        app = QApplication([])
+        from ui.main_window import MainWindow
+        w = MainWindow(user)
+        w.resize(1100, 750)
+        w.show()
+        _settle(app, w)
+        w.tabs.setCurrentIndex(1)   # build the lazy Calendar tab so its glow is counted
+        w.tabs.setCurrentIndex(0)
+        _settle(app, w)
+
+        print(f"{'theme':<8} {'mode':<12} {'effects':>7} {'repaint ms':>11} {'grab ms':>8} {'scroll ms':>10}")
+        for theme in THEMES:
+            for mode in RENDER_MODES:
+                w.settings.set("render_mode", mode)
+                w.on_theme_changed(theme)
+                _settle(app, w)
+                effects = sum(1 for name in ("task_list", "task_details", "search_input", "due_date_input",
+                                             "level_bar", "calendar", "cal_tasks_list")
+                              if getattr(w, name).graphicsEffect() is not None)
+                repaint = _ms_per(w.repaint, args.frames)
+                grab = _ms_per(w.grab, args.frames)
+                scroll = _ms_per(lambda: _scroll_frame(app, w), args.frames)
+                print(f"{theme:<8} {mode:<12} {effects:>7} {repaint:>11.2f} {grab:>8.2f} {scroll:>10.2f}")
+
+        print()
+        key = ("aurora", "performance")
+        build = _ms_per(lambda: compiled_qss.__wrapped__(*key), 200)
+        hit = _ms_per(lambda: compiled_qss(*key), 200)
+        print(f"compile stylesheet      {build:8.3f} ms   cached lookup {hit:8.4f} ms")
+
+        themes = iter(THEMES * args.frames)
+        switch = _ms_per(lambda: w.apply_theme(next(themes)), args.frames)
+        w.apply_theme("light")
+        same = _ms_per(lambda: w.apply_theme("light"), args.frames)
+        print(f"apply_theme (switch)    {switch:8.2f} ms   same key (skipped) {same:8.4f} ms")
+
+        accents = iter(["#7AA2F7", "#4caf50", "#ff9800"] * args.frames)
+        accent = _ms_per(lambda: w.apply_accent(next(accents)), args.frames)
+        print(f"apply_accent (switch)   {accent:8.2f} ms")
+
+        w.close()
+        w.workers.wait()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
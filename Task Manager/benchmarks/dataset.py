@@ -0,0 +1,125 @@
+# benchmarks/dataset.py
+"""
+Seeded synthetic data: N users x M tasks, plus the settings files.
+
+    python benchmarks/dataset.py OUT_DIR [--users 5] [--tasks 2000] [--seed 1]
+
+Writes OUT_DIR/tasks.db (db.DB_FILE), OUT_DIR/app_settings.json and a
+user_settings/<id>.json completion log per user, i.e. the layout the app
+expects in its working directory. The same seed and sizes always give the
+same rows; due dates are relative to --today (default: today) so
+"overdue", "due today" and "upcoming" keep their meaning.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import database as db  # noqa: E402
+from services.config_files import USER_CONFIG_DIR, user_config_path, write_json_atomic  # noqa: E402
+
+PASSWORD = "bench"
+GROUPS = ["School", "Work", "Home", "Personal", "Health", "Errands", "Side project", "Finance"]
+PRIORITIES = ["low", "medium", "high"]
+PRIORITY_WEIGHTS = [55, 30, 15]
+
+_VERBS = ["Finish", "Review", "Email", "Call", "Buy", "Plan", "Fix", "Write", "Read", "Book",
+          "Prepare", "Submit", "Clean", "Schedule", "Update", "Draft", "Pay", "Pick up"]
+_OBJECTS = ["essay", "lab report", "slides", "groceries", "dentist appointment", "budget",
+            "bike tyre", "project proposal", "chapter 4", "invoice", "flight", "meeting notes",
+            "presentation", "laundry", "tax forms", "birthday gift", "README", "bug report"]
+_WORDS = ("remember to check the notes from last week and bring everything needed before "
+          "the deadline ask about the details send a copy to the team double check the "
+          "numbers keep it short follow up afterwards").split()
+
+
+def _due(rnd, today):
+    """None (15%), overdue, today, this week or the coming months (weighted)."""
+    r = rnd.random()
+    if r < 0.15:
+        return None
+    if r < 0.30:
+        return (today - timedelta(days=rnd.randint(1, 90))).isoformat()
+    if r < 0.38:
+        return today.isoformat()
+    if r < 0.65:
+        return (today + timedelta(days=rnd.randint(1, 7))).isoformat()
+    return (today + timedelta(days=rnd.randint(8, 365))).isoformat()
+
+
+def _description(rnd):
+    if rnd.random() < 0.3:
+        return ""
+    return " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(4, 40))).capitalize() + "."
+
+
+def task_rows(rnd, n, today):
+    """n (title, description, due_date, priority, group) tuples."""
+    groups = rnd.sample(GROUPS, rnd.randint(2, len(GROUPS)))
+    for i in range(n):
+        yield (f"{rnd.choice(_VERBS)} {rnd.choice(_OBJECTS)} #{i}",
+               _description(rnd),
+               _due(rnd, today),
+               rnd.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+               rnd.choice(groups) if rnd.random() < 0.8 else None)
+
+
+def generate(out_dir, users=5, tasks=2000, seed=1, today=None, done_ratio=0.3):
+    """
+    Build the dataset in out_dir (existing files there are replaced).
+    Returns {"db", "settings", "users": [(id, username), ...], "tasks"}.
+    Leaves db configured on the new file.
+    """
+    rnd = random.Random(seed)
+    today = today or date.today()
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, os.path.basename(db.DB_FILE))
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db.configure(path)
+    db.init_db()
+
+    config_dir = os.path.join(out_dir, USER_CONFIG_DIR)
+    os.makedirs(config_dir, exist_ok=True)
+    made = []
+    for u in range(users):
+        name = f"user{u:03d}"
+        db.add_user(name, PASSWORD)
+        user_id = db.validate_user(name, PASSWORD)[0]
+        ids = db.add_tasks_bulk(user_id, task_rows(rnd, tasks, today))
+        done = [i for i in ids if rnd.random() < done_ratio]
+        with db.get_manager().write() as cur:
+            cur.executemany("UPDATE tasks SET completed = 1 WHERE id = ?", ((i,) for i in done))
+            cur.execute("UPDATE users SET xp = ? WHERE id = ?", (10 * len(done), user_id))
+        streak = rnd.randint(0, 30)
+        log = sorted({(today - timedelta(days=d)).isoformat()
+                      for d in list(range(1, streak + 1)) + rnd.sample(range(31, 200), 20)})
+        write_json_atomic(user_config_path(user_id, config_dir), {"completion_log": log})
+        made.append((user_id, name))
+
+    settings = os.path.join(out_dir, "app_settings.json")
+    write_json_atomic(settings, {"theme": "aurora", "accent": "#7AA2F7", "render_mode": "quality"})
+    return {"db": path, "settings": settings, "users": made, "tasks": users * tasks}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("out_dir")
+    ap.add_argument("--users", type=int, default=5)
+    ap.add_argument("--tasks", type=int, default=2000, help="per user")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--today", type=date.fromisoformat, help="YYYY-MM-DD anchor for due dates")
+    args = ap.parse_args(argv)
+    info = generate(args.out_dir, args.users, args.tasks, args.seed, args.today)
+    db.close()
+    print(f"{info['tasks']} tasks for {len(info['users'])} users -> {info['db']} "
+          f"(password {PASSWORD!r})")
+
+
+if __name__ == "__main__":
+    main()
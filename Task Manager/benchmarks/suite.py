@@ -0,0 +1,271 @@
+# benchmarks/suite.py
+"""
+Timed scenarios over a generated dataset, written as JSON for comparison.
+
+    python benchmarks/suite.py [--users 5] [--tasks 2000] [--seed 1] [--repeat 10]
+                               [--out results.json] [--compare baseline.json]
+                               [--only get_tasks,export_json]
+
+Builds the data with benchmarks/dataset.py (in a temp dir, or --data-dir),
+then times each scenario --repeat times after one warm-up run. The GUI
+scenarios run a real MainWindow for the first user under the offscreen
+Qt platform, with the data dir as the working directory:
+
+  get_tasks              db.get_tasks for every user
+  refresh_tasks          MainWindow.refresh_tasks, rendered and delivered
+  refresh_calendar_marks month marks with the count/paint caches dropped
+                         (counts read on a worker, painted on delivery)
+  calendar_marks_cached  the same with warm caches (nothing changed)
+  reminders_check        ReminderScheduler.check from a cold start
+  import_json            transfer.import_file of one user's export
+  export_json/_csv       transfer.export_file of one user's tasks
+
+--out gets {"meta": {...}, "scenarios": {name: {"runs_ms": [...],
+"min_ms", "median_ms", "mean_ms"}}}; --compare prints median ratios
+against an earlier file.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.dataset import generate, PASSWORD  # noqa: E402
+from db import database as db  # noqa: E402
+from db import transfer  # noqa: E402
+
+
+# --- Scenarios --------------------------------------------------------------
+# each takes the context and returns (run, reset): run() is timed, reset()
+# (if any) restores the starting state before every run, untimed
+
+def s_get_tasks(ctx):
+    ids = [uid for uid, _ in ctx["users"]]
+    return (lambda: [db.get_tasks(uid) for uid in ids]), None
+
+
+def s_refresh_tasks(ctx):
+    w = ctx["window"]
+
+    def run():
+        w.refresh_tasks()
+        w.scheduler.flush()
+        w.workers.drain()
+        w.scheduler.flush()
+    return run, None
+
+
+def s_refresh_calendar_marks(ctx):
+    marker = ctx["window"].calendar_marker
+
+    w = ctx["window"]
+
+    def reset():
+        marker.counts._periods.clear()
+        marker._painted.clear()
+
+    def run():
+        w.refresh_calendar_marks()
+        w.workers.drain()   # counts are read on a worker, marks painted on delivery
+    return run, reset
+
+
+def s_calendar_marks_cached(ctx):
+    return ctx["window"].refresh_calendar_marks, None
+
+
+def s_reminders_check(ctx):
+    w = ctx["window"]
+    today = date.today().isoformat()
+
+    def reset():
+        with db.get_manager().write() as cur:
+            cur.execute("DELETE FROM reminders WHERE day = ?", (today,))
+        w.reminders._day = None
+        w.notifications.dismiss(list(w.notifications._items))
+
+    def run():
+        w.reminders.check()
+        w.workers.drain()
+    return run, reset
+
+
+def s_import_json(ctx):
+    counter = iter(range(1_000_000))
+    target = {}
+
+    def reset():
+        name = f"import{next(counter)}"
+        db.add_user(name, PASSWORD)
+        target["id"] = db.validate_user(name, PASSWORD)[0]
+    return (lambda: transfer.import_file(target["id"], ctx["export_json"])), reset
+
+
+def _export(fmt):
+    def scenario(ctx):
+        uid, name = ctx["users"][0]
+        out = os.path.join(ctx["dir"], f"bench-export.{fmt}")
+        return (lambda: transfer.export_file(uid, name, out, fmt)), None
+    return scenario
+
+
+SCENARIOS = {
+    "get_tasks": s_get_tasks,
+    "refresh_tasks": s_refresh_tasks,
+    "refresh_calendar_marks": s_refresh_calendar_marks,
+    "calendar_marks_cached": s_calendar_marks_cached,
+    "reminders_check": s_reminders_check,
+    "import_json": s_import_json,
+    "export_json": _export("json"),
+    "export_csv": _export("csv"),
+}
+
+
+# --- Runner -----------------------------------------------------------------
+
+def _measure(run, reset, repeat):
+    times = []
+    for i in range(repeat + 1):
+        if reset:
+            reset()
+        t0 = time.perf_counter()
+        run()
+        if i:   # the first run is a warm-up
+            times.append((time.perf_counter() - t0) * 1000)
+    return {
+        "runs_ms": [round(t, 3) for t in times],
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+    }
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _open_window(ctx):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QT_VERSION_STR
+
+    ctx["app"] = QApplication.instance() or QApplication([])
+    from ui.main_window import MainWindow
+
+    uid, name = ctx["users"][0]
+    w = MainWindow(db.validate_user(name, PASSWORD))
+    w.resize(1100, 750)
+    w.show()
+    w.workers.drain()
+    w.tabs.setCurrentIndex(1)   # build the lazy Calendar tab
+    w.scheduler.flush()
+    w.workers.drain()
+    ctx["window"] = w
+    return QT_VERSION_STR
+
+
+def run_suite(args):
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown scenario(s): {', '.join(unknown)}")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.abspath(args.data_dir or tmp)
+        t0 = time.perf_counter()
+        info = generate(data_dir, args.users, args.tasks, args.seed)
+        gen_ms = (time.perf_counter() - t0) * 1000
+        os.chdir(data_dir)      # app_settings.json and user_settings/ as the app sees them
+        ctx = {"dir": data_dir, "users": info["users"]}
+
+        uid, name = info["users"][0]
+        ctx["export_json"] = os.path.join(data_dir, "bench-source.json")
+        transfer.export_file(uid, name, ctx["export_json"], "json")
+
+        qt_version = None
+        if any(n in ("refresh_tasks", "refresh_calendar_marks", "calendar_marks_cached",
+                     "reminders_check") for n in names):
+            qt_version = _open_window(ctx)
+
+        results = {}
+        for name in names:
+            run, reset = SCENARIOS[name](ctx)
+            results[name] = _measure(run, reset, args.repeat)
+            print(f"{name:<24} median {results[name]['median_ms']:>9.2f} ms   "
+                  f"min {results[name]['min_ms']:>9.2f} ms", flush=True)
+
+        if "window" in ctx:
+            ctx["window"].close()
+            ctx["window"].workers.wait()
+        db.close()
+        os.chdir(cwd)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": qt_version,
+            "users": args.users,
+            "tasks_per_user": args.tasks,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "generate_ms": round(gen_ms, 1),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current, baseline):
+    print(f"\n{'scenario':<24} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}")
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            print(f"{name:<24} {'-':>12} {now['median_ms']:>10.2f} {'new':>7}")
+            continue
+        ratio = now["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        print(f"{name:<24} {before['median_ms']:>12.2f} {now['median_ms']:>10.2f} {ratio:>6.2f}x")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--users", type=int, default=5)
+    ap.add_argument("--tasks", type=int, default=2000, help="per user")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--only", help="comma-separated scenario names")
+    ap.add_argument("--data-dir", help="generate here and keep it (default: a temp dir)")
+    ap.add_argument("--out", default="bench-results.json")
+    ap.add_argument("--compare", metavar="BASELINE", help="an earlier --out file")
+    args = ap.parse_args(argv)
+
+    out = os.path.abspath(args.out)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_suite(args)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"results -> {out}")
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# cli.py
+"""
+Headless Task5 commands for scripts and batch jobs.
+
+    python -m cli --user NAME list [--status open] [--group G] [--search TEXT]
+    python -m cli --user NAME add "Title" [--due 2025-09-01] [--priority high]
+    python -m cli --user NAME bulk-add < tasks.tsv
+    python -m cli --user NAME complete 12 13
+    python -m cli --user NAME import tasks.json
+    python -m cli --user NAME export tasks.csv [--format csv]
+
+The password comes from --password, then $TASK5_PASSWORD, then a prompt.
+Nothing here imports Qt (or asyncio): the process only pays for sqlite3.
+"""
+import argparse
+import os
+import sys
+
+from db import database as db
+from services.task_rules import validate_task
+
+PASSWORD_ENV = "TASK5_PASSWORD"
+# bulk-add rows per transaction, so huge stdin loads stream in bounded memory
+BULK_CHUNK = 5000
+
+
+class CliError(Exception):
+    pass
+
+
+# --- Commands -------------------------------------------------------------
+
+def cmd_list(user, args, out):
+    filters = {"status": args.status}
+    for key in ("search", "group", "priority", "due_on"):
+        value = getattr(args, key)
+        if value:
+            filters[key] = value
+    count = 0
+    for t in db.iter_tasks(user[0], **filters):
+        out.write(f"{t.id}\t{'done' if t.completed else 'open'}\t{t.due_date or '-'}\t"
+                  f"{t.priority}\t{t.group or '-'}\t{t.title}\n")
+        count += 1
+    return count
+
+
+def cmd_add(user, args, out):
+    try:
+        title, description, due = validate_task(args.title, args.description, args.due)
+    except ValueError as e:
+        raise CliError(str(e))
+    task_id = db.add_task(user[0], title, description, due, args.priority, args.group)
+    out.write(f"{task_id}\n")
+    return 1
+
+
+def _bulk_rows(lines, args, errors):
+    """stdin lines -> task tuples; bad lines are reported and skipped."""
+    for n, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        cols = line.split("\t") if args.tsv else [line]
+        cols += [""] * (5 - len(cols))
+        try:
+            title, description, due = validate_task(cols[0], cols[1], cols[2] or args.due)
+        except ValueError as e:
+            errors.append(f"line {n}: {e}")
+            continue
+        yield title, description, due, cols[3] or args.priority, cols[4] or args.group
+
+
+def cmd_bulk_add(user, args, out):
+    errors = []
+    added = 0
+    chunk = []
+    for row in _bulk_rows(sys.stdin, args, errors):
+        chunk.append(row)
+        if len(chunk) >= BULK_CHUNK:
+            added += len(db.add_tasks_bulk(user[0], chunk))
+            chunk = []
+    if chunk:
+        added += len(db.add_tasks_bulk(user[0], chunk))
+    for message in errors:
+        print(message, file=sys.stderr)
+    out.write(f"added {added}, skipped {len(errors)}\n")
+    if errors:
+        raise CliError(f"{len(errors)} line(s) skipped")
+    return added
+
+
+def cmd_complete(user, args, out):
+    from datetime import date
+    from services.config_files import user_config_path, log_completion
+
+    # one result per argument, in order: a repeated id is only completed once
+    results = [(tid, db.complete_task(tid, user[0])) for tid in args.ids]
+    done = sum(ok for _, ok in results)
+    if done:
+        log_completion(user_config_path(user[0]), date.today().isoformat())
+    for tid, ok in results:
+        out.write(f"{tid}\t{'completed' if ok else 'not open'}\n")
+    if done != len(args.ids):
+        raise CliError("some tasks were not open or not yours")
+    return done
+
+
+def cmd_import(user, args, out):
+    from db import transfer
+
+    try:
+        result = transfer.import_file(user[0], args.path)
+    except (OSError, ValueError) as e:
+        raise CliError(f"import failed: {e}")
+    out.write(f"imported {result['imported']}, skipped {result['skipped']}\n")
+    return result["imported"]
+
+
+def cmd_export(user, args, out):
+    from db import transfer
+
+    fmt = args.format or transfer.export_format_for(args.path)
+    try:
+        result = transfer.export_file(user[0], user[1], args.path, fmt)
+    except OSError as e:
+        raise CliError(f"export failed: {e}")
+    out.write(f"exported {result['exported']}\n")
+    return result["exported"]
+
+
+# --- Entry point ------------------------------------------------------------
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="python -m cli", description="Task5 without the GUI.")
+    ap.add_argument("--db", help=f"database file (default: {db.DB_FILE})")
+    ap.add_argument("--user", required=True)
+    ap.add_argument("--password", help=f"default: ${PASSWORD_ENV}, else prompt")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="tab-separated: id, status, due, priority, group, title")
+    p.add_argument("--status", choices=db.STATUSES, default="all")
+    p.add_argument("--search")
+    p.add_argument("--group")
+    p.add_argument("--priority", choices=db.PRIORITIES)
+    p.add_argument("--due-on", dest="due_on", metavar="YYYY-MM-DD")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("add", help="add one task, print its id")
+    p.add_argument("title")
+    p.add_argument("--description", default="")
+    p.add_argument("--due", metavar="YYYY-MM-DD")
+    p.add_argument("--priority", choices=db.PRIORITIES, default="low")
+    p.add_argument("--group")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("bulk-add", help="one title per stdin line")
+    p.add_argument("--tsv", action="store_true",
+                   help="lines are title<TAB>description<TAB>due<TAB>priority<TAB>group")
+    p.add_argument("--due", metavar="YYYY-MM-DD", help="for lines without one")
+    p.add_argument("--priority", choices=db.PRIORITIES, default="low")
+    p.add_argument("--group")
+    p.set_defaults(func=cmd_bulk_add)
+
+    p = sub.add_parser("complete", help="mark tasks done")
+    p.add_argument("ids", type=int, nargs="+")
+    p.set_defaults(func=cmd_complete)
+
+    p = sub.add_parser("import", help="import a JSON or NDJSON export")
+    p.add_argument("path")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export as json, ndjson or csv")
+    p.add_argument("path")
+    p.add_argument("--format", choices=("json", "ndjson", "csv"), help="default: from the extension")
+    p.set_defaults(func=cmd_export)
+    return ap
+
+
+def _password(args):
+    if args.password is not None:
+        return args.password
+    if os.environ.get(PASSWORD_ENV) is not None:
+        return os.environ[PASSWORD_ENV]
+    if not sys.stdin.isatty():
+        raise CliError(f"no password: pass --password or set ${PASSWORD_ENV}")
+    import getpass
+    return getpass.getpass(f"Password for {args.user}: ")
+
+
+def main(argv=None, out=sys.stdout):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.db:
+            db.configure(args.db)
+        db.init_db()
+        user = db.validate_user(args.user, _password(args))
+        if user is None:
+            raise CliError("invalid username or password")
+        args.func(user, args, out)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
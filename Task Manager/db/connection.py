@@ -0,0 +1,116 @@
+# db/connection.py
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Applied to every connection the manager opens. journal_mode=WAL lets the
+# per-thread readers run while the writer holds its transaction.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -8000,      # negative = KiB, so ~8 MB of page cache
+    "busy_timeout": 5000,     # ms to wait on a locked database
+}
+
+
+class ConnectionManager:
+    """
+    Owns the SQLite connections for one database file.
+
+    - one long-lived writer connection, serialized by a lock
+    - one reader connection per thread (created on first use)
+    - every connection keeps a prepared statement cache
+    """
+
+    def __init__(self, path, pragmas=None, cached_statements=256):
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.cached_statements = cached_statements
+
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._local = threading.local()
+        self._readers = []            # every reader we opened, for close()
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+    # -------------------- Opening --------------------
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,     # we issue BEGIN/COMMIT ourselves
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _check_open(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("ConnectionManager is closed")
+
+    # -------------------- Public API --------------------
+    def reader(self):
+        """Return this thread's read-only connection (autocommit mode)."""
+        self._check_open()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def release(self):
+        """Close this thread's reader, if any (call before a worker thread exits)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._readers_lock:
+            if conn in self._readers:
+                self._readers.remove(conn)
+        conn.close()
+
+    @contextmanager
+    def write(self):
+        """
+        Run a block inside one write transaction on the shared writer.
+        Commits on success, rolls back on any exception. Nested use on the
+        same thread joins the outer transaction.
+        """
+        with self._write_lock:
+            self._check_open()
+            if self._writer is None:
+                self._writer = self._open()
+            conn = self._writer
+            if conn.in_transaction:
+                yield conn.cursor()
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn.cursor()
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            with self._readers_lock:
+                for conn in self._readers:
+                    try:
+                        conn.close()
+                    except sqlite3.ProgrammingError:
+                        pass  # closed from its own thread already
+                self._readers.clear()
+            self._local = threading.local()
+            self._closed = True
@@ -1,106 +1,459 @@
 ﻿# db.py
-import sqlite3
-from datetime import datetime
+import re
+import threading
+from datetime import date, timedelta
+
+from db.connection import ConnectionManager
+from db.models import Task
+from db import migrations
 
 DB_FILE = "tasks.db"
+PRAGMAS = {}  # overrides on top of connection.DEFAULT_PRAGMAS and migrations.SCHEMA_PRAGMAS
+
+_manager = None
+_manager_lock = threading.Lock()
+_fts = None  # is tasks_fts present? probed once per manager
+
+# --- Connections ---------------------------------------------------------
+
+def configure(path=None, pragmas=None, cached_statements=256):
+    """
+    Point the module at a database file (and PRAGMAs); drops old connections.
+    Every connection also gets migrations.SCHEMA_PRAGMAS (foreign_keys=ON).
+    """
+    global DB_FILE, PRAGMAS, _manager, _fts
+    with _manager_lock:
+        _fts = None
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+        if path is not None:
+            DB_FILE = path
+        if pragmas is not None:
+            PRAGMAS = dict(pragmas)
+        _manager = ConnectionManager(DB_FILE, {**migrations.SCHEMA_PRAGMAS, **PRAGMAS}, cached_statements)
+    return _manager
+
+def get_manager() -> ConnectionManager:
+    if _manager is None:
+        return configure()
+    return _manager
 
 def get_connection():
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """This thread's shared reader connection. Do not close it."""
+    return get_manager().reader()
+
+def release_thread_connection():
+    """Worker threads call this when done so their reader doesn't linger."""
+    if _manager is not None:
+        _manager.release()
+
+def close():
+    global _manager, _fts
+    with _manager_lock:
+        _fts = None
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+def _read(sql, params=()):
+    return get_manager().reader().execute(sql, params)
+
+def _read_tasks(sql, params=()):
+    """_read for queries selecting TASK_COLUMNS: rows come back as Task objects."""
+    cur = get_manager().reader().cursor()
+    cur.row_factory = Task.from_row
+    return cur.execute(sql, params)
 
 def init_db():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            xp INTEGER DEFAULT 0
-        )
-    """)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            title TEXT NOT NULL,
-            description TEXT,
-            completed INTEGER DEFAULT 0,
-            due_date TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    """)
-    conn.commit()
-    conn.close()
+    """Bring the schema up to date. Safe to call on every startup."""
+    return migrations.migrate(get_manager())
 
 # --- Users ---------------------------------------------------------------
 
 def add_user(username: str, password: str) -> bool:
-    conn = get_connection(); cur = conn.cursor()
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN password TEXT DEFAULT ''")
-        conn.commit()
-    except Exception:
-        pass  # column already exists
-
-    cur.execute(
-        "INSERT OR IGNORE INTO users (username, password, xp) VALUES (?, ?, 0)",
-        (username.strip(), password.strip()),
-    )
-    created = (cur.rowcount == 1)
-    conn.commit(); conn.close()
-    return created
+    with get_manager().write() as cur:
+        cur.execute(
+            "INSERT OR IGNORE INTO users (username, password, xp) VALUES (?, ?, 0)",
+            (username.strip(), password.strip()),
+        )
+        return cur.rowcount == 1
 
 def validate_user(username: str, password: str):
-    conn = get_connection(); cur = conn.cursor()
-    cur.execute(
+    row = _read(
         "SELECT id, username, xp FROM users WHERE username=? AND password=?",
         (username.strip(), password.strip()),
-    )
-    row = cur.fetchone(); conn.close()
+    ).fetchone()
     return (row["id"], row["username"], row["xp"]) if row else None
 
-def add_task(user_id, title, description, due_date):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO tasks (user_id, title, description, due_date) VALUES (?, ?, ?, ?)",
-        (user_id, title, description, due_date)
-    )
-    conn.commit()
-    conn.close()
-
-def get_tasks(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, user_id, title, description, completed, due_date FROM tasks WHERE user_id = ? ORDER BY due_date, id",
-        (user_id,)
+def get_user_xp(user_id):
+    row = _read("SELECT xp FROM users WHERE id = ?", (user_id,)).fetchone()
+    return row['xp'] if row else 0
+
+def reset_xp(user_id):
+    with get_manager().write() as cur:
+        cur.execute("UPDATE users SET xp = 0 WHERE id = ?", (user_id,))
+
+# --- Groups --------------------------------------------------------------
+
+def _group_id(cur, user_id, name, create=True):
+    """Id of the user's group called name (created on demand); None if blank."""
+    name = (name or "").strip()
+    if not name:
+        return None
+    if create:
+        cur.execute("INSERT OR IGNORE INTO groups (user_id, name) VALUES (?, ?)", (user_id, name))
+    row = cur.execute(
+        "SELECT id FROM groups WHERE user_id = ? AND name = ?", (user_id, name)
+    ).fetchone()
+    return row["id"] if row else None
+
+def get_groups(user_id):
+    rows = _read("SELECT name FROM groups WHERE user_id = ? ORDER BY id", (user_id,))
+    return [r["name"] for r in rows]
+
+def add_group(user_id, name):
+    with get_manager().write() as cur:
+        return _group_id(cur, user_id, name)
+
+# --- Tasks ---------------------------------------------------------------
+
+PRIORITIES = ("low", "medium", "high")
+
+# add_tasks_bulk indexes batches at least this big in one FTS statement
+BULK_FTS_THRESHOLD = 500
+
+# every task read returns these columns, in this order (Task's constructor)
+TASK_COLUMNS = (
+    "t.id, t.user_id, t.title, t.description, t.completed, t.due_date, "
+    "t.priority, g.name AS group_name"
+)
+TASK_FROM = "tasks t LEFT JOIN groups g ON g.id = t.group_id"
+
+def normalize_priority(priority):
+    priority = (priority or "low").strip().lower()
+    return priority if priority in PRIORITIES else "low"
+
+def add_task(user_id, title, description, due_date, priority="low", group=None):
+    with get_manager().write() as cur:
+        cur.execute(
+            "INSERT INTO tasks (user_id, title, description, due_date, priority, group_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, title, description, due_date,
+             normalize_priority(priority), _group_id(cur, user_id, group))
+        )
+        return cur.lastrowid
+
+def add_tasks_bulk(user_id, tasks):
+    """
+    Insert many tasks in one transaction; return their ids in input order.
+
+    tasks: iterable of (title, description, due_date[, priority[, group]]).
+    Groups are created as needed, in the same transaction.
+    """
+    tasks = [tuple(t) + ("low", None)[max(0, len(t) - 3):] for t in tasks]
+    if not tasks:
+        return []
+    with get_manager().write() as cur:
+        group_ids = {}
+        for task in tasks:
+            name = (task[4] or "").strip()
+            if name and name not in group_ids:
+                group_ids[name] = _group_id(cur, user_id, name)
+
+        # AUTOINCREMENT hands out max(seq, max(id)) + 1, + 2, ... and we hold
+        # the write lock, so the new ids are one contiguous run
+        row = cur.execute(
+            "SELECT max(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tasks'), 0), "
+            "COALESCE((SELECT max(id) FROM tasks), 0))"
+        ).fetchone()
+        first = row[0] + 1
+        # per-row trigger work dominates big batches: index them in one
+        # statement instead (the DROP/CREATE is part of this transaction)
+        batch_fts = has_fts() and len(tasks) >= BULK_FTS_THRESHOLD
+        if batch_fts:
+            cur.execute("DROP TRIGGER IF EXISTS tasks_fts_ai")
+        cur.executemany(
+            "INSERT INTO tasks (user_id, title, description, due_date, priority, group_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((user_id, title, description, due_date, normalize_priority(priority),
+              group_ids.get((group or "").strip()))
+             for title, description, due_date, priority, group in tasks),
+        )
+        last = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()[0]
+        if batch_fts:
+            cur.execute(
+                "INSERT INTO tasks_fts (rowid, user_id, title, description) "
+                "SELECT id, user_id, title, description FROM tasks WHERE id BETWEEN ? AND ?",
+                (first, last),
+            )
+            cur.execute(migrations.FTS_INSERT_TRIGGER)
+        if last - first + 1 == len(tasks):
+            return list(range(first, last + 1))
+        # someone bypassed AUTOINCREMENT; read back what we inserted
+        return [r[0] for r in cur.execute(
+            "SELECT id FROM tasks WHERE id >= ? AND user_id = ? ORDER BY id", (first, user_id)
+        )]
+
+def get_tasks(user_id, group=None, priority=None):
+    return find_tasks(user_id, group=group, priority=priority)
+
+STATUSES = ("all", "open", "done")
+
+# markers wrapped around search hits by search_highlights()
+HL_START, HL_END = "\x02", "\x03"
+
+def has_fts():
+    """True when the tasks_fts index exists (SQLite built with FTS5)."""
+    global _fts
+    if _fts is None:
+        _fts = _read(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).fetchone() is not None
+    return _fts
+
+def _search_terms(text):
+    return re.findall(r"[^\W_]+", text or "")
+
+def fts_match_expression(text, user_id=None):
+    """
+    Search box text -> FTS5 query: every word must match title or
+    description as a prefix; optionally restricted to one user's rows.
+    """
+    terms = " ".join(f'"{term}"*' for term in _search_terms(text))
+    if not terms:
+        return ""
+    expr = f"{{title description}} : ({terms})"
+    if user_id is not None:
+        expr = f'user_id : "{int(user_id)}" AND ' + expr
+    return expr
+
+def _like_pattern(text):
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def build_task_query(user_id, search=None, status="all", group=None, priority=None,
+                     due_on=None, due_from=None, due_to=None, limit=None):
+    """
+    Build (sql, params) for the user's tasks matching every given filter.
+
+    search   words matched as prefixes via tasks_fts, best match first;
+             a case-insensitive substring test when FTS5 is unavailable
+    status   "all" | "open" | "done"
+    group    group name
+    priority "low" | "medium" | "high"
+    due_on / due_from / due_to   ISO dates; due_from/due_to are inclusive
+    """
+    where = ["t.user_id = ?"]
+    params = [user_id]
+    source, order = TASK_FROM, "t.due_date, t.id"
+    search = (search or "").strip()
+    match = fts_match_expression(search, user_id) if search and has_fts() else ""
+    if match:
+        source = ("tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid "
+                  "LEFT JOIN groups g ON g.id = t.group_id")
+        where.insert(0, "tasks_fts MATCH ?")
+        params.insert(0, match)
+        order = "tasks_fts.rank, " + order
+    elif search:
+        where.append("(t.title LIKE ? ESCAPE '\\' OR t.description LIKE ? ESCAPE '\\')")
+        params += [_like_pattern(search)] * 2
+    if status not in STATUSES:
+        raise ValueError(f"unknown status {status!r}")
+    if status != "all":
+        where.append("t.completed = ?")
+        params.append(1 if status == "done" else 0)
+    if group:
+        where.append("g.name = ?")
+        params.append(group)
+    if priority:
+        where.append("t.priority = ?")
+        params.append(normalize_priority(priority))
+    if due_on:
+        where.append("t.due_date = ?")
+        params.append(due_on)
+    if due_from:
+        where.append("t.due_date >= ?")
+        params.append(due_from)
+    if due_to:
+        where.append("t.due_date <= ?")
+        params.append(due_to)
+    sql = (f"SELECT {TASK_COLUMNS} FROM {source} WHERE " + " AND ".join(where)
+           + f" ORDER BY {order}")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+def find_tasks(user_id, **filters):
+    """The user's tasks matching filters (see build_task_query), one query."""
+    sql, params = build_task_query(user_id, **filters)
+    return _read_tasks(sql, params).fetchall()
+
+def iter_tasks(user_id, **filters):
+    """Like find_tasks, but tasks stream from one cursor instead of a list."""
+    sql, params = build_task_query(user_id, **filters)
+    yield from _read_tasks(sql, params)
+
+def count_tasks(user_id):
+    return _read("SELECT COUNT(*) FROM tasks WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+# date-range reads; all of these are answered from idx_tasks_user_due
+
+def tasks_due_on(user_id, day, status="all"):
+    """The user's tasks due on day (YYYY-MM-DD)."""
+    return find_tasks(user_id, due_on=day, status=status)
+
+def tasks_due_between(user_id, start=None, end=None, status="all", limit=None):
+    """Tasks due in [start, end] (either end open when None), by due date."""
+    return find_tasks(user_id, due_from=start, due_to=end, status=status, limit=limit)
+
+def overdue_tasks(user_id, today=None):
+    """Open tasks due before today (YYYY-MM-DD, default: the real today)."""
+    today = date.fromisoformat(today) if today else date.today()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    return find_tasks(user_id, due_to=yesterday, status="open")
+
+def due_date_counts(user_id, start, end):
+    """{"YYYY-MM-DD": (total, incomplete)} for due dates in [start, end]."""
+    rows = _read(
+        "SELECT due_date, COUNT(*), SUM(completed = 0) FROM tasks "
+        "WHERE user_id = ? AND due_date BETWEEN ? AND ? GROUP BY due_date",
+        (user_id, start, end),
     )
-    tasks = cur.fetchall()
-    conn.close()
-    return tasks
+    return {r[0]: (r[1], r[2]) for r in rows}
+
+def search_task_ids(user_id, search):
+    """Ids of the user's tasks matching search via tasks_fts, best first."""
+    match = fts_match_expression(search, user_id)
+    if not match or not has_fts():
+        return []
+    rows = _read("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ? ORDER BY rank", (match,))
+    return [r[0] for r in rows]
+
+def _highlight_py(text, terms):
+    if not text or not terms:
+        return text or ""
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: f"{HL_START}{m.group(0)}{HL_END}", text)
+
+def _snippet_py(text, terms, width=80):
+    text = text or ""
+    lowered = text.lower()
+    hits = [i for i in (lowered.find(t.lower()) for t in terms) if i >= 0]
+    start = max(0, min(hits) - width // 4) if hits else 0
+    piece = text[start:start + width]
+    return ("…" if start else "") + _highlight_py(piece, terms) + ("…" if start + width < len(text) else "")
+
+def search_highlights(task_id, search):
+    """
+    {"title", "description", "snippet"} for one task with the search hits
+    wrapped in HL_START/HL_END, or None when the task doesn't exist.
+    """
+    match = fts_match_expression(search)
+    if match and has_fts():
+        row = _read(
+            "SELECT highlight(tasks_fts, 1, ?, ?) AS title, "
+            "highlight(tasks_fts, 2, ?, ?) AS description, "
+            "snippet(tasks_fts, 2, ?, ?, '…', 16) AS snippet "
+            "FROM tasks_fts WHERE tasks_fts MATCH ? AND rowid = ?",
+            (HL_START, HL_END) * 3 + (match, task_id),
+        ).fetchone()
+        if row:
+            return dict(row)
+    task = get_task(task_id)
+    if not task:
+        return None
+    terms = _search_terms(search) or [search.strip()]
+    return {
+        "title": _highlight_py(task.title, terms),
+        "description": _highlight_py(task.description, terms),
+        "snippet": _snippet_py(task.description, terms),
+    }
+
+def get_task(task_id):
+    return _read_tasks(
+        f"SELECT {TASK_COLUMNS} FROM {TASK_FROM} WHERE t.id = ?", (task_id,)
+    ).fetchone()
+
+def get_tasks_by_ids(task_ids):
+    """Tasks for task_ids, in id order (missing ids are skipped)."""
+    task_ids = sorted(set(task_ids))
+    out = []
+    for i in range(0, len(task_ids), 500):
+        chunk = task_ids[i:i + 500]
+        marks = ", ".join("?" * len(chunk))
+        out.extend(_read_tasks(
+            f"SELECT {TASK_COLUMNS} FROM {TASK_FROM} WHERE t.id IN ({marks}) ORDER BY t.id", chunk
+        ).fetchall())
+    return out
 
 def complete_task(task_id, user_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("UPDATE tasks SET completed = 1 WHERE id = ? AND user_id = ?", (task_id, user_id))
-    cur.execute("UPDATE users SET xp = xp + 10 WHERE id = ?", (user_id,))
-    conn.commit()
-    conn.close()
+    """Mark an open task done and award 10 XP; False if it wasn't open (no XP)."""
+    with get_manager().write() as cur:
+        cur.execute(
+            "UPDATE tasks SET completed = 1 WHERE id = ? AND user_id = ? AND completed = 0",
+            (task_id, user_id),
+        )
+        if cur.rowcount != 1:
+            return False
+        cur.execute("UPDATE users SET xp = xp + 10 WHERE id = ?", (user_id,))
+        return True
 
 def delete_task(task_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-    conn.commit()
-    conn.close()
+    with get_manager().write() as cur:
+        cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
 
-def get_user_xp(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT xp FROM users WHERE id = ?", (user_id,))
-    row = cur.fetchone()
-    xp = row['xp'] if row else 0
-    conn.close()
-    return xp
\ No newline at end of file
+def delete_all_tasks(user_id):
+    with get_manager().write() as cur:
+        cur.execute("DELETE FROM tasks WHERE user_id = ?", (user_id,))
+
+# --- Reminders -----------------------------------------------------------
+
+def get_reminded(user_id, day):
+    """Ids of the user's tasks already reminded on day (YYYY-MM-DD)."""
+    rows = _read(
+        "SELECT r.task_id FROM reminders r JOIN tasks t ON t.id = r.task_id "
+        "WHERE t.user_id = ? AND r.day = ?",
+        (user_id, day),
+    )
+    return {r["task_id"] for r in rows}
+
+def mark_reminded(task_ids, day):
+    with get_manager().write() as cur:
+        cur.executemany(
+            "INSERT OR IGNORE INTO reminders (task_id, day) VALUES (?, ?)",
+            ((int(tid), day) for tid in task_ids),
+        )
+
+# --- Legacy app_settings.json metadata -----------------------------------
+
+def import_legacy_metadata(user_id, bucket):
+    """
+    One-time move of a per-user app_settings.json bucket into SQLite.
+    Reads "groups", "task_groups", "priorities" and "reminded"; entries for
+    tasks that no longer exist (or belong to someone else) are dropped.
+    """
+    with get_manager().write() as cur:
+        for name in bucket.get("groups", []):
+            _group_id(cur, user_id, name)
+        for tid, name in bucket.get("task_groups", {}).items():
+            # look the task up first so a dropped entry doesn't leave its group behind
+            if cur.execute("SELECT 1 FROM tasks WHERE id = ? AND user_id = ?",
+                           (int(tid), user_id)).fetchone() is None:
+                continue
+            cur.execute(
+                "UPDATE tasks SET group_id = ? WHERE id = ? AND user_id = ?",
+                (_group_id(cur, user_id, name), int(tid), user_id),
+            )
+        for tid, prio in bucket.get("priorities", {}).items():
+            cur.execute(
+                "UPDATE tasks SET priority = ? WHERE id = ? AND user_id = ?",
+                (normalize_priority(prio), int(tid), user_id),
+            )
+        for day, ids in bucket.get("reminded", {}).items():
+            cur.executemany(
+                "INSERT OR IGNORE INTO reminders (task_id, day) "
+                "SELECT id, ? FROM tasks WHERE id = ? AND user_id = ?",
+                ((day, int(tid), user_id) for tid in ids),
+            )
@@ -0,0 +1,170 @@
+# db/migrations.py
+"""
+Numbered schema migrations, tracked with PRAGMA user_version.
+
+Each migration runs once, in its own transaction, and bumps user_version in
+that same transaction. To change the schema append a new (version, fn) pair
+to MIGRATIONS; never edit one that has shipped.
+"""
+import sqlite3
+
+
+def _columns(cur, table):
+    return {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+
+
+def _m1_base_schema(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            xp INTEGER DEFAULT 0
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            title TEXT NOT NULL,
+            description TEXT,
+            completed INTEGER DEFAULT 0,
+            due_date TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    """)
+
+
+def _m2_user_password(cur):
+    # older builds added this lazily from add_user, so it may already exist
+    if "password" not in _columns(cur, "users"):
+        cur.execute("ALTER TABLE users ADD COLUMN password TEXT DEFAULT ''")
+
+
+def _m3_tasks_user_due_index(cur):
+    # serves get_tasks: WHERE user_id=? ORDER BY due_date, id (no temp sort)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_due ON tasks (user_id, due_date, id)"
+    )
+
+
+def _m4_task_metadata(cur):
+    # priority / group / reminder state used to live in app_settings.json
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            UNIQUE (user_id, name),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """)
+    cols = _columns(cur, "tasks")
+    if "priority" not in cols:
+        cur.execute(
+            "ALTER TABLE tasks ADD COLUMN priority TEXT NOT NULL DEFAULT 'low' "
+            "CHECK (priority IN ('low', 'medium', 'high'))"
+        )
+    if "group_id" not in cols:
+        cur.execute(
+            "ALTER TABLE tasks ADD COLUMN group_id INTEGER "
+            "REFERENCES groups (id) ON DELETE SET NULL"
+        )
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS reminders (
+            task_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            PRIMARY KEY (task_id, day),
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_group ON tasks (user_id, group_id)"
+    )
+
+
+def fts5_available(cur) -> bool:
+    try:
+        cur.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        cur.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# also re-created by db.add_tasks_bulk, which indexes big batches in one go
+FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, user_id, title, description)
+        VALUES (new.id, new.user_id, new.title, new.description);
+    END
+"""
+
+
+def _m5_tasks_fts(cur):
+    # External-content index over tasks, synced by triggers. user_id is
+    # indexed too so a search can be restricted to one user's doclist, and
+    # short prefixes get their own index since the search box matches as-you-type.
+    # Builds without FTS5 skip this; db.database falls back to LIKE search.
+    if not fts5_available(cur):
+        return
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            user_id, title, description,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3 4'
+        )
+    """)
+    cur.execute(FTS_INSERT_TRIGGER)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, user_id, title, description)
+            VALUES ('delete', old.id, old.user_id, old.title, old.description);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_au
+        AFTER UPDATE OF user_id, title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, user_id, title, description)
+            VALUES ('delete', old.id, old.user_id, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, user_id, title, description)
+            VALUES (new.id, new.user_id, new.title, new.description);
+        END
+    """)
+    cur.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+# Per-connection settings the schema depends on (SQLite doesn't persist
+# them in the file). Migration 4 declares ON DELETE CASCADE for reminders
+# and groups and ON DELETE SET NULL for tasks.group_id; with foreign_keys=ON
+# deleting a task also drops its reminder rows, and deleting a user that
+# still owns tasks fails (tasks.user_id has no ON DELETE action).
+SCHEMA_PRAGMAS = {"foreign_keys": "ON"}
+
+MIGRATIONS = [
+    (1, _m1_base_schema),
+    (2, _m2_user_password),
+    (3, _m3_tasks_user_due_index),
+    (4, _m4_task_metadata),
+    (5, _m5_tasks_fts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(manager) -> list:
+    """Apply every pending migration; return the versions that ran."""
+    applied = []
+    for version, fn in MIGRATIONS:
+        with manager.write() as cur:
+            # re-check under the write lock: another process may have won
+            if current_version(cur.connection) >= version:
+                continue
+            fn(cur)
+            cur.execute(f"PRAGMA user_version = {version}")
+        applied.append(version)
+    return applied
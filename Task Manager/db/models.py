@@ -0,0 +1,64 @@
+# db/models.py
+from datetime import date
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def _parse_due(due_date):
+    """'YYYY-MM-DD' -> (shared str, date) so equal dates share one object."""
+    try:
+        return due_date, date.fromisoformat(due_date)
+    except (TypeError, ValueError):
+        return due_date, None
+
+
+# priorities are a closed set: one shared str each
+_PRIORITIES = {p: p for p in ("low", "medium", "high")}
+
+
+@lru_cache(maxsize=1024)
+def _group_name(name):
+    """Equal group names share one str; bounded, so old names aren't pinned forever."""
+    return name
+
+
+class Task:
+    """
+    One task row. Built by db.database's row factory from TASK_COLUMNS;
+    due is the due date already parsed (None when missing or malformed).
+    """
+
+    __slots__ = ("id", "user_id", "title", "description", "completed",
+                 "due_date", "due", "priority", "group")
+
+    def __init__(self, id, user_id, title, description, completed, due_date, priority, group=None):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.description = description
+        self.completed = bool(completed)
+        if due_date:
+            self.due_date, self.due = _parse_due(due_date)
+        else:
+            self.due_date = self.due = None
+        self.priority = _PRIORITIES.get(priority, priority)
+        self.group = _group_name(group) if group else None
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        """sqlite3 row_factory for queries selecting TASK_COLUMNS."""
+        return cls(*row)
+
+    def _fields(self):
+        return (self.id, self.user_id, self.title, self.description,
+                self.completed, self.due_date, self.priority, self.group)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, title={self.title!r}, due_date={self.due_date!r}, completed={self.completed!r})"
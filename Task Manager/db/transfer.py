@@ -0,0 +1,345 @@
+# db/transfer.py
+"""
+Streaming import and export of task files.
+
+Nothing here holds the whole file or the whole task list in memory.
+Imports decode the JSON envelope ({"user": ..., "tasks": [...], "groups":
+[...]}) element by element, or an NDJSON export line by line, and insert
+in fixed-size chunks, each chunk its own transaction. Exports walk one
+cursor and write each row as it arrives.
+"""
+import codecs
+import csv
+import json
+import os
+import re
+from datetime import date, datetime
+
+from db import database as db
+
+IMPORT_CHUNK = 2000           # rows per transaction
+READ_BLOCK = 64 * 1024        # bytes per read
+EXPORT_PROGRESS_EVERY = 1000  # rows between progress/cancel checks
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+CSV_FIELDS = ("id", "title", "description", "completed", "due_date", "priority", "group")
+
+_DUE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_WS = " \t\r\n"
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+def _real_date(s):
+    """False for well-shaped but impossible dates such as 2026-13-45."""
+    try:
+        date.fromisoformat(s)
+    except ValueError:
+        return False
+    return True
+
+
+def sanitize_task(t):
+    """One task object from an export -> (title, desc, due, priority, group) or None."""
+    if not isinstance(t, dict):
+        return None
+    title = str(t.get("title") or "").strip()
+    if not title:
+        return None
+    desc = str(t.get("description") or "").strip()
+    due = t.get("due_date") or None
+    if due and not (isinstance(due, str) and _DUE_RE.match(due) and _real_date(due)):
+        due = None
+    prio = db.normalize_priority(str(t.get("priority") or "low"))
+    grp = str(t.get("group") or "").strip()
+    return (title, desc, due, prio, grp or None)
+
+
+class _JsonStream:
+    """Just enough of an incremental reader to walk top-level JSON values."""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def _fill(self):
+        if self.eof:
+            return False
+        block = self.fp.read(READ_BLOCK)
+        self.bytes_read += len(block)
+        if not block:
+            self.eof = True
+        if self.pos > len(self.buf) // 2:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += self.utf8.decode(block, final=self.eof)
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), '' at EOF."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"expected one of {chars!r} at offset ~{self.bytes_read}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof:
+                # a number (or similar) may continue in the next block
+                self._fill()
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_export(fp, meta=None):
+    """
+    Yield (element, bytes_read) for every task in an export file opened in
+    binary mode: the elements of the top-level "tasks" array of a JSON
+    export, or every object of an NDJSON one (a first object without a
+    "tasks" key). Other keys of the JSON envelope are decoded whole and
+    stored in meta (a dict) if given. Raises ValueError for data after the
+    envelope.
+    """
+    stream = _JsonStream(fp)
+    stream.expect("{")
+    fields = {}
+    envelope = False
+    if stream.peek() == "}":
+        stream.expect("}")
+    else:
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "tasks" and not envelope:
+                envelope = True
+                if stream.peek() != "[":
+                    raise ValueError('"tasks" is not a list')
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.expect("]")
+                else:
+                    while True:
+                        yield stream.value(), stream.bytes_read
+                        if stream.expect(",]") == "]":
+                            break
+            else:
+                fields[key] = stream.value()
+            if stream.expect(",}") == "}":
+                break
+
+    if envelope:
+        if stream.peek():
+            raise ValueError(f"unexpected data after the export at offset ~{stream.bytes_read}")
+        if meta is not None:
+            meta.update(fields)
+        return
+    if not fields and not stream.peek():
+        return      # "{}": nothing to import
+    # NDJSON: the first object was a task, and so is every value after it
+    yield fields, stream.bytes_read
+    while stream.peek():
+        yield stream.value(), stream.bytes_read
+
+
+def import_file(user_id, path, chunk_size=IMPORT_CHUNK, progress=None, cancelled=None):
+    """
+    Stream-import a JSON or NDJSON export file for user_id.
+
+    progress(bytes_done, bytes_total, imported) is called after each chunk;
+    cancelled() is polled between chunks and stops the import (chunks that
+    already committed stay). Returns {"imported", "skipped", "groups",
+    "cancelled"}.
+    """
+    total = os.path.getsize(path)
+    meta = {}
+    imported = skipped = 0
+    chunk = []
+    groups = set()
+
+    def flush(done):
+        nonlocal imported
+        if chunk:
+            imported += len(db.add_tasks_bulk(user_id, chunk))
+            chunk.clear()
+        if progress:
+            progress(done, total, imported)
+
+    result = {"cancelled": False}
+    with open(path, "rb") as fp:
+        try:
+            for obj, done in iter_export(fp, meta):
+                row = sanitize_task(obj)
+                if row is None:
+                    skipped += 1
+                    continue
+                if row[4]:
+                    groups.add(row[4])
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    if cancelled and cancelled():
+                        raise TransferCancelled()
+                    flush(done)
+            if cancelled and cancelled():
+                raise TransferCancelled()
+            flush(total)
+        except TransferCancelled:
+            result["cancelled"] = True
+
+    if not result["cancelled"]:
+        extra = meta.get("groups")
+        if isinstance(extra, list):
+            groups.update(g.strip() for g in extra if isinstance(g, str) and g.strip())
+    for name in sorted(groups):
+        db.add_group(user_id, name)
+
+    result.update(imported=imported, skipped=skipped, groups=sorted(groups))
+    return result
+
+
+# --- Export --------------------------------------------------------------
+
+def export_format_for(path, default="json"):
+    """Export format implied by a file name's extension."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "jsonl":
+        ext = "ndjson"
+    return ext if ext in EXPORT_FORMATS else default
+
+
+def export_record(task):
+    """One Task -> the dict written to exports (and read back by imports)."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description or "",
+        "completed": task.completed,
+        "due_date": task.due_date,
+        "priority": task.priority,
+        "group": task.group or "",
+    }
+
+
+_encode = json.JSONEncoder().encode
+
+
+def _indented(obj, level):
+    # json.dumps(indent=2) for a value nested `level` deep in the envelope
+    return json.dumps(obj, indent=2).replace("\n", "\n" + "  " * level)
+
+
+class _JsonWriter:
+    """The original envelope, laid out exactly as json.dump(indent=2) would."""
+
+    def __init__(self, f, user_id, username):
+        self.f = f
+        self.user_id = user_id
+        self.first = True
+        user = {"id": user_id, "username": username}
+        f.write('{\n  "user": ' + _indented(user, 1)
+                + ',\n  "exported_at": ' + json.dumps(datetime.now().isoformat(timespec="seconds"))
+                + ',\n  "tasks": [')
+
+    def row(self, record):
+        # flat dict of scalars: lay it out by hand, the C encoder does the
+        # values (json.dumps(indent=...) falls back to the slow pure-Python one)
+        body = ",".join(f"\n      {_encode(k)}: {_encode(v)}" for k, v in record.items())
+        self.f.write(("\n    {" if self.first else ",\n    {") + body + "\n    }")
+        self.first = False
+
+    def close(self):
+        groups = _indented(db.get_groups(self.user_id), 1)
+        self.f.write(("]" if self.first else "\n  ]") + ',\n  "groups": ' + groups + "\n}")
+
+
+class _NdjsonWriter:
+    """One task object per line."""
+
+    def __init__(self, f, user_id, username):
+        self.f = f
+
+    def row(self, record):
+        self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        pass
+
+
+class _CsvWriter:
+    def __init__(self, f, user_id, username):
+        self.writer = csv.writer(f)
+        self.writer.writerow(CSV_FIELDS)
+
+    def row(self, record):
+        record["completed"] = int(record["completed"])
+        self.writer.writerow([record[k] for k in CSV_FIELDS])
+
+    def close(self):
+        pass
+
+
+_WRITERS = {"json": _JsonWriter, "ndjson": _NdjsonWriter, "csv": _CsvWriter}
+
+
+def export_file(user_id, username, path, fmt="json", progress=None, cancelled=None):
+    """
+    Stream the user's tasks to path as "json", "ndjson" or "csv".
+
+    Writes to path + ".part" and renames it into place when complete, so a
+    failed or cancelled export never leaves a truncated file behind.
+    progress(done, total) and cancelled() work as in import_file. Returns
+    {"exported", "cancelled"}.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    total = db.count_tasks(user_id)
+    tmp = path + ".part"
+    done = 0
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = _WRITERS[fmt](f, user_id, username)
+            for task in db.iter_tasks(user_id):
+                writer.row(export_record(task))
+                done += 1
+                if done % EXPORT_PROGRESS_EVERY == 0:
+                    if cancelled and cancelled():
+                        raise TransferCancelled()
+                    if progress:
+                        progress(done, total)
+            writer.close()
+    except TransferCancelled:
+        os.remove(tmp)
+        return {"exported": done, "cancelled": True}
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    if progress:
+        progress(done, max(total, done))
+    return {"exported": done, "cancelled": False}
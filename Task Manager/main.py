@@ -1,6 +1,8 @@
 import sys
 import os
 
+from ui import startup_trace
+
 # High-DPI fixes (safe defaults)
 os.environ["QT_SCALE_FACTOR"] = "1"
 os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "0"
@@ -8,9 +10,12 @@ os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"
 
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import QTimer
 
 from ui.login_window import LoginWindow
-from db.database import init_db
+from db.database import init_db, close as close_db
+
+STARTUP_TRACE_FLAG = "--startup-trace"
 
 
 def resource_path(*parts):
@@ -23,11 +28,18 @@ def resource_path(*parts):
 
 
 if __name__ == "__main__":
+    if STARTUP_TRACE_FLAG in sys.argv:
+        sys.argv.remove(STARTUP_TRACE_FLAG)
+        startup_trace.enable()
+    startup_trace.mark("imports done")
+
     init_db()
+    startup_trace.mark("database ready")
 
     app = QApplication(sys.argv)
     app.setApplicationName("Task5")
     app.setOrganizationName("Task5") 
+    startup_trace.mark("QApplication created")
 
     # === Set application icon ===
     app_icon_path = resource_path("assets", "icons", "task5.ico")
@@ -37,5 +49,9 @@ if __name__ == "__main__":
     wnd = LoginWindow()
     wnd.setWindowTitle("Task5 - Login") 
     wnd.show()
+    startup_trace.mark("login window shown")
+    QTimer.singleShot(0, lambda: startup_trace.mark("event loop running"))
 
-    sys.exit(app.exec_())
+    code = app.exec_()
+    close_db()
+    sys.exit(code)
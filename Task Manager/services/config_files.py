@@ -0,0 +1,46 @@
+# services/config_files.py
+import json
+import os
+import tempfile
+
+USER_CONFIG_DIR = "user_settings"   # one <user id>.json per user
+
+
+def user_config_path(user_id, root=USER_CONFIG_DIR) -> str:
+    return os.path.join(root, f"{user_id}.json")
+
+
+def read_json(path, default=None):
+    """The file's JSON object, or default when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return default
+    return data if isinstance(data, dict) else default
+
+
+def write_json_atomic(path, data):
+    """Write data as JSON to a temp file beside path, then rename it over path."""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def log_completion(path, day):
+    """Add day ("YYYY-MM-DD") to the completion_log of the user config at path."""
+    cfg = read_json(path, {})
+    log = cfg.get("completion_log", [])
+    if day not in log:
+        cfg["completion_log"] = log + [day]
+        write_json_atomic(path, cfg)
@@ -0,0 +1,53 @@
+# services/task_rules.py
+"""Task rules shared by the GUI, TaskService and the CLI. No I/O, no Qt, no asyncio."""
+import re
+from datetime import date, timedelta
+
+TITLE_MAX = 100
+DESCRIPTION_MAX = 1000
+_DUE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def valid_due_date(due_date) -> bool:
+    """True for a blank due date or a real date written YYYY-MM-DD."""
+    if not due_date:
+        return True
+    if not _DUE_RE.match(due_date):
+        return False
+    try:
+        date.fromisoformat(due_date)
+    except ValueError:
+        return False
+    return True
+
+def validate_task(title, description="", due_date=None):
+    """
+    Normalized (title, description, due_date) for a new task; raises
+    ValueError with a user-facing message when a field is invalid.
+    """
+    title = (title or "").strip()
+    description = (description or "").strip()
+    due_date = (due_date or "").strip() or None
+    if not title:
+        raise ValueError("Task title cannot be empty.")
+    if len(title) > TITLE_MAX:
+        raise ValueError(f"Task title too long (max {TITLE_MAX}).")
+    if len(description) > DESCRIPTION_MAX:
+        raise ValueError(f"Task description too long (max {DESCRIPTION_MAX}).")
+    if not valid_due_date(due_date):
+        raise ValueError("Due date must be YYYY-MM-DD.")
+    return title, description, due_date
+
+def streak_length(completion_days, today=None) -> int:
+    """Consecutive days ending today that appear in completion_days ("YYYY-MM-DD")."""
+    days = set(completion_days)
+    cur = today or date.today()
+    count = 0
+    while cur.isoformat() in days:
+        count += 1
+        cur -= timedelta(days=1)
+    return count
+
+def due_for_reminder(tasks, reminded, today=None):
+    """Open tasks due today whose id is not in reminded."""
+    today = today or date.today()
+    return [t for t in tasks if not t.completed and t.due == today and t.id not in reminded]
@@ -0,0 +1,164 @@
+# services/task_service.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from db import database as db
+from db import transfer
+from services.config_files import USER_CONFIG_DIR, user_config_path, read_json, log_completion
+from services.task_rules import validate_task, streak_length, due_for_reminder
+
+# executor threads when the caller doesn't bring its own; each keeps one
+# SQLite reader, and writes are serialized by the connection manager anyway
+DEFAULT_WORKERS = 4
+
+# --- Service ---------------------------------------------------------------
+
+class TaskService:
+    """
+    Async API for one user's tasks, usable without Qt.
+
+    Every coroutine runs its blocking SQLite or file work on an executor,
+    so thousands can be in flight on one event loop. add() calls that
+    arrive in the same loop iteration are inserted together in one
+    transaction (db.add_tasks_bulk); if that batch fails, each of its
+    callers gets the error.
+    """
+
+    def __init__(self, user_id, executor=None, max_workers=DEFAULT_WORKERS, config_dir=USER_CONFIG_DIR):
+        self.user_id = user_id
+        self.config_path = user_config_path(user_id, config_dir)
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers, thread_name_prefix="task-service")
+        self._adds = []         # [(row, future)] waiting for the next batch
+        self._log_lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # --- Writes ---
+
+    async def add(self, title, description="", due_date=None, priority="low", group=None):
+        """Validate and insert one task; returns the stored Task."""
+        title, description, due_date = validate_task(title, description, due_date)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._adds.append(((title, description, due_date, priority, group), future))
+        if len(self._adds) == 1:
+            loop.call_soon(self._start_add_batch)
+        return await future
+
+    def _start_add_batch(self):
+        batch, self._adds = self._adds, []
+        asyncio.ensure_future(self._add_batch(batch))
+
+    async def _add_batch(self, batch):
+        try:
+            tasks = await self._run(self._insert, [row for row, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), task in zip(batch, tasks):
+            if not future.done():
+                future.set_result(task)
+
+    def _insert(self, rows):
+        ids = db.add_tasks_bulk(self.user_id, rows)
+        by_id = {t.id: t for t in db.get_tasks_by_ids(ids)}
+        return [by_id.get(i) for i in ids]
+
+    async def add_many(self, tasks):
+        """
+        Validate and insert (title, description, due_date[, priority[, group]])
+        tuples in one transaction; returns the new ids in order.
+        """
+        rows = [validate_task(*t[:3]) + tuple(t[3:5]) for t in tasks]
+        return await self._run(db.add_tasks_bulk, self.user_id, rows)
+
+    async def complete(self, task_id, today=None):
+        """Mark an open task done (+10 XP) and log today for the streak; False if not open."""
+        return await self._run(self._complete, task_id, today or date.today())
+
+    def _complete(self, task_id, today):
+        if not db.complete_task(task_id, self.user_id):
+            return False
+        self._log_completion(today.isoformat())
+        return True
+
+    def _log_completion(self, day):
+        with self._log_lock:
+            log_completion(self.config_path, day)
+
+    async def delete(self, task_id):
+        """Delete one of the user's tasks; False if there was no such task."""
+        return await self._run(self._delete, task_id)
+
+    def _delete(self, task_id):
+        task = db.get_task(task_id)
+        if task is None or task.user_id != self.user_id:
+            return False
+        db.delete_task(task_id)
+        return True
+
+    async def delete_all(self):
+        await self._run(db.delete_all_tasks, self.user_id)
+
+    # --- Reads ---
+
+    async def get(self, task_id):
+        task = await self._run(db.get_task, task_id)
+        return task if task is not None and task.user_id == self.user_id else None
+
+    async def query(self, **filters):
+        """db.find_tasks for this user (search, status, group, priority, due_*)."""
+        return await self._run(lambda: db.find_tasks(self.user_id, **filters))
+
+    async def groups(self):
+        return await self._run(db.get_groups, self.user_id)
+
+    async def xp(self):
+        return await self._run(db.get_user_xp, self.user_id)
+
+    # --- Streak & reminders ---
+
+    async def streak(self, today=None):
+        cfg = await self._run(read_json, self.config_path, {})
+        return streak_length(cfg.get("completion_log", []), today)
+
+    async def due_reminders(self, today=None, mark=True):
+        """Open tasks due today not reminded yet; marks them reminded unless mark=False."""
+        return await self._run(self._due_reminders, today or date.today(), mark)
+
+    def _due_reminders(self, today, mark):
+        day = today.isoformat()
+        due = due_for_reminder(db.tasks_due_on(self.user_id, day, status="open"),
+                               db.get_reminded(self.user_id, day), today)
+        if due and mark:
+            db.mark_reminded([t.id for t in due], day)
+        return due
+
+    # --- Import / export ---
+
+    async def import_file(self, path, progress=None):
+        """db.transfer.import_file; progress(done, total, rows) is called from the executor."""
+        return await self._run(lambda: transfer.import_file(self.user_id, path, progress=progress))
+
+    async def export_file(self, path, username, fmt=None, progress=None):
+        """db.transfer.export_file (format from the extension unless fmt is given)."""
+        fmt = fmt or transfer.export_format_for(path)
+        return await self._run(
+            lambda: transfer.export_file(self.user_id, username, path, fmt, progress=progress)
+        )
@@ -0,0 +1,191 @@
+# ui/agenda_view.py
+from datetime import date, timedelta
+
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem
+
+from db import database as db
+from ui.task_model import PRIORITY_ICONS
+
+# tasks fetched per page as the list scrolls
+AGENDA_PAGE = 60
+# start fetching the next page this many pixels before the bottom
+PREFETCH_PX = 200
+# worker key for agenda reads: a reload supersedes page loads still in flight
+PAGE_KEY = "agenda-page"
+
+
+def _day_after(due_date):
+    """
+    First real date sorting after the due_date string, which may be an
+    impossible one such as "2026-13-45" (Task.due is None for those).
+    None when there is no later date.
+    """
+    try:
+        return date.fromisoformat(due_date) + timedelta(days=1)
+    except ValueError:
+        pass
+    except OverflowError:
+        return None
+    try:
+        y, m, d = int(due_date[:4]), int(due_date[5:7]), int(due_date[8:10])
+        if y == 0 or m == 0:
+            return date(max(y, 1), 1, 1)
+        if m > 12:
+            return date(y + 1, 1, 1)
+        first = date(y, m, 1)
+        if d == 0:
+            return first
+        return (first + timedelta(days=31)).replace(day=1)   # day past the month's end
+    except (ValueError, OverflowError):
+        return None
+
+
+def _read_page(user_id, start):
+    """(tasks, next day to load, exhausted) for the page from start; whole days only."""
+    rows = db.tasks_due_between(user_id, start.isoformat(), limit=AGENDA_PAGE)
+    if len(rows) < AGENDA_PAGE:
+        next_day = _day_after(rows[-1].due_date) if rows else start
+        return rows, next_day, True
+    # don't split the last day across pages
+    last_day = rows[-1].due_date
+    rows = [t for t in rows if t.due_date != last_day] + db.tasks_due_on(user_id, last_day)
+    next_day = _day_after(last_day)
+    return rows, next_day, next_day is None
+
+
+def _read_reload(user_id, today, horizon):
+    """(overdue, tasks, next day, exhausted): everything up to horizon, or the first page."""
+    overdue = db.overdue_tasks(user_id, today.isoformat())
+    if horizon is not None and horizon > today:
+        # one query for the days already on screen; the end is compared as a
+        # string so impossible dates just before horizon (2026-13-45) stay in
+        end = horizon.isoformat()
+        rows = db.tasks_due_between(user_id, today.isoformat(), end)
+        return overdue, [t for t in rows if t.due_date != end], horizon, False
+    return (overdue,) + _read_page(user_id, today)
+
+
+class AgendaView(QWidget):
+    """
+    Overdue tasks, then every dated task from today on, grouped under day
+    headers. Pages are pulled from db.tasks_due_between on the store's
+    workers as the list scrolls; a page always ends on a whole day.
+    """
+
+    open_task = pyqtSignal(int)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.list = QListWidget()
+        self.list.itemDoubleClicked.connect(self._activated)
+        self.list.verticalScrollBar().valueChanged.connect(self._maybe_load_more)
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.addWidget(self.list)
+
+        self._header_font = QFont(self.list.font())
+        self._header_font.setBold(True)
+        self._today = None
+        self._next_day = None     # first day not loaded yet; None = not started
+        self._exhausted = False
+        self._loading = False     # a reload or page read is in flight
+        self._last_header = None
+        self._fill = QTimer(self)
+        self._fill.setSingleShot(True)
+        self._fill.timeout.connect(self._maybe_load_more)
+
+    # -------------------- Loading --------------------
+    def reload(self):
+        """Re-read everything loaded so far (after task changes), keeping the scroll."""
+        today = date.today()
+        horizon = self._next_day if self._today == today else None
+        self._loading = True
+        self.store.read(_read_reload, self.store.user_id, today, horizon, key=PAGE_KEY,
+                        on_done=lambda result: self._reloaded(today, result),
+                        on_error=self._load_failed)
+
+    def _reloaded(self, today, result):
+        overdue, rows, next_day, exhausted = result
+        scroll = self.list.verticalScrollBar().value()
+        self.list.clear()
+        self._last_header = None
+        self._today = today
+        if overdue:
+            self._add_header("Overdue")
+            for task in overdue:
+                self._add_task(task, show_date=True)
+        self._page_loaded((rows, next_day, exhausted))
+        self.list.verticalScrollBar().setValue(scroll)
+
+    def load_more(self):
+        """Queue the next page of days."""
+        if self._exhausted or self._next_day is None or self._loading:
+            return
+        self._loading = True
+        self.store.read(_read_page, self.store.user_id, self._next_day, key=PAGE_KEY,
+                        on_done=self._page_loaded, on_error=self._load_failed)
+
+    def _page_loaded(self, result):
+        rows, self._next_day, self._exhausted = result
+        self._loading = False
+        self._add_days(rows)
+        if self._exhausted and not self.list.count():
+            self._add_placeholder("No upcoming tasks.")
+        # keep going until the list can scroll (or we run out)
+        self._fill.start(0)
+
+    def _load_failed(self, message):
+        self._loading = False
+        self.store.failed.emit(message)
+
+    def _maybe_load_more(self, *_):
+        bar = self.list.verticalScrollBar()
+        if self._exhausted or self._next_day is None or self._loading or not self.isVisible():
+            return
+        if bar.maximum() - bar.value() <= PREFETCH_PX or bar.maximum() == 0:
+            self.load_more()
+
+    # -------------------- Items --------------------
+    def _add_days(self, tasks):
+        for task in tasks:
+            if task.due_date != self._last_header:
+                self._add_header(self._day_title(task.due), task.due_date)
+            self._add_task(task, show_date=task.due is None)
+
+    def _day_title(self, day):
+        if day is None:
+            return "Invalid date"
+        if day == self._today:
+            return "Today"
+        if day == self._today + timedelta(days=1):
+            return "Tomorrow"
+        return day.strftime("%A, %B %d, %Y")
+
+    def _add_header(self, text, key=None):
+        item = QListWidgetItem(text)
+        item.setFont(self._header_font)
+        item.setFlags(Qt.NoItemFlags)
+        self.list.addItem(item)
+        self._last_header = key
+
+    def _add_placeholder(self, text):
+        item = QListWidgetItem(text)
+        item.setFlags(Qt.NoItemFlags)
+        self.list.addItem(item)
+
+    def _add_task(self, task, show_date=False):
+        status = "✅" if task.completed else "❌"
+        picon = PRIORITY_ICONS.get(task.priority, "🟢")
+        badge = f"[{task.group}] " if task.group else ""
+        when = f"  ({task.due_date})" if show_date else ""
+        item = QListWidgetItem(f"    {status} {picon} [{task.id}] {badge}{task.title}{when}")
+        item.setData(Qt.UserRole, task.id)
+        self.list.addItem(item)
+
+    def _activated(self, item):
+        task_id = item.data(Qt.UserRole)
+        if task_id is not None:
+            self.open_task.emit(task_id)
@@ -0,0 +1,213 @@
+# ui/calendar_marks.py
+from calendar import monthrange
+from datetime import date, timedelta
+
+from PyQt5.QtCore import QDate, QObject, pyqtSignal
+from PyQt5.QtGui import QColor, QTextCharFormat
+
+from db import database as db
+
+# out-of-month days tinted on each side of the shown month
+NEIGHBOUR_DAYS = 7
+
+
+class _DueCounts(QObject):
+    """
+    {"YYYY-MM-DD": (total, incomplete)} per period from one GROUP BY query,
+    cached until a task due in that period is added, changed or removed.
+    key_fn maps a due date to its period key, range_fn a key to its
+    (first day, last day).
+
+    A missing period is read on the store's workers: get() returns None
+    meanwhile and loaded(key) fires once it is cached. A period dropped
+    while its read is in flight is read again (the newer read supersedes).
+    """
+
+    loaded = pyqtSignal(object)     # period key
+
+    def __init__(self, store, key_fn, range_fn, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._key = key_fn
+        self._range = range_fn
+        self._periods = {}
+        self._pending = set()       # period keys being read
+        store.tasks_added.connect(lambda tasks: self._drop(t.due_date for t in tasks))
+        store.tasks_removed.connect(lambda tasks: self._drop(t.due_date for t in tasks))
+        store.tasks_updated.connect(
+            lambda pairs: self._drop(d for old, new in pairs for d in (old.due_date, new.due_date))
+        )
+        store.reset.connect(self._reset)
+
+    def _fetch(self, key):
+        counts = self._periods.get(key)
+        if counts is None and key not in self._pending:
+            self._request(key)
+            counts = self._periods.get(key)     # already there when reads run inline
+        return counts
+
+    def _request(self, key):
+        self._pending.add(key)
+        start, end = self._range(key)
+        self.store.read(db.due_date_counts, self.store.user_id, start, end, key=("due-counts", key),
+                        on_done=lambda counts: self._loaded(key, counts),
+                        on_error=lambda message: self._failed(key, message))
+
+    def _loaded(self, key, counts):
+        self._pending.discard(key)
+        self._periods[key] = counts
+        self.loaded.emit(key)
+
+    def _failed(self, key, message):
+        self._pending.discard(key)
+        self.store.failed.emit(message)
+
+    def _drop(self, due_vals):
+        keys = set()
+        for due_val in due_vals:
+            try:
+                keys.add(self._key(due_val))
+            except (TypeError, ValueError):
+                continue
+        for key in keys:
+            self._periods.pop(key, None)
+            if key in self._pending:
+                self._request(key)
+
+    def _reset(self):
+        self._periods.clear()
+        for key in list(self._pending):
+            self._request(key)
+
+
+def _month_key(due_val):
+    return int(due_val[:4]), int(due_val[5:7])
+
+
+def _month_range(key):
+    year, month = key
+    last = monthrange(year, month)[1]
+    return f"{year:04d}-{month:02d}-01", f"{year:04d}-{month:02d}-{last:02d}"
+
+
+def _year_key(due_val):
+    return int(due_val[:4])
+
+
+def _year_range(year):
+    return f"{year:04d}-01-01", f"{year:04d}-12-31"
+
+
+class MonthCounts(_DueCounts):
+    def __init__(self, store, parent=None):
+        super().__init__(store, _month_key, _month_range, parent)
+
+    def get(self, year, month):
+        """The month's counts, or None while they load."""
+        return self._fetch((year, month))
+
+
+class YearCounts(_DueCounts):
+    def __init__(self, store, parent=None):
+        super().__init__(store, _year_key, _year_range, parent)
+
+    def get(self, year):
+        """The year's counts, or None while they load."""
+        return self._fetch(year)
+
+
+class CalendarMarker:
+    """
+    Paints task marks onto a QCalendarWidget.
+
+    The handful of QTextCharFormats are built once per theme/accent, and
+    only days whose mark differs from what is already painted are touched.
+    A month whose counts are still loading keeps its current marks and is
+    painted when they arrive.
+    """
+
+    def __init__(self, calendar, counts):
+        self.calendar = calendar
+        self.counts = counts
+        self._formats = {}
+        self._formats_key = None
+        self._painted = {}  # date -> (kind, is_today) currently applied
+        counts.loaded.connect(self._on_loaded)
+
+    def _on_loaded(self, key):
+        if self._formats and key == (self.calendar.yearShown(), self.calendar.monthShown()):
+            self.paint()
+
+    def set_palette(self, theme, accent_hex):
+        key = (theme, accent_hex)
+        if key == self._formats_key:
+            return
+        self._formats_key = key
+        self._formats = self._build_formats(accent_hex)
+        # every painted day uses an old format now
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
+        self._painted.clear()
+
+    @staticmethod
+    def _build_formats(accent_hex):
+        accent = QColor(accent_hex)
+        accent_soft = QColor(accent)
+        accent_soft.setAlphaF(0.22)
+        accent_strong = QColor(accent)
+        accent_strong.setAlphaF(0.38)
+
+        slate = QColor(34, 42, 64, int(255*0.60))       # default tile for in-month
+        slate_dim = QColor(34, 42, 64, int(255*0.28))   # out-of-month
+        text_main = QColor("#EAF2FF")
+        text_dim = QColor(200, 210, 230, 160)
+        today_bg = QColor(80, 96, 150, 160)             # bluish ring effect
+
+        def fmt(bg, fg, weight=None):
+            f = QTextCharFormat()
+            f.setBackground(bg)
+            f.setForeground(fg)
+            if weight is not None:
+                f.setFontWeight(weight)
+            return f
+
+        kinds = {
+            "base": (slate, text_main, None),
+            "dim": (slate_dim, text_dim, None),
+            "open": (accent_strong, text_main, 75),    # brighter accent bubble
+            "done": (accent_soft, text_main, 63),      # subtle tint if all done
+        }
+        formats = {}
+        for kind, (bg, fg, weight) in kinds.items():
+            formats[(kind, False)] = fmt(bg, fg, weight)
+            formats[(kind, True)] = fmt(today_bg, fg, 81)
+        return formats
+
+    def paint(self):
+        """Mark the shown month (plus dimmed neighbours); returns days repainted."""
+        cal = self.calendar
+        year, month = cal.yearShown(), cal.monthShown()
+        first = date(year, month, 1)
+        last = date(year, month, monthrange(year, month)[1])
+        counts = self.counts.get(year, month)
+        if counts is None:
+            return 0
+        today = date.today()
+
+        wanted = {}
+        day = first
+        while day <= last:
+            total, incomplete = counts.get(day.isoformat(), (0, 0))
+            kind = "open" if incomplete else "done" if total else "base"
+            wanted[day] = (kind, day == today)
+            day += timedelta(days=1)
+        for n in range(1, NEIGHBOUR_DAYS + 1):
+            wanted[first - timedelta(days=n)] = ("dim", False)
+            wanted[last + timedelta(days=n)] = ("dim", False)
+
+        repainted = 0
+        for day, mark in wanted.items():
+            if self._painted.get(day) != mark:
+                cal.setDateTextFormat(QDate(day.year, day.month, day.day), self._formats[mark])
+                self._painted[day] = mark
+                repainted += 1
+        return repainted
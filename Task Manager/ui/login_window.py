@@ -6,9 +6,8 @@ from PyQt5.QtCore import Qt
 import os
 import sys
 
-from ui.main_window import MainWindow
-from ui.signup_window import SignupWindow
 from db.database import validate_user
+from ui import startup_trace
 
 
 def resource_path(*parts):
@@ -117,6 +116,10 @@ class LoginWindow(QWidget):
 
         user = validate_user(username, password)
         if user:
+            # the main window (and everything it imports) loads only after a successful login
+            startup_trace.mark("login accepted")
+            from ui.main_window import MainWindow
+            startup_trace.mark("ui.main_window imported")
             self.main_window = MainWindow(user)
             self.main_window.show()
             self.close()
@@ -124,5 +127,6 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
 
     def open_signup(self):
+        from ui.signup_window import SignupWindow
         self.signup_window = SignupWindow()
         self.signup_window.show()
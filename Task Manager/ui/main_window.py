@@ -1,15 +1,31 @@
 ﻿# -*- coding: utf-8 -*-
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit,
-    QListWidget, QMessageBox, QTabWidget, QHBoxLayout, QApplication, QComboBox,
+    QListWidget, QListView, QMessageBox, QTabWidget, QHBoxLayout, QApplication, QComboBox,
     QFileDialog, QProgressBar, QCalendarWidget, QSplitter, QDialog, QPlainTextEdit,
-    QGraphicsDropShadowEffect, QMenu
+    QGraphicsDropShadowEffect, QMenu, QProgressDialog
 )
-from PyQt5.QtCore import Qt, QTimer, QDate
-from PyQt5.QtGui import QColor, QTextCharFormat
-from datetime import datetime, date, timedelta
+from PyQt5.QtCore import Qt, QDate, QEvent, QTimer
+from PyQt5.QtGui import QColor
+from datetime import date
 from db import database as db
-import re, json, os
+from db import transfer
+from ui.refresh_scheduler import RefreshScheduler
+from ui.task_store import TaskStore
+from ui.task_model import TaskListModel, TaskItemDelegate, TaskIdRole, PRIORITY_ICONS, long_date
+from ui.transfer_jobs import ImportJob, ExportJob
+from ui.settings_store import SettingsStore, shard_section
+from ui.reminder_scheduler import ReminderScheduler
+from ui.notification_panel import NotificationPanel
+from ui.calendar_marks import CalendarMarker, MonthCounts, YearCounts
+from ui.year_heatmap import YearView
+from ui.agenda_view import AgendaView
+from ui.workers import WorkerPool
+from ui.themes import RENDER_MODES, compiled_qss, accent_qss
+from ui import startup_trace
+from services.config_files import user_config_path
+from services.task_rules import validate_task, valid_due_date, streak_length
+import html
 
 # -------------------- Config (global + per-user) --------------------
 CONFIG_FILE = "app_settings.json"
@@ -17,55 +33,34 @@ CONFIG_FILE = "app_settings.json"
 GLOBAL_DEFAULTS = {
     "theme": "aurora",
     "accent": "#7AA2F7",
-    "users": {}  # per-user buckets live here
+    "render_mode": "quality",   # ui.themes.RENDER_MODES
 }
 
 USER_DEFAULTS = {
-    "groups": [],           # ["Computer", "Business", ...]
-    "task_groups": {},      # {task_id: "GroupName"}
-    "priorities": {},       # {task_id: "low|medium|high"}
     "completion_log": [],   # ["YYYY-MM-DD", ...]
-    "reminded": {}          # {"YYYY-MM-DD": [task_id, ...]}
 }
 
-def _load_cfg():
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
-                # backfill missing global keys
-                for k, v in GLOBAL_DEFAULTS.items():
-                    if k == "users":
-                        data.setdefault("users", {})
-                    else:
-                        data.setdefault(k, v)
-                return data
-    except Exception:
-        pass
-    _save_cfg(GLOBAL_DEFAULTS)
-    # deep copy
-    return json.loads(json.dumps(GLOBAL_DEFAULTS))
-
-def _save_cfg(cfg: dict):
-    try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
-    except Exception as e:
-        print("Error saving config:", e)
-
-def _user_bucket(cfg: dict, user_id: int) -> dict:
-    """Ensure a per-user bucket exists and is backfilled; return it."""
-    ukey = str(user_id)
-    if "users" not in cfg:
-        cfg["users"] = {}
-    if ukey not in cfg["users"]:
-        cfg["users"][ukey] = json.loads(json.dumps(USER_DEFAULTS))  # deep copy
-        _save_cfg(cfg)
-    else:
-        # backfill after updates
-        for k, v in USER_DEFAULTS.items():
-            cfg["users"][ukey].setdefault(k, json.loads(json.dumps(v)))
-    return cfg["users"][ukey]
+# per-task metadata that now lives in SQLite (see db.import_legacy_metadata)
+_DB_META_KEYS = ("groups", "task_groups", "priorities", "reminded")
+
+# search box edits re-query after this much typing quiet time
+SEARCH_DEBOUNCE_MS = 200
+# worker jobs shorter than this never show the busy bar
+BUSY_DELAY_MS = 150
+
+# save-dialog filter -> export format (db.transfer.EXPORT_FORMATS)
+EXPORT_FILTERS = {
+    "JSON Files (*.json)": "json",
+    "NDJSON Files (*.ndjson *.jsonl)": "ndjson",
+    "CSV Files (*.csv)": "csv",
+}
+
+# how an import failure is described, by ui.transfer_jobs.error_kind
+IMPORT_ERRORS = {
+    "parse": "The file is not a valid task export",
+    "database": "Database error",
+    "io": "Could not read the file",
+}
 
 # -------------------- Small helpers --------------------
 def _today_iso() -> str:
@@ -79,43 +74,123 @@ class MainWindow(QWidget):
         self.setWindowTitle("Task5")
         self.resize(1000, 700)
 
-        # settings
-        self.cfg = _load_cfg()                  # global (theme/accent)
-        self.ucfg = _user_bucket(self.cfg, self.user[0])  # per-user bucket
+        # SQLite and settings files are touched on these threads, not the UI thread
+        self.workers = WorkerPool(self)
+        self.workers.failed.connect(self._on_worker_failed)
+
+        # settings: changes are batched and written atomically (see SettingsStore)
+        self.settings = SettingsStore(CONFIG_FILE, GLOBAL_DEFAULTS, workers=self.workers, parent=self)  # global (theme/accent)
+        # --- one-time split of the old "users" buckets into per-user files ---
+        shard_section(self.settings, "users", user_config_path)
+        # only this user's file is ever read
+        self.ucfg = SettingsStore(user_config_path(self.user[0]), USER_DEFAULTS, workers=self.workers, parent=self)
 
         # --- one-time migration from old global keys (if present) ---
         _legacy = ("groups","task_groups","priorities","completion_log","reminded")
         migrated = False
         for k in _legacy:
-            if k in self.cfg and k not in self.ucfg:
-                self.ucfg[k] = self.cfg.pop(k)
+            if k in self.settings and k not in self.ucfg:
+                self.ucfg.set(k, self.settings.pop(k))
                 migrated = True
-        if migrated:
-            _save_cfg(self.cfg)
+        # --- one-time move of per-task metadata into SQLite (serial lane) ---
+        legacy_meta = {k: self.ucfg.get(k) for k in _DB_META_KEYS if k in self.ucfg}
+        if legacy_meta:
+            # the keys leave the settings only once SQLite has them
+            self.workers.run(db.import_legacy_metadata, self.user[0], legacy_meta, serial=True,
+                             on_done=lambda _: self._finish_migration(legacy_meta))
+        elif migrated:
+            self._finish_migration({})
         # ------------------------------------------------------------
 
+        # views render through the scheduler: one pass per tick, not per change
+        self.scheduler = RefreshScheduler(self)
+
+        # every view reads tasks from here; only writes go to SQLite
+        self.store = TaskStore(self.user[0], self.workers, self)
+        self.store.failed.connect(self._on_worker_failed)
+        self.store.tasks_added.connect(lambda *_: self.refresh_tasks())
+        self.store.tasks_updated.connect(lambda *_: self.refresh_tasks())
+        self.store.tasks_removed.connect(lambda *_: self.refresh_tasks())
+        self.store.reset.connect(self.refresh_tasks)
+        self.store.reset.connect(lambda: self.scheduler.invalidate("groups"))
+        self.store.groups_changed.connect(lambda: self.scheduler.invalidate("groups"))
+        self.store.xp_changed.connect(lambda *_: self.scheduler.invalidate("user_info"))
+        self._transfer_job = None
+
         # layout
         self.tabs = QTabWidget(self)
         root = QVBoxLayout(self)
         root.addWidget(self.tabs)
         self.init_task_tab()
-        self.init_calendar_tab()
-        self.init_settings_tab()
-
-        # apply theme after UI exists
-        self.apply_theme(self.cfg.get("theme", "aurora"))
-        self.apply_accent(self.cfg.get("accent", "#7AA2F7"))
-        self._apply_aurora_effects_if_needed()
-
-        # initial data
-        self.refresh_group_controls()
-        self.refresh_tasks()
+        # Calendar and Settings are built the first time they are shown
+        self._lazy_tabs = {}
+        self._add_lazy_tab("Calendar", self.init_calendar_tab)
+        self._add_lazy_tab("Settings", self.init_settings_tab)
+        self.tabs.currentChanged.connect(self._build_tab)
+
+        # apply theme after UI exists; shadow effects wait for the first show
+        self._theme_key = None      # (theme, render mode) of the app stylesheet
+        self._accent = None         # accent of this window's override sheet
+        self.apply_theme(self.settings.get("theme", "aurora"))
+        self.apply_accent(self.settings.get("accent", "#7AA2F7"))
+        self._effects_pending = True
+
+        # render order matters: the task list before the details pane, etc.
+        self.scheduler.register("groups", self.refresh_group_controls)
+        self.scheduler.register("tasks", self._render_task_list)
+        self.scheduler.register("details", self.show_description)
+        self.scheduler.register("user_info", self.refresh_user_info)
+        self.scheduler.register("calendar", self.refresh_calendar_marks)
+        self.scheduler.register("calendar_day", self._render_calendar_day)
+        self.scheduler.register("agenda", self._render_agenda)
+        self.scheduler.register("year", self._render_year)
+
+        # initial data arrives from the serial worker; views re-render on store.reset
+        self.store.reset.connect(self._first_load_done)
+        self.store.load()
+        self.scheduler.flush()
+
+        # reminders: timer armed for the next due task, not a polling loop;
+        # hits collect in a non-modal panel instead of one dialog per task
+        self.notifications = NotificationPanel(self.store, self)
+        self.notifications.open_task.connect(self.show_task)
+        self.reminders = ReminderScheduler(self.store, self)
+        self.reminders.due.connect(self.notifications.add)
+        self.reminders.start()
+        startup_trace.mark("main window built")
+
+    def _finish_migration(self, moved):
+        # pop, then write both files now (don't re-migrate if we crash first);
+        # the writes queue on the serial lane behind the import
+        for k in moved:
+            self.ucfg.pop(k)
+        self.ucfg.flush()
+        self.settings.flush()
+
+    def _first_load_done(self):
+        self.store.reset.disconnect(self._first_load_done)
+        startup_trace.mark(f"tasks loaded ({len(self.store)})")
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        if self._effects_pending:
+            self._effects_pending = False
+            # after the first paint: effects render offscreen and are not needed to show the window
+            QTimer.singleShot(0, self._update_effects)
+            QTimer.singleShot(0, lambda: startup_trace.mark("main window painted"))
+
+    # -------------------- Lazy tabs --------------------
+    def _add_lazy_tab(self, title, build):
+        tab = QWidget()
+        self._lazy_tabs[self.tabs.addTab(tab, title)] = (tab, build)
 
-        # reminders
-        self.reminder_timer = QTimer(self)
-        self.reminder_timer.timeout.connect(self.check_due_reminders)
-        self.reminder_timer.start(60_000)
-        self.check_due_reminders()
+    def _build_tab(self, index):
+        entry = self._lazy_tabs.pop(index, None)
+        if entry is None:
+            return
+        tab, build = entry
+        build(tab)
+        startup_trace.mark(f"{self.tabs.tabText(index)} tab built")
 
     # -------------------- Task tab --------------------
     def init_task_tab(self):
@@ -221,17 +296,17 @@ class MainWindow(QWidget):
         # Filters
         frow = QHBoxLayout()
         frow.addWidget(QLabel("Search:"))
-        self.search_input = QLineEdit(placeholderText="Type to filter by title/description...")
-        self.search_input.textChanged.connect(self.refresh_tasks)
+        self.search_input = QLineEdit(placeholderText="Type to search titles/descriptions...")
+        self.search_input.textChanged.connect(lambda *_: self.scheduler.invalidate_later("tasks", SEARCH_DEBOUNCE_MS))
         frow.addWidget(self.search_input, 1)
 
         self.group_filter = QComboBox()
         self.group_filter.addItem("All Groups")
-        self.group_filter.currentTextChanged.connect(self.refresh_tasks)
+        self.group_filter.currentTextChanged.connect(lambda *_: self.scheduler.invalidate("tasks"))
 
         self.status_filter = QComboBox()
         self.status_filter.addItems(["All", "Not Completed", "Completed", "Due Today"])
-        self.status_filter.currentTextChanged.connect(self.refresh_tasks)
+        self.status_filter.currentTextChanged.connect(lambda *_: self.scheduler.invalidate("tasks"))
 
         frow.addSpacing(8)
         frow.addWidget(QLabel("Group:"))
@@ -243,16 +318,34 @@ class MainWindow(QWidget):
 
         # List + under-list selection toolbar
         layout.addWidget(QLabel("Your Tasks:"))
-        self.task_list = QListWidget()
-        self.task_list.itemSelectionChanged.connect(self.show_description)
-        self.task_list.itemDoubleClicked.connect(lambda _: self.open_details_popup())
-        self.task_list.itemSelectionChanged.connect(self._update_list_actions)
+        self.task_model = TaskListModel(self)
+        self.task_delegate = TaskItemDelegate(self, self.settings.get("accent", "#7AA2F7"))
+        self.task_list = QListView()
+        self.task_list.setModel(self.task_model)
+        self.task_list.setItemDelegate(self.task_delegate)
+        self.task_list.setUniformItemSizes(True)  # O(1) layout for huge lists
+        self.task_list.setSelectionMode(QListView.SingleSelection)
+        self.task_list.selectionModel().currentChanged.connect(lambda *_: self.show_description())
+        self.task_list.selectionModel().currentChanged.connect(lambda *_: self._update_list_actions())
+        self.task_list.doubleClicked.connect(lambda _: self.open_details_popup())
         layout.addWidget(self.task_list, 1)
 
         # Mini toolbar under the list (selection-specific)
         list_actions = QHBoxLayout()
         self.sel_label = QLabel("No task selected")
         list_actions.addWidget(self.sel_label)
+        # shown while worker jobs are outstanding (after a short delay, so quick ones don't flicker)
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setFixedSize(80, 6)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.hide()
+        self._busy_timer = QTimer(self)
+        self._busy_timer.setSingleShot(True)
+        self._busy_timer.setInterval(BUSY_DELAY_MS)
+        self._busy_timer.timeout.connect(self.busy_bar.show)
+        self.workers.busy_changed.connect(self._on_busy_changed)
+        list_actions.addWidget(self.busy_bar)
         list_actions.addStretch(1)
 
         self.complete_button = QPushButton("✔️ Mark Complete")
@@ -290,8 +383,7 @@ class MainWindow(QWidget):
         self.tabs.addTab(tab, "Tasks")
 
     # -------------------- Calendar tab --------------------
-    def init_calendar_tab(self):
-        tab = QWidget()
+    def init_calendar_tab(self, tab):
         v = QVBoxLayout(tab)
 
         top = QHBoxLayout()
@@ -308,7 +400,8 @@ class MainWindow(QWidget):
         self.calendar.setGridVisible(True)
         self.calendar.clicked.connect(self.on_calendar_date_changed)
         self.calendar.selectionChanged.connect(self.on_calendar_selection_changed)
-        self.calendar.currentPageChanged.connect(lambda *_: self.refresh_calendar_marks())
+        self.calendar.currentPageChanged.connect(lambda *_: self.scheduler.invalidate("calendar"))
+        self.calendar_marker = CalendarMarker(self.calendar, MonthCounts(self.store))
 
         right_box = QWidget()
         right_layout = QVBoxLayout(right_box)
@@ -316,31 +409,70 @@ class MainWindow(QWidget):
         self.cal_tasks_list = QListWidget()
         right_layout.addWidget(self.cal_tasks_list, 1)
 
-        self.cal_splitter.addWidget(self.calendar)
-        self.cal_splitter.addWidget(right_box)
+        # agenda: overdue + upcoming days, paged in from SQLite as it scrolls
+        self.agenda = AgendaView(self.store)
+        self.agenda.open_task.connect(self.show_task)
+        self._agenda_stale = True
+        self.cal_side_tabs = QTabWidget()
+        self.cal_side_tabs.addTab(right_box, "Day")
+        self.cal_side_tabs.addTab(self.agenda, "Agenda")
+        self.cal_side_tabs.currentChanged.connect(lambda *_: self.scheduler.invalidate("agenda"))
+
+        # month grid + year heatmap share the left pane
+        self.year_view = YearView(YearCounts(self.store), self.settings.get("accent", "#7AA2F7"))
+        self.year_view.heatmap.day_clicked.connect(self.on_heatmap_day_clicked)
+        self.cal_views = QTabWidget()
+        self.cal_views.addTab(self.calendar, "Month")
+        self.cal_views.addTab(self.year_view, "Year")
+
+        self.cal_splitter.addWidget(self.cal_views)
+        self.cal_splitter.addWidget(self.cal_side_tabs)
         self.cal_splitter.setStretchFactor(0, 0)
         self.cal_splitter.setStretchFactor(1, 1)
 
         v.addWidget(self.cal_splitter, 1)
 
-        self.tabs.addTab(tab, "Calendar")
+        self.tabs.currentChanged.connect(lambda *_: self.scheduler.invalidate("agenda"))
+        if not self._effects_pending:
+            self._update_effects([self.calendar, self.cal_tasks_list])
+        self.scheduler.invalidate("calendar", "calendar_day", "agenda", "year")
 
     def toggle_calendar_panel(self):
-        if self.calendar.isVisible():
-            self.calendar.setVisible(False)
+        if self.cal_views.isVisible():
+            self.cal_views.setVisible(False)
             self.cal_toggle_btn.setText("Show Calendar")
         else:
-            self.calendar.setVisible(True)
+            self.cal_views.setVisible(True)
             self.cal_toggle_btn.setText("Hide Calendar")
 
+    def on_heatmap_day_clicked(self, day):
+        self.calendar.setSelectedDate(QDate(day.year, day.month, day.day))
+        self.cal_views.setCurrentIndex(0)
+        self.cal_side_tabs.setCurrentIndex(0)
+
     def on_calendar_selection_changed(self):
-        self.update_calendar_selected_label()
-        self.populate_calendar_day_list()
+        self.scheduler.invalidate("calendar_day")
 
     def on_calendar_date_changed(self, qdate: QDate):
-        self.update_calendar_selected_label(qdate)
+        self.scheduler.invalidate("calendar_day")
+
+    def _render_calendar_day(self):
+        if not hasattr(self, "calendar"):
+            return
+        self.update_calendar_selected_label()
         self.populate_calendar_day_list()
 
+    def _render_agenda(self):
+        # only reload what's on screen; a hidden agenda catches up when shown
+        if not hasattr(self, "agenda"):
+            return
+        if self.agenda.isVisible():
+            if self._agenda_stale:
+                self._agenda_stale = False
+                self.agenda.reload()
+        else:
+            self._agenda_stale = True
+
     def update_calendar_selected_label(self, qdate: QDate = None):
         qd = qdate if qdate is not None else self.calendar.selectedDate()
         py = date(qd.year(), qd.month(), qd.day())
@@ -354,105 +486,35 @@ class MainWindow(QWidget):
         qd = self.calendar.selectedDate()
         day_iso = f"{qd.year():04d}-{qd.month():02d}-{qd.day():02d}"
 
-        tasks_on_day = [t for t in db.get_tasks(self.user[0]) if t[5] == day_iso]
+        tasks_on_day = self.store.query(due_on=day_iso)
         if not tasks_on_day:
             self.cal_tasks_list.addItem("No tasks due.")
             return
 
         for t in tasks_on_day:
-            task_id = t[0]
-            title = t[2]
-            completed = bool(t[4])
-            group = self.ucfg["task_groups"].get(str(task_id), "")
-            group_badge = f"[{group}] " if group else ""
-            prio = self.ucfg["priorities"].get(str(task_id), "low")
-            picon = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(prio, "🟢")
-            status = "✅" if completed else "❌"
-            self.cal_tasks_list.addItem(f"{status} {picon} [{task_id}] {group_badge}{title}")
+            group_badge = f"[{t.group}] " if t.group else ""
+            picon = PRIORITY_ICONS.get(t.priority, "🟢")
+            status = "✅" if t.completed else "❌"
+            self.cal_tasks_list.addItem(f"{status} {picon} [{t.id}] {group_badge}{t.title}")
+
+    def _render_year(self):
+        if hasattr(self, "year_view"):
+            self.year_view.heatmap.refresh()
 
     def refresh_calendar_marks(self):
-        cal = self.calendar
-
-        # Palette
-        accent_hex = self.cfg.get("accent", "#7AA2F7")
-        accent = QColor(accent_hex)
-        accent_soft = QColor(accent)
-        accent_soft.setAlphaF(0.22)
-        accent_strong = QColor(accent)
-        accent_strong.setAlphaF(0.38)
-
-        slate = QColor(34, 42, 64, int(255*0.60))   # default tile for in-month
-        slate_dim = QColor(34, 42, 64, int(255*0.28))  # out-of-month
-        text_main = QColor("#EAF2FF")
-        text_dim  = QColor(200, 210, 230, 160)
-
-        # Clear formats for the visible month to soft slate (not black)
-        year, month = cal.yearShown(), cal.monthShown()
-        first = QDate(year, month, 1)
-        days = first.daysInMonth()
-
-        base_fmt = QTextCharFormat()
-        base_fmt.setBackground(slate)
-        base_fmt.setForeground(text_main)
-
-        for d in range(1, days + 1):
-            cal.setDateTextFormat(QDate(year, month, d), base_fmt)
-
-            
-        # Iterate a bit around the month range to catch neighbors.
-        for delta in (-7, -6, -5, -4, -3, -2, -1, days+1, days+2, days+3, days+4, days+5, days+6, days+7):
-            qd = first.addDays(delta)
-            fmt = QTextCharFormat()
-            fmt.setBackground(slate_dim)
-            fmt.setForeground(text_dim)
-            cal.setDateTextFormat(qd, fmt)
-
-        # Build marks: any task on date, and if any are incomplete
-        marks = {}  # QDate -> (any, has_incomplete)
-        for t in db.get_tasks(self.user[0]):
-            d = t[5]
-            if not d:
-                continue
-            try:
-                dt = datetime.strptime(d, "%Y-%m-%d").date()
-            except Exception:
-                continue
-            qd = QDate(dt.year, dt.month, dt.day)
-            any_in_month = (dt.year == year and dt.month == month)
-            if not any_in_month:
-                continue
-            completed = bool(t[4])
-            prev_any, prev_incomp = marks.get(qd, (False, False))
-            marks[qd] = (True, prev_incomp or (not completed))
-
-        # Apply accent for days with tasks
-        for qd, (_any, has_incomplete) in marks.items():
-            fmt = QTextCharFormat()
-            fmt.setForeground(text_main)
-            if has_incomplete:
-                fmt.setBackground(accent_strong)   # brighter accent bubble
-                fmt.setFontWeight(75)
-            else:
-                fmt.setBackground(accent_soft)     # subtle tint if all done
-                fmt.setFontWeight(63)
-            cal.setDateTextFormat(qd, fmt)
-
-        # Highlight "today" with a stronger tile (without neon)
-        today = date.today()
-        if today.year == year and today.month == month:
-            qd = QDate(today.year, today.month, today.day)
-            tf = cal.dateTextFormat(qd)
-            tf.setBackground(QColor(80, 96, 150, 160))  # bluish ring effect
-            tf.setFontWeight(81)
-            cal.setDateTextFormat(qd, tf)
+        # counts come from a per-month cache, formats from a per-accent cache;
+        # only days whose mark changed are repainted
+        if not hasattr(self, "calendar_marker"):
+            return
+        self.calendar_marker.set_palette(self.settings.get("theme", "aurora"),
+                                         self.settings.get("accent", "#7AA2F7"))
+        self.calendar_marker.paint()
 
         # Keep right pane + label in sync
-        self.populate_calendar_day_list()
-        self.update_calendar_selected_label()
+        self.scheduler.invalidate("calendar_day")
 
     # -------------------- Settings tab --------------------
-    def init_settings_tab(self):
-        tab = QWidget()
+    def init_settings_tab(self, tab):
         layout = QVBoxLayout(tab)
         layout.addWidget(QLabel("⚙️ Settings"))
 
@@ -460,7 +522,7 @@ class MainWindow(QWidget):
         theme_row.addWidget(QLabel("Theme:"))
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(["Light", "Dark", "Aurora"])
-        current_theme = self.cfg.get("theme", "aurora").lower()
+        current_theme = self.settings.get("theme", "aurora").lower()
         self.theme_combo.setCurrentIndex(0 if current_theme == "light" else 1 if current_theme == "dark" else 2)
         self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
         theme_row.addWidget(self.theme_combo)
@@ -470,7 +532,7 @@ class MainWindow(QWidget):
         self.accent_combo = QComboBox()
         presets = ["#7AA2F7", "#4caf50", "#ff9800", "#e91e63", "#9c27b0", "Custom…"]
         self.accent_combo.addItems(presets)
-        current_accent = self.cfg.get("accent", "#7AA2F7")
+        current_accent = self.settings.get("accent", "#7AA2F7")
         try:
             idx = presets.index(current_accent)
         except ValueError:
@@ -479,6 +541,16 @@ class MainWindow(QWidget):
         self.accent_combo.currentTextChanged.connect(self.on_accent_changed)
         theme_row.addWidget(self.accent_combo)
 
+        theme_row.addSpacing(16)
+        theme_row.addWidget(QLabel("Rendering:"))
+        self.render_mode_combo = QComboBox()
+        self.render_mode_combo.addItems([m.capitalize() for m in RENDER_MODES])
+        self.render_mode_combo.setToolTip("Performance: flat colours and no shadow effects, for cheaper repaints")
+        mode = self.settings.get("render_mode", "quality")
+        self.render_mode_combo.setCurrentIndex(RENDER_MODES.index(mode) if mode in RENDER_MODES else 0)
+        self.render_mode_combo.currentTextChanged.connect(self.on_render_mode_changed)
+        theme_row.addWidget(self.render_mode_combo)
+
         theme_row.addStretch(1)
         layout.addLayout(theme_row)
 
@@ -496,249 +568,96 @@ class MainWindow(QWidget):
         layout.addLayout(row)
 
         layout.addStretch(1)
-        self.tabs.addTab(tab, "Settings")
+        self.refresh_stats_label = QLabel("")
+        self.refresh_stats_label.setStyleSheet("color:#888;")
+        layout.addWidget(self.refresh_stats_label)
+        self.tabs.currentChanged.connect(
+            lambda i: i == self.tabs.indexOf(tab) and self._update_refresh_stats()
+        )
+        self._update_refresh_stats()
+
+    def _update_refresh_stats(self):
+        per_view = ", ".join(
+            f"{name} {st['ran']}/{st['requested']}" for name, st in self.scheduler.stats().items()
+        )
+        self.refresh_stats_label.setText(f"Refresh passes: {self.scheduler.summary()}")
+        self.refresh_stats_label.setToolTip(f"renders/requests per view: {per_view}")
 
     # -------------------- Theme & Accent --------------------
     def on_theme_changed(self, text: str):
         theme = text.lower()
-        self.cfg["theme"] = theme
-        _save_cfg(self.cfg)
+        self.settings.set("theme", theme)
         self.apply_theme(theme)
-        self.apply_accent(self.cfg.get("accent", "#7AA2F7"))
-        self._apply_aurora_effects_if_needed()
-        self.refresh_calendar_marks()
+        self._update_effects()
+        self.scheduler.invalidate("calendar")
 
     def on_accent_changed(self, text: str):
         color = text
         if text == "Custom…":
             from PyQt5.QtWidgets import QColorDialog
-            chosen = QColorDialog.getColor(QColor(self.cfg.get("accent", "#7AA2F7")), self, "Pick Accent Color")
+            chosen = QColorDialog.getColor(QColor(self.settings.get("accent", "#7AA2F7")), self, "Pick Accent Color")
             if chosen.isValid():
                 color = chosen.name()
             else:
                 return
-        self.cfg["accent"] = color
-        _save_cfg(self.cfg)
+        self.settings.set("accent", color)
         self.apply_accent(color)
-        self.refresh_calendar_marks()
+        self.scheduler.invalidate("calendar")
+
+    def on_render_mode_changed(self, text: str):
+        self.settings.set("render_mode", text.lower())
+        self._apply_theme_qss()
+        self._update_effects()
 
     def apply_theme(self, theme: str):
-        app = QApplication.instance()
-        if not app:
-            return
-        theme = theme.lower()
-        if theme == "aurora":
-            app.setStyleSheet(self._aurora_qss())
-        elif theme == "dark":
-            app.setStyleSheet(self._dark_qss())
-        else:
-            app.setStyleSheet(self._light_qss())
+        self._apply_theme_qss(theme)
 
     def apply_accent(self, hex_color: str):
         accent = hex_color
-        # overrides work across all themes
-        self.setStyleSheet(f"""
-        QLineEdit:focus, QTextEdit:focus, QListWidget:focus {{ border: 1px solid {accent}; }}
-        QListWidget::item:selected {{ background: {accent}; color: white; }}
-        QPushButton:hover {{ border: 1px solid {accent}; }}
-        QProgressBar::chunk {{ background-color: {accent}; }}
-        """)
-
-    def _apply_aurora_effects_if_needed(self):
-        if self.cfg.get("theme", "aurora").lower() != "aurora":
+        self.task_delegate.set_accent(accent)
+        self.task_list.viewport().update()
+        if hasattr(self, "year_view"):
+            self.year_view.heatmap.set_accent(accent)
+        # overrides work across all themes; kept on this window, so a change
+        # repolishes it rather than the whole application
+        if accent != self._accent:
+            self._accent = accent
+            self.setStyleSheet(accent_qss(accent))
+
+    def _apply_theme_qss(self, theme=None):
+        # one cached application stylesheet per theme and render mode; setting
+        # it repolishes every widget, so an unchanged key is not re-applied
+        app = QApplication.instance()
+        if not app:
             return
-        self._apply_aurora_effects()
-
-    def _apply_aurora_effects(self):
-        # Soft glow around "cards"
-        def glow(w, radius=24, alpha=0.22):
-            eff = QGraphicsDropShadowEffect(self)
-            eff.setColor(QColor(122, 162, 247, int(alpha * 255)))
-            eff.setBlurRadius(radius)
-            eff.setOffset(0, 6)
-            w.setGraphicsEffect(eff)
-
-        for w in [
-            getattr(self, "task_list", None),
-            getattr(self, "task_details", None),
-            getattr(self, "search_input", None),
-            getattr(self, "due_date_input", None),
-            getattr(self, "level_bar", None),
-            getattr(self, "calendar", None),
-            getattr(self, "cal_tasks_list", None),
-        ]:
-            if w:
-                glow(w)
-
-    def _aurora_qss(self) -> str:
-        # Aurora: glassy cards on blue-violet gradient (QSS-safe)
-        return """
-        QWidget {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                        stop:0 #0f1424, stop:0.5 #151a2d, stop:1 #1b213a);
-            color: #EAF2FF; font-size: 14px;
-        }
-        QLabel { color: #EAF2FF; }
-
-        /* Glass cards */
-        QLineEdit, QTextEdit, QListWidget, QComboBox, QCalendarWidget,
-        QTabWidget::pane, QProgressBar {
-            background: rgba(255,255,255,0.06);
-            border: 1px solid rgba(255,255,255,0.12);
-            border-radius: 12px;
-            padding: 6px;
-        }
-        QCalendarWidget QWidget { background: transparent; color: #EAF2FF; }
-
-        /* Inputs focus ring (just border color) */
-        QLineEdit:focus, QTextEdit:focus, QListWidget:focus, QComboBox:focus {
-            border: 1px solid #7AA2F7;
-        }
-
-        /* Buttons: gradient; no CSS filters */
-        QPushButton {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                        stop:0 #4A5EEA, stop:1 #6ED3FF);
-            color: #ffffff; border: 0; border-radius: 10px; padding: 7px 12px;
-        }
-        QPushButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                        stop:0 #5567f0, stop:1 #7ae0ff);
-        }
-        QPushButton:pressed {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                        stop:0 #3d54d9, stop:1 #55c7f5);
-        }
-
-        /* Secondary/chip look when property flat=true */
-        QPushButton[flat="true"] {
-            background: rgba(255,255,255,0.08); color: #EAF2FF;
-            border: 1px solid rgba(255,255,255,0.12);
-        }
-        QPushButton[flat="true"]:hover {
-            border: 1px solid rgba(122,162,247,0.45);
-            background: rgba(122,162,247,0.12);
-        }
-        QPushButton[flat="true"]:pressed {
-            background: rgba(122,162,247,0.22);
-        }
-
-        /* Tabs */
-        QTabBar::tab {
-            background: rgba(255,255,255,0.08);
-            color: #DDE9FF; padding: 8px 14px;
-            border: 1px solid rgba(255,255,255,0.12);
-            border-top-left-radius: 10px; border-top-right-radius: 10px;
-            margin-right: 6px;
-        }
-        QTabBar::tab:selected {
-            background: rgba(122,162,247,0.18); color: #FFFFFF;
-            border: 1px solid rgba(122,162,247,0.35);
-        }
-
-        /* Lists & selection */
-        QListWidget::item { padding: 6px; margin: 3px 4px; border-radius: 8px; }
-        QListWidget::item:selected { background: rgba(122,162,247,0.35); color: #FFFFFF; }
-
-        /* Combo popup */
-        QComboBox QAbstractItemView {
-            background: rgba(20,25,45,0.98);
-            color: #EAF2FF; border: 1px solid rgba(255,255,255,0.12);
-            selection-background-color: rgba(122,162,247,0.35);
-        }
-
-        /* Progress */
-        QProgressBar { text-align: center; height: 18px; }
-        QProgressBar::chunk {
-            background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                        stop:0 #8A7DFF, stop:1 #4AD0FF);
-            border-radius: 8px;
-        }
-
-        /* Calendar tweaks (Aurora) */
-        QCalendarWidget {
-            background: transparent;
-            color: #EAF2FF;
-        }
-        QCalendarWidget QTableView {
-            background: rgba(255,255,255,0.05); /* soft slate instead of black */
-            alternate-background-color: transparent;
-            outline: 0;
-        }
-        QCalendarWidget QTableView:item {
-            padding: 6px;
-        }
-        QCalendarWidget QToolButton {
-            background: rgba(255,255,255,0.10);
-            border: 1px solid rgba(255,255,255,0.15);
-            border-radius: 8px;
-            padding: 4px 10px;
-        }
-        QCalendarWidget QToolButton:hover {
-            background: rgba(255,255,255,0.16);
-        }
-        QCalendarWidget QMenu {
-            background: rgba(20,25,45,0.98);
-            color: #EAF2FF;
-            border: 1px solid rgba(255,255,255,0.12);
-        }
-        QCalendarWidget QSpinBox, 
-        QCalendarWidget QComboBox {
-            background: rgba(255,255,255,0.10);
-            border: 1px solid rgba(255,255,255,0.15);
-            color: #EAF2FF;
-            border-radius: 6px;
-            padding: 2px 6px;
-        }
-
-        """
-
-    def _light_qss(self) -> str:
-        return """
-        QWidget { background: #ffffff; color: #111111; font-size: 14px; }
-        QLabel { color: #222222; }
-        QLineEdit, QTextEdit, QListWidget {
-            background: #ffffff; color: #111111; border: 1px solid #cfcfcf; border-radius: 6px; padding: 6px;
-        }
-        QPushButton {
-            background: #f3f3f3; color: #111111; border: 1px solid #cfcfcf; border-radius: 8px; padding: 6px 10px;
-        }
-        QPushButton:pressed { background: #e0e0e0; }
-        QTabWidget::pane { border: 1px solid #cfcfcf; border-radius: 8px; }
-        QTabBar::tab {
-            background: #f6f6f6; padding: 8px 12px; border: 1px solid #cfcfcf; border-bottom: none; border-top-left-radius: 8px; border-top-right-radius: 8px;
-        }
-        QTabBar::tab:selected { background: #ffffff; }
-        QComboBox {
-            background: #ffffff; color: #111111; border: 1px solid #cfcfcf; border-radius: 6px; padding: 4px 8px;
-        }
-        QComboBox QAbstractItemView { background: #ffffff; color: #111111; selection-background-color: #e6f0ff; }
-        QProgressBar { border: 1px solid #cfcfcf; border-radius: 6px; height: 16px; text-align: center; }
-        """
-
-    def _dark_qss(self) -> str:
-        return """
-        QWidget { background: #121212; color: #e6e6e6; font-size: 14px; }
-        QLabel { color: #e6e6e6; }
-        QLineEdit, QTextEdit, QListWidget {
-            background: #1e1e1e; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 6px; padding: 6px;
-        }
-        QPushButton {
-            background: #232323; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 8px; padding: 6px 10px;
-        }
-        QPushButton:pressed { background: #333333; }
-        QTabWidget::pane { border: 1px solid #3a3a3a; border-radius: 8px; }
-        QTabBar::tab {
-            background: #1a1a1a; padding: 8px 12px; border: 1px solid #3a3a3a; border-bottom: none; border-top-left-radius: 8px; border-top-right-radius: 8px; color: #cccccc;
-        }
-        QTabBar::tab:selected { background: #121212; color: #ffffff; }
-        QComboBox {
-            background: #1e1e1e; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 6px; padding: 4px 8px;
-        }
-        QComboBox QAbstractItemView { background: #1e1e1e; color: #e6e6e6; selection-background-color: #2a3c55; }
-        QListWidget::item:selected { background: #2a3c55; }
-        QProgressBar { border: 1px solid #3a3a3a; border-radius: 6px; height: 16px; text-align: center; }
-        """
+        key = ((theme or self.settings.get("theme", "aurora")).lower(),
+               self.settings.get("render_mode", "quality"))
+        if key == self._theme_key:
+            return
+        self._theme_key = key
+        app.setStyleSheet(compiled_qss(*key))
+
+    def _update_effects(self, widgets=None):
+        # Soft glow around "cards": Aurora in quality mode only. Each effect
+        # renders its widget offscreen on every repaint, so other modes drop them.
+        glow = (self.settings.get("theme", "aurora").lower() == "aurora"
+                and self.settings.get("render_mode", "quality") != "performance")
+        if widgets is None:
+            widgets = [getattr(self, name, None) for name in (
+                "task_list", "task_details", "search_input", "due_date_input",
+                "level_bar", "calendar", "cal_tasks_list",
+            )]
+        for w in widgets:
+            if w is None:
+                continue
+            if glow:
+                eff = QGraphicsDropShadowEffect(self)
+                eff.setColor(QColor(122, 162, 247, int(0.22 * 255)))
+                eff.setBlurRadius(24)
+                eff.setOffset(0, 6)
+                w.setGraphicsEffect(eff)
+            elif w.graphicsEffect() is not None:
+                w.setGraphicsEffect(None)
 
     # -------------------- CRUD --------------------
     def add_task(self):
@@ -748,21 +667,13 @@ class MainWindow(QWidget):
         prio = self.priority_combo.currentText().lower()
         group = self.group_combo.currentText().strip()
 
-        if not title:
-            QMessageBox.warning(self, "Input Error", "Task title cannot be empty."); return
-        if len(title) > 100:
-            QMessageBox.warning(self, "Input Error", "Task title too long (max 100)."); return
-        if len(description) > 1000:
-            QMessageBox.warning(self, "Input Error", "Task description too long (max 1000)."); return
-        if due and not re.match(r"^\d{4}-\d{2}-\d{2}$", due):
-            QMessageBox.warning(self, "Input Error", "Due date must be YYYY-MM-DD."); return
-
-        # insert (allow None for due date)
         try:
-            db.add_task(self.user[0], title, description, due or None)
-        except Exception as e:
-            QMessageBox.critical(self, "Add Task Failed", f"{e}")
-            return
+            title, description, due = validate_task(title, description, due)
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", str(e)); return
+
+        # insert (allow None for due date); failures surface through store.failed
+        self.store.add(title, description, due, prio, group or None)
 
         # clear inputs
         self.task_input.clear()
@@ -775,129 +686,66 @@ class MainWindow(QWidget):
             self.group_combo.lineEdit().setPlaceholderText("Group (optional)")
         self.priority_combo.setCurrentIndex(0)
 
-        # reflect metadata for the new task
-        self.refresh_tasks()
-        tasks = db.get_tasks(self.user[0])
-        if tasks:
-            new_task_id = tasks[-1][0]
-            self.ucfg["priorities"][str(new_task_id)] = prio
-            if group:
-                self.ucfg["task_groups"][str(new_task_id)] = group
-                if group not in self.ucfg["groups"]:
-                    self.ucfg["groups"].append(group)
-            _save_cfg(self.cfg)
-            self.refresh_group_controls()
-            # make sure new no-date tasks are visible
-            self.status_filter.setCurrentText("All")
-            self.refresh_tasks()
+        # make sure new no-date tasks are visible
+        self.status_filter.setCurrentText("All")
 
     def refresh_tasks(self):
-        prev_id = None
-        item = getattr(self, "task_list", None)
-        if item and item.currentItem():
-            try:
-                prev_id = int(item.currentItem().text().split("]")[0].split("[")[1])
-            except Exception:
-                prev_id = None
-
-        self.task_list.clear()
-        query = self.search_input.text().strip().lower() if hasattr(self, "search_input") else ""
-        filter_mode = self.status_filter.currentText() if hasattr(self, "status_filter") else "All"
-        gfilter = self.group_filter.currentText() if hasattr(self, "group_filter") else "All Groups"
-
-        for task in db.get_tasks(self.user[0]):
-            # task[0]=id, task[2]=title, task[4]=completed, task[5]=due_date
-            task_id = task[0]
-            title = task[2]
-            completed = bool(task[4])
-            due_val = task[5]
+        """Task data changed: re-render everything that shows tasks (next tick)."""
+        self._agenda_stale = True
+        self.scheduler.invalidate("tasks", "user_info", "calendar", "calendar_day", "agenda", "year")
 
-            # description for search
-            conn = db.get_connection(); cur = conn.cursor()
-            cur.execute("SELECT description FROM tasks WHERE id=?", (task_id,))
-            rr = cur.fetchone()
-            conn.close()
-            desc = (rr[0] if rr else "") or ""
+    def _render_task_list(self):
+        # a search runs on a worker; a newer render supersedes one still waiting
+        self.store.query_async(self._show_task_list, **self._task_filters())
 
-            group = self.ucfg["task_groups"].get(str(task_id), "")
-
-            # Filters
-            if gfilter != "All Groups" and group != gfilter:
-                continue
-            if query:
-                hay = f"{title}\n{desc}".lower()
-                if query not in hay:
-                    continue
-            if filter_mode == "Completed" and not completed:
-                continue
-            if filter_mode == "Not Completed" and completed:
-                continue
-            if filter_mode == "Due Today":
-                if not due_val:
-                    continue
-                try:
-                    dt = datetime.strptime(due_val, "%Y-%m-%d").date()
-                    if dt != date.today():
-                        continue
-                except Exception:
-                    continue
-
-            prio = self.ucfg["priorities"].get(str(task_id), "low")
-            picon = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(prio, "🟢")
-            status = "✅" if completed else "❌"
-
-            # --- Due date text (show something sensible if empty) ---
-            if due_val:
-                try:
-                    dt = datetime.strptime(due_val, "%Y-%m-%d").date()
-                    if dt == date.today():
-                        due_txt = " (Due Today!)"
-                    else:
-                        due_txt = f" (Due: {dt.strftime('%B %d, %Y')})"
-                except Exception:
-                    due_txt = f" (Due: {due_val})"
-            else:
-                due_txt = " (No due date)"
+    def _show_task_list(self, tasks):
+        prev_id = self._selected_task_id()
 
-            group_badge = f"[{group}] " if group else ""
-            txt = f"{status} {picon} [{task_id}] {group_badge}{title}{due_txt}"
-            self.task_list.addItem(txt)
-            if "Due Today!" in due_txt and not completed:
-                self.task_list.item(self.task_list.count() - 1).setForeground(Qt.red)
+        # diffed into the model: selection and scroll position survive
+        self.task_model.set_tasks(tasks)
 
-        self.refresh_user_info()
-        self.refresh_calendar_marks()
+        if prev_id is not None and self._selected_task_id() != prev_id:
+            row = self.task_model.row_of(prev_id)
+            if row >= 0:
+                self.task_list.setCurrentIndex(self.task_model.index(row))
         self._update_list_actions()
-
-        if prev_id is not None:
-            for i in range(self.task_list.count()):
-                if f"[{prev_id}]" in self.task_list.item(i).text():
-                    self.task_list.setCurrentRow(i)
-                    break
+        self.scheduler.invalidate("details")  # highlights follow the search text
+
+    def _task_filters(self) -> dict:
+        """Current search/status/group controls as TaskStore.query keyword args."""
+        filters = {}
+        query = self.search_input.text().strip() if hasattr(self, "search_input") else ""
+        if query:
+            filters["search"] = query
+        filter_mode = self.status_filter.currentText() if hasattr(self, "status_filter") else "All"
+        if filter_mode == "Completed":
+            filters["status"] = "done"
+        elif filter_mode == "Not Completed":
+            filters["status"] = "open"
+        elif filter_mode == "Due Today":
+            filters["due_on"] = _today_iso()
+        gfilter = self.group_filter.currentText() if hasattr(self, "group_filter") else "All Groups"
+        if gfilter != "All Groups":
+            filters["group"] = gfilter
+        return filters
 
     def refresh_user_info(self):
-        xp = db.get_user_xp(self.user[0])
+        xp = self.store.xp
         self.user_label.setText(f"XP: {xp}")
         self.level_label.setText(f"Level: {xp // 100}")
         self.level_bar.setValue(xp % 100)
         self.update_streak_label()
 
     def _selected_task_id(self):
-        item = self.task_list.currentItem()
-        if not item:
-            return None
-        try:
-            return int(item.text().split("]")[0].split("[")[1])
-        except Exception:
-            return None
+        idx = self.task_list.currentIndex()
+        return idx.data(TaskIdRole) if idx.isValid() else None
 
     def complete_task(self):
         task_id = self._selected_task_id()
         if task_id is None:
             return
-        db.complete_task(task_id, self.user[0])
+        self.store.complete(task_id)
         self._log_completion_today()
-        self.refresh_tasks()
 
     def delete_task(self):
         task_id = self._selected_task_id()
@@ -905,58 +753,33 @@ class MainWindow(QWidget):
             return
         if QMessageBox.question(self, "Delete", "Delete this task?",
                                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No) == QMessageBox.Yes:
-            db.delete_task(task_id)
-            self.ucfg["priorities"].pop(str(task_id), None)
-            self.ucfg["task_groups"].pop(str(task_id), None)
-            for day, arr in list(self.ucfg.get("reminded", {}).items()):
-                self.ucfg["reminded"][day] = [x for x in arr if str(x) != str(task_id)]
-            _save_cfg(self.cfg)
-            self.refresh_tasks()
+            self.store.delete(task_id)  # reminders go with it (ON DELETE CASCADE)
 
     def _update_list_actions(self):
-        item = self.task_list.currentItem()
-        has = item is not None
+        task_id = self._selected_task_id()
+        has = task_id is not None
         self.complete_button.setEnabled(has)
         self.delete_button.setEnabled(has)
         if has:
-            try:
-                task_id = int(item.text().split("]")[0].split("[")[1])
-                self.sel_label.setText(f"Selected: [{task_id}]")
-            except Exception:
-                self.sel_label.setText("Selected task")
+            self.sel_label.setText(f"Selected: [{task_id}]")
         else:
             self.sel_label.setText("No task selected")
 
     def show_description(self):
-        item = self.task_list.currentItem()
-        if not item:
-            self.task_details.setPlainText("Select a task to see its description.")
-            return
-        try:
-            task_id = int(item.text().split("]")[0].split("[")[1])
-        except Exception:
+        task_id = self._selected_task_id()
+        if task_id is None:
             self.task_details.setPlainText("Select a task to see its description.")
             return
 
-        conn = db.get_connection(); cur = conn.cursor()
-        cur.execute("SELECT title, description, due_date FROM tasks WHERE id=?", (task_id,))
-        row = cur.fetchone(); conn.close()
+        row = self.store.get(task_id)
         if not row:
             self.task_details.setPlainText("Select a task to see its description.")
             return
 
-        title, desc, due = row
-        if due:
-            try:
-                dt = datetime.strptime(due, "%Y-%m-%d").date()
-                due_txt = "Today" if dt == date.today() else dt.strftime("%B %d, %Y")
-            except Exception:
-                due_txt = due
-        else:
-            due_txt = "No due date"
-
-        prio = self.ucfg["priorities"].get(str(task_id), "low").capitalize()
-        group = self.ucfg["task_groups"].get(str(task_id), "")
+        title, desc = row.title, row.description
+        due_txt = self._due_label(row)
+        prio = row.priority.capitalize()
+        group = row.group or ""
         group_line = f"\nGroup: {group}" if group else ""
         body = f"Title: {title}{group_line}\nPriority: {prio}"
         if due_txt:
@@ -964,31 +787,55 @@ class MainWindow(QWidget):
         body += f"\n\nDescription:\n{desc or '(no description)'}"
         self.task_details.setPlainText(body)
 
-    def open_details_popup(self):
-        item = self.task_list.currentItem()
-        if not item:
+        query = self.search_input.text().strip()
+        if query:
+            # highlighted version once the worker has it (dropped if the selection moved on)
+            self.workers.run(db.search_highlights, task_id, query, key="highlights",
+                             on_done=lambda hl: self._show_highlights(task_id, query, hl, prio, group, due_txt))
+        else:
+            self.workers.cancel("highlights")
+
+    def _show_highlights(self, task_id, query, hl, prio, group, due_txt):
+        if not hl or task_id != self._selected_task_id() or query != self.search_input.text().strip():
             return
-        try:
-            task_id = int(item.text().split("]")[0].split("[")[1])
-        except Exception:
+        # same layout as show_description, as rich text with the search hits marked
+        mark = self._search_hit_html
+        group_line = f"<br>Group: {html.escape(group)}" if group else ""
+        body = f"Title: {mark(hl['title'])}{group_line}<br>Priority: {prio}"
+        if due_txt:
+            body += f"<br>Due Date: {html.escape(due_txt)}"
+        if hl["snippet"]:
+            body += f"<br><br>Match: {mark(hl['snippet'])}"
+        body += f"<br><br>Description:<br>{mark(hl['description']) or '(no description)'}"
+        self.task_details.setHtml(body)
+
+    @staticmethod
+    def _due_label(task) -> str:
+        if not task.due_date:
+            return "No due date"
+        if task.due is None:
+            return task.due_date
+        return "Today" if task.due == date.today() else long_date(task.due)
+
+    def _search_hit_html(self, text: str) -> str:
+        """Escape text for the details pane and paint db.HL_START/HL_END spans."""
+        accent = self.settings.get("accent", "#7AA2F7")
+        out = html.escape(text or "").replace("\n", "<br>")
+        out = out.replace(db.HL_START, f'<span style="background-color:{accent}; color:#ffffff;">')
+        return out.replace(db.HL_END, "</span>")
+
+    def open_details_popup(self):
+        task_id = self._selected_task_id()
+        if task_id is None:
             return
 
-        conn = db.get_connection(); cur = conn.cursor()
-        cur.execute("SELECT title, description, due_date FROM tasks WHERE id=?", (task_id,))
-        row = cur.fetchone(); conn.close()
+        row = self.store.get(task_id)
         if not row:
             return
-        title, desc, due = row
-        prio = self.ucfg["priorities"].get(str(task_id), "low").capitalize()
-        group = self.ucfg["task_groups"].get(str(task_id), "")
-        if due:
-            try:
-                dt = datetime.strptime(due, "%Y-%m-%d").date()
-                due_txt = "Today" if dt == date.today() else dt.strftime("%B %d, %Y")
-            except Exception:
-                due_txt = due
-        else:
-            due_txt = "No due date"
+        title, desc = row.title, row.description
+        prio = row.priority.capitalize()
+        group = row.group or ""
+        due_txt = self._due_label(row)
         gline = f"\nGroup: {group}" if group else ""
         content = f"Title: {title}{gline}\nPriority: {prio}"
         if due_txt:
@@ -1017,7 +864,7 @@ class MainWindow(QWidget):
         row1.addWidget(QLabel("Group:"))
         group_box = QComboBox()
         group_box.setEditable(True)
-        for g in self.ucfg.get("groups", []):
+        for g in self.store.groups:
             group_box.addItem(g)
         row1.addWidget(group_box, 1)
         vv.addLayout(row1)
@@ -1044,7 +891,7 @@ class MainWindow(QWidget):
 
         def _accept():
             due_str = due_edit.text().strip()
-            if due_str and not re.match(r"^\d{4}-\d{2}-\d{2}$", due_str):
+            if not valid_due_date(due_str):
                 QMessageBox.warning(dlg, "Input Error", "Due date must be YYYY-MM-DD.")
                 return
             lines = [ln.strip() for ln in titles_edit.toPlainText().splitlines()]
@@ -1064,166 +911,126 @@ class MainWindow(QWidget):
         due_str = due_edit.text().strip()
         titles = [ln.strip() for ln in titles_edit.toPlainText().splitlines() if ln.strip()]
 
-        imported = 0
-        for title in titles:
-            db.add_task(self.user[0], title, "", due_str or None)
-            imported += 1
-
-        if imported:
-            tasks_now = db.get_tasks(self.user[0])
-            new_ids = [x[0] for x in tasks_now[-imported:]]
-            for new_id in new_ids:
-                if group_name:
-                    self.ucfg["task_groups"][str(new_id)] = group_name
-            if group_name and group_name not in self.ucfg["groups"]:
-                self.ucfg["groups"].append(group_name)
-            _save_cfg(self.cfg)
-            self.refresh_group_controls()
-            self.refresh_tasks()
-            QMessageBox.information(self, "Bulk Add", f"Added {imported} tasks to group '{group_name or 'No Group'}'.")
+        def added(new_ids):
+            if new_ids:
+                QMessageBox.information(self, "Bulk Add", f"Added {len(new_ids)} tasks to group '{group_name or 'No Group'}'.")
 
-    # -------------------- Reminders & Streak --------------------
-    def check_due_reminders(self):
-        today = _today_iso()
-        reminded_today = set(map(str, self.ucfg.get("reminded", {}).get(today, [])))
-        to_add = []
-
-        for task in db.get_tasks(self.user[0]):
-            task_id = str(task[0])
-            completed = bool(task[4])
-            due = task[5]
-            if completed or not due:
-                continue
-            try:
-                dt = datetime.strptime(due, "%Y-%m-%d").date()
-            except Exception:
-                continue
+        self.store.add_many(
+            ((title, "", due_str or None, "low", group_name or None) for title in titles),
+            on_done=added,
+        )
 
-            if dt == date.today() and task_id not in reminded_today:
-                title = task[2]
-                group = self.ucfg["task_groups"].get(task_id, "")
-                gtxt = f" [{group}]" if group else ""
-                QMessageBox.information(self, "Reminder", f"⚠️ '{title}'{gtxt} is due today.")
-                to_add.append(task_id)
-
-        if to_add:
-            self.ucfg.setdefault("reminded", {})
-            self.ucfg.setdefault("reminded", {}).setdefault(today, [])
-            self.ucfg["reminded"][today].extend(to_add)
-            _save_cfg(self.cfg)
+    # -------------------- Reminders & Streak --------------------
+    def show_task(self, task_id):
+        """Bring a task into view in the Tasks tab (clearing filters that hide it)."""
+        self.tabs.setCurrentIndex(0)
+        if self.task_model.row_of(task_id) < 0:
+            self.search_input.clear()
+            self.status_filter.setCurrentText("All")
+            self.group_filter.setCurrentIndex(0)
+            self.scheduler.invalidate("tasks")
+            self.scheduler.flush()
+        row = self.task_model.row_of(task_id)
+        if row >= 0:
+            index = self.task_model.index(row)
+            self.task_list.setCurrentIndex(index)
+            self.task_list.scrollTo(index)
 
     def _log_completion_today(self):
         today = _today_iso()
         logs = self.ucfg.get("completion_log", [])
         if today not in logs:
-            logs.append(today)
-            self.ucfg["completion_log"] = logs
-            _save_cfg(self.cfg)
+            self.ucfg.set("completion_log", logs + [today])
 
     def update_streak_label(self):
-        logs = sorted(set(self.ucfg.get("completion_log", [])))
-        if not logs:
-            self.streak_label.setText("🔥 Streak: 0")
-            return
-        streak = 0
-        cur = date.today()
-        logset = set(logs)
-        while cur.isoformat() in logset:
-            streak += 1
-            cur -= timedelta(days=1)
+        streak = streak_length(self.ucfg.get("completion_log", []))
         self.streak_label.setText(f"🔥 Streak: {streak}")
 
     # -------------------- Export / Import --------------------
     def export_tasks(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export Tasks", "tasks_export.json", "JSON Files (*.json)")
+        if self._transfer_job is not None:
+            return
+        path, chosen = QFileDialog.getSaveFileName(
+            self, "Export Tasks", "tasks_export.json", ";;".join(EXPORT_FILTERS)
+        )
         if not path:
             return
-        tasks_out = []
-        for task in db.get_tasks(self.user[0]):
-            task_id = task[0]
-            conn = db.get_connection(); cur = conn.cursor()
-            cur.execute("SELECT description FROM tasks WHERE id=?", (task_id,))
-            rr = cur.fetchone()
-            conn.close()
-            desc = (rr[0] if rr else "") or ""
-            tasks_out.append({
-                "id": task_id,
-                "title": task[2],
-                "description": desc,
-                "completed": bool(task[4]),
-                "due_date": task[5],
-                "priority": self.ucfg["priorities"].get(str(task_id), "low"),
-                "group": self.ucfg["task_groups"].get(str(task_id), "")
-            })
-
-        data = {
-            "user": {"id": self.user[0], "username": self.user[1]},
-            "exported_at": datetime.now().isoformat(timespec="seconds"),
-            "tasks": tasks_out,
-            "groups": self.ucfg.get("groups", [])
-        }
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            QMessageBox.information(self, "Export", "Tasks exported successfully.")
-        except Exception as e:
-            QMessageBox.warning(self, "Export Error", f"Failed to export tasks:\n{e}")
+        fmt = transfer.export_format_for(path, EXPORT_FILTERS.get(chosen, "json"))
+
+        def on_done(result):
+            if result["cancelled"]:
+                QMessageBox.information(self, "Export", "Export cancelled.")
+            else:
+                QMessageBox.information(self, "Export", f"Exported {result['exported']} tasks.")
+
+        def on_failed(error):
+            QMessageBox.warning(self, "Export Error", f"Failed to export tasks:\n{error['message']}")
+
+        self._run_transfer(
+            ExportJob(self.user[0], self.user[1], path, fmt, self),
+            "Export", "Exporting tasks… {} written", on_done, on_failed,
+        )
 
     def import_tasks(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Import Tasks", "", "JSON Files (*.json)")
-        if not path:
+        if self._transfer_job is not None:
             return
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            QMessageBox.warning(self, "Import Error", f"Invalid JSON file:\n{e}")
-            return
-
-        tasks = data.get("tasks", [])
-        if not isinstance(tasks, list):
-            QMessageBox.warning(self, "Import Error", "No tasks found in file.")
+        path, _ = QFileDialog.getOpenFileName(self, "Import Tasks", "",
+                                              "JSON Files (*.json *.ndjson *.jsonl)")
+        if not path:
             return
 
-        imported = 0
-        groups_from_file = set(data.get("groups", []))
-
-        sanitized = []
-        for t in tasks:
-            title = (t.get("title") or "").strip()
-            desc = (t.get("description") or "").strip()
-            due = (t.get("due_date") or None)
-            prio = (t.get("priority") or "low").lower()
-            grp = (t.get("group") or "").strip()
-            if not title:
-                continue
-            if due and not re.match(r"^\d{4}-\d{2}-\d{2}$", due):
-                due = None
-            sanitized.append((title, desc, due, prio, grp))
-
-        for title, desc, due, prio, grp in sanitized:
-            db.add_task(self.user[0], title, desc, due)
-            imported += 1
-
-        if imported:
-            tasks_now = db.get_tasks(self.user[0])
-            new_ids = [x[0] for x in tasks_now[-imported:]]
-            for (new_id, (title, desc, due, prio, grp)) in zip(new_ids, sanitized):
-                self.ucfg["priorities"][str(new_id)] = prio
-                if grp:
-                    self.ucfg["task_groups"][str(new_id)] = grp
-                    groups_from_file.add(grp)
-
-            for g in groups_from_file:
-                if g and g not in self.ucfg["groups"]:
-                    self.ucfg["groups"].append(g)
-
-            _save_cfg(self.cfg)
-            self.refresh_group_controls()
-            self.refresh_tasks()
-            QMessageBox.information(self, "Import", f"Imported {imported} tasks.")
-        else:
-            QMessageBox.information(self, "Import", "Nothing to import.")
+        def on_done(result):
+            self.store.load()  # rows arrived in chunks behind the store's back
+            imported = result["imported"]
+            if result["cancelled"]:
+                QMessageBox.information(self, "Import", f"Import cancelled after {imported} tasks.")
+            elif imported:
+                QMessageBox.information(self, "Import", f"Imported {imported} tasks.")
+            else:
+                QMessageBox.information(self, "Import", "Nothing to import.")
+
+        def on_failed(error):
+            self.store.load()  # earlier chunks may have committed
+            reason = IMPORT_ERRORS.get(error["kind"], "Error")
+            if error["rows"]:
+                text = (f"Import failed after {error['rows']} tasks; those tasks were kept.\n\n"
+                        f"{reason}: {error['message']}")
+            else:
+                text = f"Import failed. {reason}:\n{error['message']}"
+            QMessageBox.warning(self, "Import Error", text)
+
+        self._run_transfer(
+            ImportJob(self.user[0], path, self),
+            "Import", "Importing tasks… {} so far", on_done, on_failed,
+        )
+
+    def _run_transfer(self, job, title, label, on_done, on_failed):
+        """Start a transfer job behind a cancellable progress dialog."""
+        progress = QProgressDialog(label.format(0), "Cancel", 0, 1000, self)
+        progress.setWindowTitle(title)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        self._transfer_job = job
+
+        def on_progress(done, total, rows):
+            progress.setValue(int(1000 * done / total) if total else 1000)
+            progress.setLabelText(label.format(rows))
+
+        def finish(callback):
+            def handler(arg):
+                progress.close()
+                self._transfer_job = None
+                job.deleteLater()
+                callback(arg)
+            return handler
+
+        job.progress.connect(on_progress)
+        job.succeeded.connect(finish(on_done))
+        job.failed.connect(finish(on_failed))
+        progress.canceled.connect(job.cancel)
+        job.start()
 
     # -------------------- Settings actions --------------------
     def reset_xp(self):
@@ -1231,28 +1038,32 @@ class MainWindow(QWidget):
             self, "Reset XP", "Reset your XP to 0?",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         ) == QMessageBox.Yes:
-            conn = db.get_connection(); cur = conn.cursor()
-            cur.execute("UPDATE users SET xp = 0 WHERE id=?", (self.user[0],))
-            conn.commit(); conn.close()
-            self.refresh_user_info()
-            self.refresh_calendar_marks()
+            self.store.reset_xp()
 
     def clear_all_tasks(self):
         if QMessageBox.question(
             self, "Delete All Tasks", "Delete ALL your tasks?",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         ) == QMessageBox.Yes:
-            conn = db.get_connection(); cur = conn.cursor()
-            cur.execute("DELETE FROM tasks WHERE user_id=?", (self.user[0],))
-            conn.commit(); conn.close()
-            self.refresh_tasks()
+            self.store.delete_all()
 
     # -------------------- Helpers --------------------
+    def _on_busy_changed(self, busy):
+        if busy:
+            self._busy_timer.start()
+        else:
+            self._busy_timer.stop()
+            self.busy_bar.hide()
+
+    def _on_worker_failed(self, message):
+        QMessageBox.critical(self, "Database Error", message)
+
     def refresh_group_controls(self):
         # Add-task combo (blank by default; don't preserve previous text)
         self.group_combo.blockSignals(True)
         self.group_combo.clear()
-        for g in self.ucfg.get("groups", []):
+        groups = self.store.groups
+        for g in groups:
             self.group_combo.addItem(g)
         self.group_combo.setEditable(True)
         self.group_combo.setInsertPolicy(QComboBox.NoInsert)
@@ -1267,7 +1078,7 @@ class MainWindow(QWidget):
         self.group_filter.blockSignals(True)
         self.group_filter.clear()
         self.group_filter.addItem("All Groups")
-        for g in self.ucfg.get("groups", []):
+        for g in groups:
             self.group_filter.addItem(g)
         idx = 0
         for i in range(self.group_filter.count()):
@@ -1277,5 +1088,19 @@ class MainWindow(QWidget):
         self.group_filter.setCurrentIndex(idx)
         self.group_filter.blockSignals(False)
 
+    def changeEvent(self, e):
+        # another instance may have written the settings while we were in the background
+        if e.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.settings.reload_if_changed()
+            if self.ucfg.reload_if_changed():
+                self.scheduler.invalidate("user_info")
+        super().changeEvent(e)
+
     def closeEvent(self, e):
+        if self._transfer_job is not None:
+            self._transfer_job.cancel()
+            self._transfer_job.wait()
+        self.ucfg.flush()
+        self.settings.flush()
+        self.workers.wait()     # queued writes land before the database closes
         super().closeEvent(e)
@@ -0,0 +1,185 @@
+# ui/notification_panel.py
+from datetime import date
+
+from PyQt5.QtCore import Qt, QEvent, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (
+    QFrame, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPushButton, QMenu, QAbstractItemView
+)
+
+SNOOZE_CHOICES = (("15 minutes", 15), ("1 hour", 60), ("3 hours", 180))
+PANEL_WIDTH = 360
+PANEL_MAX_ROWS = 8
+
+
+class NotificationPanel(QFrame):
+    """
+    Non-modal reminder summary floating in the bottom-right corner of its
+    parent. Everything due in one scan lands in one list; items can be
+    dismissed or snoozed one at a time (or all at once). Snoozed items come
+    back after the delay if the task is still open and due today.
+    """
+
+    open_task = pyqtSignal(int)
+
+    def __init__(self, store, parent):
+        super().__init__(parent)
+        self.store = store
+        self.setObjectName("NotificationPanel")
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("#NotificationPanel { border: 1px solid palette(mid); border-radius: 10px; }")
+        self._items = {}        # task id -> QListWidgetItem
+        self._snoozed = {}      # task id -> QTimer
+
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(10, 8, 10, 10)
+        head = QHBoxLayout()
+        self.title = QLabel("")
+        self.title.setStyleSheet("font-weight: 600;")
+        close = QPushButton("✕")
+        close.setFlat(True)
+        close.setFixedWidth(28)
+        close.setToolTip("Hide (reminders stay listed)")
+        close.clicked.connect(self.hide)
+        head.addWidget(self.title, 1)
+        head.addWidget(close)
+        lay.addLayout(head)
+
+        self.list = QListWidget()
+        self.list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list.customContextMenuRequested.connect(self._context_menu)
+        self.list.itemDoubleClicked.connect(lambda it: self.open_task.emit(it.data(Qt.UserRole)))
+        lay.addWidget(self.list)
+
+        buttons = QHBoxLayout()
+        snooze = QPushButton("Snooze")
+        snooze.setToolTip("Snooze the selected reminders (all when none are selected)")
+        snooze.setMenu(self._snooze_menu(self._selected_or_all))
+        dismiss = QPushButton("Dismiss")
+        dismiss.setToolTip("Dismiss the selected reminders")
+        dismiss.clicked.connect(lambda: self.dismiss(self._selected_ids()))
+        dismiss_all = QPushButton("Dismiss all")
+        dismiss_all.clicked.connect(lambda: self.dismiss(list(self._items)))
+        buttons.addWidget(snooze)
+        buttons.addStretch(1)
+        buttons.addWidget(dismiss)
+        buttons.addWidget(dismiss_all)
+        lay.addLayout(buttons)
+
+        store.tasks_updated.connect(lambda pairs: self._drop_stale([new.id for _, new in pairs]))
+        store.tasks_removed.connect(lambda tasks: self.dismiss([t.id for t in tasks]))
+        store.reset.connect(lambda: self._drop_stale(list(self._items)))
+
+        parent.installEventFilter(self)
+        self.hide()
+
+    # -------------------- Public API --------------------
+    def add(self, tasks):
+        """Queue reminders for tasks (duplicates are ignored) and show the panel."""
+        for task in tasks:
+            tid = task.id
+            self._cancel_snooze(tid)
+            if tid in self._items:
+                continue
+            gtxt = f" [{task.group}]" if task.group else ""
+            item = QListWidgetItem(f"⚠️ {task.title}{gtxt}")
+            item.setData(Qt.UserRole, tid)
+            item.setToolTip("Double-click to show the task")
+            self.list.addItem(item)
+            self._items[tid] = item
+        self._update()
+
+    def dismiss(self, task_ids):
+        for tid in task_ids:
+            item = self._items.pop(tid, None)
+            if item is not None:
+                self.list.takeItem(self.list.row(item))
+            self._cancel_snooze(tid)
+        self._update()
+
+    def snooze(self, task_ids, minutes):
+        task_ids = [tid for tid in task_ids if tid in self._items]
+        self.dismiss(task_ids)
+        for tid in task_ids:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda t=tid: self._wake(t))
+            timer.start(minutes * 60 * 1000)
+            self._snoozed[tid] = timer
+
+    def pending(self) -> int:
+        return len(self._items)
+
+    # -------------------- Internals --------------------
+    def _still_due(self, tid):
+        task = self.store.get(tid)
+        if task is None or task.completed or task.due != date.today():
+            return None
+        return task
+
+    def _cancel_snooze(self, tid):
+        timer = self._snoozed.pop(tid, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+
+    def _wake(self, tid):
+        self._cancel_snooze(tid)
+        task = self._still_due(tid)
+        if task is not None:
+            self.add([task])
+
+    def _drop_stale(self, task_ids):
+        self.dismiss([tid for tid in task_ids if tid in self._items and self._still_due(tid) is None])
+
+    def _selected_ids(self):
+        return [it.data(Qt.UserRole) for it in self.list.selectedItems()]
+
+    def _selected_or_all(self):
+        return self._selected_ids() or list(self._items)
+
+    def _snooze_menu(self, ids_fn):
+        menu = QMenu(self)
+        for label, minutes in SNOOZE_CHOICES:
+            menu.addAction(label, lambda m=minutes: self.snooze(ids_fn(), m))
+        return menu
+
+    def _context_menu(self, pos):
+        item = self.list.itemAt(pos)
+        if item is None:
+            return
+        if not item.isSelected():
+            self.list.setCurrentItem(item)
+        menu = QMenu(self)
+        menu.addAction("Show task", lambda: self.open_task.emit(item.data(Qt.UserRole)))
+        menu.addAction("Dismiss", lambda: self.dismiss(self._selected_ids()))
+        snooze = self._snooze_menu(self._selected_ids)
+        snooze.setTitle("Snooze")
+        menu.addMenu(snooze)
+        menu.exec_(self.list.viewport().mapToGlobal(pos))
+
+    def _update(self):
+        n = len(self._items)
+        if not n:
+            self.hide()
+            return
+        self.title.setText(f"🔔 {n} task{'s' if n != 1 else ''} due today")
+        rows = min(n, PANEL_MAX_ROWS)
+        self.list.setFixedHeight(rows * self.list.sizeHintForRow(0) + 2 * self.list.frameWidth() + 4)
+        self.adjustSize()
+        self._place()
+        self.show()
+        self.raise_()
+
+    def _place(self):
+        parent = self.parentWidget()
+        self.setFixedWidth(min(PANEL_WIDTH, parent.width() - 24))
+        self.adjustSize()
+        self.move(parent.width() - self.width() - 12, parent.height() - self.height() - 12)
+
+    def eventFilter(self, obj, e):
+        if obj is self.parentWidget() and e.type() == QEvent.Resize and self.isVisible():
+            self._place()
+        return False
@@ -0,0 +1,94 @@
+# ui/refresh_scheduler.py
+from collections import Counter
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+class RefreshScheduler(QObject):
+    """
+    Coalesces view refreshes.
+
+    Views register a render callback under a name. Code that changes data
+    calls invalidate(name, ...) instead of re-rendering; every dirty view is
+    rendered once on the next event-loop tick, in registration order, no
+    matter how many times it was invalidated in between. invalidate_later()
+    debounces noisy sources such as search typing.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._handlers = {}          # name -> callback, in render order
+        self._dirty = set()
+        self._debounce = {}          # name -> single-shot QTimer
+        self.requested = Counter()   # invalidations per view
+        self.ran = Counter()         # actual renders per view
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def register(self, name, callback):
+        self._handlers[name] = callback
+
+    def invalidate(self, *names):
+        """Mark views dirty; they render once on the next tick."""
+        for name in names:
+            if name not in self._handlers:
+                raise KeyError(f"unknown view {name!r}")
+            self.requested[name] += 1
+            self._dirty.add(name)
+            pending = self._debounce.get(name)
+            if pending is not None:
+                pending.stop()  # the immediate pass covers it
+        if self._dirty and not self._timer.isActive():
+            self._timer.start()
+
+    def invalidate_later(self, name, delay_ms):
+        """Mark a view dirty after delay_ms of quiet; restarts on every call."""
+        if name not in self._handlers:
+            raise KeyError(f"unknown view {name!r}")
+        self.requested[name] += 1
+        timer = self._debounce.get(name)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda n=name: self._debounced(n))
+            self._debounce[name] = timer
+        timer.start(delay_ms)
+
+    def _debounced(self, name):
+        self._dirty.add(name)
+        self.flush()
+
+    def is_dirty(self, name) -> bool:
+        return name in self._dirty
+
+    def flush(self):
+        """Render every dirty view now (views dirtied meanwhile included)."""
+        self._timer.stop()
+        for name, callback in self._handlers.items():
+            if name in self._dirty:
+                self._dirty.discard(name)
+                self.ran[name] += 1
+                callback()
+        if self._dirty and not self._timer.isActive():
+            # dirtied by a later view for an earlier one; next tick
+            self._timer.start()
+
+    def stats(self) -> dict:
+        """{view: {"requested", "ran", "saved"}} since startup."""
+        return {
+            name: {
+                "requested": self.requested[name],
+                "ran": self.ran[name],
+                "saved": max(0, self.requested[name] - self.ran[name]),
+            }
+            for name in self._handlers
+        }
+
+    def summary(self) -> str:
+        stats = self.stats().values()
+        ran = sum(s["ran"] for s in stats)
+        saved = sum(s["saved"] for s in stats)
+        return f"{ran} refreshes run, {saved} coalesced"
@@ -0,0 +1,167 @@
+# ui/reminder_scheduler.py
+import heapq
+from datetime import date, datetime, timedelta
+
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+from db import database as db
+
+# longest the timer sleeps in one go; bounds how late we notice a wake from
+# sleep or a wall-clock change (QTimer runs on a monotonic clock)
+MAX_SLEEP_MS = 5 * 60 * 1000
+
+
+def _due_instant(task):
+    """Midnight starting the task's due date, or None without one."""
+    if task.due is None:
+        return None
+    return datetime.combine(task.due, datetime.min.time())
+
+
+class ReminderScheduler(QObject):
+    """
+    Emits due([task, ...]) once per task on the day it is due.
+
+    Keeps a min-heap of (due instant, task id, due date) for the store's
+    open tasks and a single-shot timer armed for the earliest one. Store
+    signals push new entries; stale ones (completed, deleted, re-dated)
+    are skipped when they surface. The day is re-checked on every wake-up,
+    so midnight and resuming from sleep rebuild the heap; the day's
+    already-reminded ids are read on the store's workers first.
+    """
+
+    due = pyqtSignal(list)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._heap = []
+        self._day = None
+        self._reminded = set()
+        self._loading_day = None    # day whose reminded ids are being read
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.check)
+
+        store.tasks_added.connect(self._on_added)
+        store.tasks_updated.connect(self._on_updated)
+        store.reset.connect(self._rebuild_and_check)
+        # removed tasks are dropped lazily when their entry surfaces
+
+        app = QGuiApplication.instance()
+        if isinstance(app, QGuiApplication):
+            app.applicationStateChanged.connect(self._on_app_state)
+
+    def start(self):
+        """Run the first check on the next event-loop tick."""
+        self._timer.start(0)
+
+    # -------------------- Heap --------------------
+    def _rebuild(self):
+        """Re-read today's reminded ids on a worker, then rebuild the heap and check."""
+        today = date.today()
+        self._loading_day = today
+        self.store.read(db.get_reminded, self.store.user_id, today.isoformat(), key="reminded",
+                        on_done=lambda ids: self._rebuilt(today, ids),
+                        on_error=self._rebuild_failed)
+
+    def _rebuilt(self, today, reminded):
+        self._loading_day = None
+        if self._day == today:
+            # fired since the read was queued; their mark_reminded may still be in flight
+            reminded |= self._reminded
+        self._day = today
+        self._reminded = reminded
+        self._build_heap()
+        self.check()
+
+    def _rebuild_failed(self, message):
+        self._loading_day = None
+        self.store.failed.emit(message)
+        self._timer.start(MAX_SLEEP_MS)     # try again later
+
+    def _build_heap(self):
+        today = self._day
+        floor = datetime.combine(today, datetime.min.time())
+        entries = []
+        for task in self.store.query(status="open", due_from=today.isoformat()):
+            when = _due_instant(task)
+            if when is not None and when >= floor:
+                entries.append((when, task.id, task.due_date))
+        heapq.heapify(entries)
+        self._heap = entries
+
+    def _push(self, task):
+        if task.completed:
+            return
+        when = _due_instant(task)
+        if when is None or when.date() < self._day:
+            return
+        heapq.heappush(self._heap, (when, task.id, task.due_date))
+        if when <= datetime.now():
+            self._timer.start(0)    # due already: check on the next tick
+        elif when <= self._heap[0][0]:
+            self._arm()
+
+    def _valid(self, task_id, due_val):
+        task = self.store.get(task_id)
+        return task is not None and not task.completed and task.due_date == due_val
+
+    # -------------------- Store signals --------------------
+    def _on_added(self, tasks):
+        if self._day is None:
+            return
+        for task in tasks:
+            self._push(task)
+
+    def _on_updated(self, pairs):
+        if self._day is None:
+            return
+        for old, new in pairs:
+            if new.due_date != old.due_date or (old.completed and not new.completed):
+                self._push(new)
+
+    def _rebuild_and_check(self):
+        if self._day is not None:
+            self._rebuild()
+
+    def _on_app_state(self, state):
+        if state == Qt.ApplicationActive and self._day is not None:
+            self.check()
+
+    # -------------------- Firing --------------------
+    def check(self):
+        """Emit everything due now, then sleep until the next due instant."""
+        today = date.today()
+        if self._day != today:
+            # first run, midnight, or woke up on a later day: check again once rebuilt
+            if self._loading_day != today:
+                self._rebuild()
+            return
+        now = datetime.now()
+        today = self._day.isoformat()
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id, due_val = heapq.heappop(self._heap)
+            if due_val != today or task_id in self._reminded:
+                continue
+            if self._valid(task_id, due_val):
+                self._reminded.add(task_id)
+                fired.append(self.store.get(task_id))
+        if fired:
+            self.store.write(db.mark_reminded, [t.id for t in fired], today)
+        if len(self._heap) > 2 * len(self.store) + 64:
+            self._build_heap()  # too many stale entries
+        self._arm()
+        if fired:
+            self.due.emit(fired)
+
+    def _arm(self):
+        now = datetime.now()
+        midnight = datetime.combine(self._day + timedelta(days=1), datetime.min.time())
+        target = min(self._heap[0][0], midnight) if self._heap else midnight
+        ms = int((target - now).total_seconds() * 1000) + 1
+        self._timer.start(max(0, min(ms, MAX_SLEEP_MS)))
+
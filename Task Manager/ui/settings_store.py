@@ -0,0 +1,193 @@
+# ui/settings_store.py
+import copy
+import json
+import os
+
+from PyQt5.QtCore import QObject, QTimer
+
+from services.config_files import write_json_atomic
+
+# quiet time after the last change before the file is rewritten
+FLUSH_DELAY_MS = 750
+
+_MISSING = object()
+
+
+def _path(key):
+    return tuple(key) if isinstance(key, (tuple, list)) else (key,)
+
+
+def _lookup(data, path):
+    for part in path:
+        if not isinstance(data, dict) or part not in data:
+            return _MISSING
+        data = data[part]
+    return data
+
+
+def _assign(data, path, value):
+    for part in path[:-1]:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    if value is _MISSING:
+        data.pop(path[-1], None)
+    else:
+        data[path[-1]] = copy.deepcopy(value)
+
+
+class SettingsStore(QObject):
+    """
+    A JSON settings file kept in memory.
+
+    Changes mark their key path dirty and are written together once no
+    change has arrived for FLUSH_DELAY_MS (or on flush()). Writes go to a
+    temp file that is renamed over the original, so a crash never leaves a
+    half-written file. If another instance rewrote the file since we last
+    read it (mtime/size changed), its contents are merged under our dirty
+    keys instead of being clobbered. With a WorkerPool the file is written
+    on its serial lane from a snapshot; a newer snapshot supersedes one
+    still waiting in the queue.
+    """
+
+    def __init__(self, path, defaults=None, delay_ms=FLUSH_DELAY_MS, workers=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.defaults = defaults or {}
+        self.workers = workers
+        self._dirty = set()         # key paths (tuples) changed since the last write
+        self._inflight = set()      # key paths in a snapshot not yet on disk
+        self._stamp = None          # (mtime_ns, size) of the file as we last saw it
+        self.writes = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+        self.data = self._read()
+
+    # -------------------- Disk --------------------
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read(self):
+        self._stamp = self._stat()
+        data = None
+        if self._stamp is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print("Error reading settings:", e)
+        if not isinstance(data, dict):
+            data = {}
+        for k, v in self.defaults.items():
+            data.setdefault(k, copy.deepcopy(v))
+        return data
+
+    def _merge_from_disk(self):
+        """Adopt the file's contents, keeping our unsaved changes on top."""
+        fresh = self._read()
+        for path in self._dirty:
+            _assign(fresh, path, _lookup(self.data, path))
+        self.data = fresh
+
+    def _saving(self):
+        return self.workers is not None and self.workers.pending(("settings", self.path))
+
+    def reload_if_changed(self) -> bool:
+        """Pick up edits made by another instance; True if there were any."""
+        if self._saving() or self._stat() == self._stamp:
+            return False
+        self._merge_from_disk()
+        return True
+
+    def flush(self):
+        """Write pending changes now (no-op when nothing is dirty)."""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        if not self._saving() and self._stat() != self._stamp:
+            self._merge_from_disk()
+        if self.workers is None:
+            try:
+                stamp = self._write(self.data)
+            except Exception as e:
+                print("Error saving settings:", e)
+                return
+            self._dirty.clear()
+            self._written(stamp)
+            return
+        self._inflight |= self._dirty
+        self._dirty.clear()
+        self.workers.run(self._write, copy.deepcopy(self.data), key=("settings", self.path),
+                         serial=True, on_done=self._written, on_error=self._write_failed)
+
+    def _write(self, data):
+        # runs on a pool thread with workers: touches nothing but the file
+        write_json_atomic(self.path, data)
+        return self._stat()
+
+    def _written(self, stamp):
+        self._stamp = stamp
+        self._inflight.clear()
+        self.writes += 1
+
+    def _write_failed(self, message):
+        print("Error saving settings:", message)
+        self._dirty |= self._inflight
+        self._inflight.clear()
+
+    # -------------------- Access --------------------
+    def get(self, key, default=None):
+        value = _lookup(self.data, _path(key))
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        path = _path(key)
+        if _lookup(self.data, path) == value:
+            return
+        _assign(self.data, path, value)
+        self.touch(path)
+
+    def touch(self, key):
+        """Mark a key dirty after mutating its value in place."""
+        self._dirty.add(_path(key))
+        self._timer.start()
+
+    def pop(self, key, default=None):
+        path = _path(key)
+        value = _lookup(self.data, path)
+        if value is _MISSING:
+            return default
+        _assign(self.data, path, _MISSING)
+        self.touch(path)
+        return value
+
+    def __contains__(self, key):
+        return _lookup(self.data, _path(key)) is not _MISSING
+
+
+def shard_section(store, key, path_for):
+    """
+    Move each entry of store[key] (a dict of buckets) into its own file at
+    path_for(name), then drop key from store. Files that already exist win.
+    """
+    buckets = store.get(key)
+    if not isinstance(buckets, dict):
+        return 0
+    moved = 0
+    for name, bucket in buckets.items():
+        target = path_for(name)
+        if not os.path.exists(target):
+            write_json_atomic(target, bucket)
+            moved += 1
+    store.pop(key)
+    store.flush()
+    return moved
@@ -0,0 +1,35 @@
+# ui/startup_trace.py
+"""
+Cold-start timeline for `python main.py --startup-trace`.
+
+Kept free of Qt imports so main.py can load it first. mark() is a no-op
+until enable() is called, so the calls can stay in the startup path.
+"""
+import sys
+import time
+
+_t0 = time.perf_counter()
+_last = _t0
+_enabled = False
+marks = []      # (label, ms since start)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def enabled():
+    return _enabled
+
+
+def mark(label):
+    """Record (and print) a point in the timeline with the time since start."""
+    global _last
+    if not _enabled:
+        return
+    now = time.perf_counter()
+    marks.append((label, (now - _t0) * 1000))
+    print(f"[startup] {(now - _t0) * 1000:8.1f} ms  (+{(now - _last) * 1000:6.1f})  {label}",
+          file=sys.stderr, flush=True)
+    _last = now
@@ -0,0 +1,240 @@
+# ui/task_model.py
+from datetime import date
+from functools import lru_cache
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QFontMetrics
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem
+
+TaskIdRole = Qt.UserRole        # int task id
+TaskRole = Qt.UserRole + 1      # the task row itself
+
+PRIORITY_ICONS = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+# past this many insert/remove runs a full reset is cheaper than the diff
+MAX_DIFF_RUNS = 256
+
+
+@lru_cache(maxsize=4096)
+def long_date(day) -> str:
+    """date -> 'August 22, 2025' (cached: many tasks share a due date)."""
+    return day.strftime("%B %d, %Y")
+
+
+def due_text(task, today) -> str:
+    """' (Due Today!)', ' (Due: August 22, 2025)' or ' (No due date)'."""
+    if not task.due_date:
+        return " (No due date)"
+    if task.due is None:
+        return f" (Due: {task.due_date})"
+    if task.due == today:
+        return " (Due Today!)"
+    return f" (Due: {long_date(task.due)})"
+
+
+def _runs(flags):
+    """[(start, end)] for each run of consecutive True values (inclusive)."""
+    runs, start = [], None
+    for i, flag in enumerate(flags):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            runs.append((start, i - 1))
+            start = None
+    if start is not None:
+        runs.append((start, len(flags) - 1))
+    return runs
+
+
+class TaskListModel(QAbstractListModel):
+    """
+    Flat list of task rows keyed by task id.
+
+    set_tasks() diffs the new rows against the current ones and emits
+    row inserts/removes/dataChanged, so the view keeps its selection and
+    scroll position; only reordering falls back to a model reset.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._ids = []
+        self._pos = {}      # task id -> row
+        self._text = {}     # task id -> cached display string
+        self._today = date.today()
+
+    # -------------------- Qt model API --------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self._display_text(task)
+        if role == TaskIdRole:
+            return task.id
+        if role == TaskRole:
+            return task
+        if role == Qt.ForegroundRole:
+            if not task.completed and task.due == self._today:
+                return QColor(Qt.red)
+        return None
+
+    # -------------------- Lookups --------------------
+    def task_id(self, row):
+        return self._ids[row] if 0 <= row < len(self._ids) else None
+
+    def row_of(self, task_id):
+        return self._pos.get(task_id, -1)
+
+    def task(self, task_id):
+        row = self._pos.get(task_id)
+        return self._rows[row] if row is not None else None
+
+    def _display_text(self, task):
+        text = self._text.get(task.id)
+        if text is None:
+            status = "✅" if task.completed else "❌"
+            picon = PRIORITY_ICONS.get(task.priority, "🟢")
+            badge = f"[{task.group}] " if task.group else ""
+            text = f"{status} {picon} [{task.id}] {badge}{task.title}{due_text(task, self._today)}"
+            self._text[task.id] = text
+        return text
+
+    # -------------------- Updates --------------------
+    def set_tasks(self, tasks):
+        """Make the model show tasks (in that order) with minimal signals."""
+        tasks = list(tasks)
+        today = date.today()
+        if today != self._today:
+            # "Due Today!" moved; every cached string may be stale
+            self._today = today
+            self._text.clear()
+
+        new_ids = [t.id for t in tasks]
+        new_set = set(new_ids)
+        old_set = set(self._ids)
+
+        removed = _runs([i not in new_set for i in self._ids])
+        inserted = _runs([i not in old_set for i in new_ids])
+        survivors = [i for i in self._ids if i in new_set]
+        same_order = survivors == [i for i in new_ids if i in old_set]
+        if not same_order or len(removed) + len(inserted) > MAX_DIFF_RUNS:
+            self._reset(tasks, new_ids)
+            return
+
+        for start, end in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for tid in self._ids[start:end + 1]:
+                self._text.pop(tid, None)
+            del self._ids[start:end + 1]
+            del self._rows[start:end + 1]
+            self.endRemoveRows()
+
+        for start, end in inserted:
+            # survivors keep their relative order, so new index == row
+            self.beginInsertRows(QModelIndex(), start, end)
+            self._ids[start:start] = new_ids[start:end + 1]
+            self._rows[start:start] = tasks[start:end + 1]
+            self.endInsertRows()
+
+        changed = [False] * len(tasks)
+        for row, task in enumerate(tasks):
+            if self._rows[row] != task:
+                self._rows[row] = task
+                self._text.pop(task.id, None)
+                changed[row] = True
+        self._pos = {tid: row for row, tid in enumerate(self._ids)}
+        for start, end in _runs(changed):
+            self.dataChanged.emit(self.index(start), self.index(end))
+
+    def _reset(self, tasks, ids):
+        self.beginResetModel()
+        self._rows = tasks
+        self._ids = ids
+        self._pos = {tid: row for row, tid in enumerate(ids)}
+        self._text.clear()
+        self.endResetModel()
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """
+    Paints one task row: status + priority icons, [id], a group chip, the
+    title and the due text right-aligned. No per-row widgets or strings
+    beyond what is on screen.
+    """
+
+    def __init__(self, parent=None, accent="#7AA2F7"):
+        super().__init__(parent)
+        self.accent = QColor(accent)
+
+    def set_accent(self, hex_color):
+        self.accent = QColor(hex_color)
+
+    def sizeHint(self, option, index):
+        fm = QFontMetrics(option.font)
+        return QSize(option.rect.width(), fm.height() + 14)
+
+    def paint(self, painter, option, index):
+        task = index.data(TaskRole)
+        if task is None:
+            return super().paint(painter, option, index)
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else None
+        if style is not None:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        selected = bool(opt.state & QStyle.State_Selected)
+        fg = opt.palette.highlightedText().color() if selected else opt.palette.text().color()
+        dim = QColor(fg)
+        dim.setAlphaF(0.6)
+
+        painter.save()
+        painter.setFont(opt.font)
+        fm = painter.fontMetrics()
+        rect = opt.rect.adjusted(8, 0, -8, 0)
+        x, cy = rect.left(), rect.center().y()
+        h = fm.height()
+        top = cy - h // 2
+
+        def text_at(txt, color):
+            nonlocal x
+            painter.setPen(color)
+            w = fm.horizontalAdvance(txt)
+            painter.drawText(QRect(x, top, w, h), Qt.AlignVCenter, txt)
+            x += w
+
+        status = "✅" if task.completed else "❌"
+        text_at(f"{status} {PRIORITY_ICONS.get(task.priority, '🟢')} ", fg)
+        text_at(f"[{task.id}] ", dim)
+
+        group = task.group or ""
+        if group:
+            chip_w = fm.horizontalAdvance(group) + 12
+            chip = QRect(x, top - 1, chip_w, h + 2)
+            chip_bg = QColor(self.accent)
+            chip_bg.setAlphaF(0.30)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(chip_bg)
+            painter.drawRoundedRect(chip, 6, 6)
+            painter.setPen(fg)
+            painter.drawText(chip, Qt.AlignCenter, group)
+            x += chip_w + 6
+
+        today = date.today()
+        due = due_text(task, today).strip(" ()")
+        due_w = fm.horizontalAdvance(due)
+        due_color = QColor(Qt.red) if (not task.completed and task.due == today) else dim
+        painter.setPen(due_color)
+        painter.drawText(QRect(rect.right() - due_w, top, due_w, h), Qt.AlignVCenter, due)
+
+        title_w = max(0, rect.right() - due_w - 12 - x)
+        painter.setPen(fg)
+        painter.drawText(QRect(x, top, title_w, h), Qt.AlignVCenter,
+                         fm.elidedText(task.title, Qt.ElideRight, title_w))
+        painter.restore()
@@ -0,0 +1,297 @@
+# ui/task_store.py
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from db import database as db
+
+
+def _sort_key(task):
+    # same order as SQL "ORDER BY due_date, id" (NULL due dates first)
+    return (task.due_date is not None, task.due_date or "", task.id)
+
+
+class TaskStore(QObject):
+    """
+    In-memory copy of one user's tasks, groups and XP.
+
+    Loaded once; reads are served from memory through secondary indexes
+    (due date, group, open/done). Writes go through to SQLite first and
+    then update memory and emit a signal, so views never re-query. With a
+    WorkerPool the SQLite side runs off the UI thread, in submit order.
+    """
+
+    tasks_added = pyqtSignal(list)      # [task row, ...]
+    tasks_updated = pyqtSignal(list)    # [(old row, new row), ...]
+    tasks_removed = pyqtSignal(list)    # [task row, ...] as they were
+    groups_changed = pyqtSignal()
+    xp_changed = pyqtSignal(int)
+    reset = pyqtSignal()
+    failed = pyqtSignal(str)            # a write or search raised
+
+    def __init__(self, user_id, workers=None, parent=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self.workers = workers
+        self.loaded = False
+        self._clear()
+
+    def _clear(self):
+        self._tasks = {}        # id -> row
+        self._by_due = {}       # "YYYY-MM-DD" | None -> {id}
+        self._by_group = {}     # group name | None -> {id}
+        self._open = set()
+        self._done = set()
+        self._sorted = None     # cached ids in display order
+        self.groups = []
+        self.xp = 0
+
+    # -------------------- Loading --------------------
+    def load(self):
+        """(Re)read everything; queued behind pending writes so it sees them."""
+        def work():
+            return db.get_tasks(self.user_id), db.get_groups(self.user_id), db.get_user_xp(self.user_id)
+        self.write(work, on_done=self._loaded)
+
+    def _loaded(self, result):
+        tasks, groups, xp = result
+        self._clear()
+        for task in tasks:
+            self._index(task)
+        self.groups = groups
+        self.xp = xp
+        self.loaded = True
+        self.reset.emit()
+
+    def _index(self, task):
+        tid = task.id
+        self._tasks[tid] = task
+        self._by_due.setdefault(task.due_date, set()).add(tid)
+        self._by_group.setdefault(task.group, set()).add(tid)
+        (self._done if task.completed else self._open).add(tid)
+        self._sorted = None
+
+    def _unindex(self, tid):
+        task = self._tasks.pop(tid, None)
+        if task is None:
+            return None
+        for index, key in ((self._by_due, task.due_date), (self._by_group, task.group)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(tid)
+                if not ids:
+                    del index[key]
+        self._open.discard(tid)
+        self._done.discard(tid)
+        self._sorted = None
+        return task
+
+    # -------------------- Reads --------------------
+    def __len__(self):
+        return len(self._tasks)
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def all(self):
+        return [self._tasks[i] for i in self._ordered_ids()]
+
+    def _ordered_ids(self):
+        if self._sorted is None:
+            self._sorted = [t.id for t in sorted(self._tasks.values(), key=_sort_key)]
+        return self._sorted
+
+    def query(self, search=None, status="all", group=None, priority=None,
+              due_on=None, due_from=None, due_to=None):
+        """
+        Same filters as db.find_tasks, answered from memory. Only a
+        non-empty search touches SQLite (the FTS index ranks the hits).
+        """
+        filters = dict(status=status, group=group, priority=priority,
+                       due_on=due_on, due_from=due_from, due_to=due_to)
+        search = (search or "").strip()
+        if search and db.has_fts():
+            return self._filter(db.search_task_ids(self.user_id, search), **filters)   # best match first
+        return self._filter(None, search, **filters)
+
+    def query_async(self, on_done, search=None, key="query", **filters):
+        """
+        query() with the FTS lookup on a worker; on_done(tasks) runs on the
+        UI thread. A newer call with the same key supersedes a pending one,
+        so results for stale search text are never shown.
+        """
+        if filters.get("status", "all") not in db.STATUSES:
+            raise ValueError(f"unknown status {filters['status']!r}")
+        search = (search or "").strip()
+        if self.workers is None or not (search and db.has_fts()):
+            if self.workers is not None:
+                self.workers.cancel(key)
+            on_done(self.query(search, **filters))
+            return
+        self.workers.run(db.search_task_ids, self.user_id, search, key=key,
+                         on_done=lambda ids: on_done(self._filter(ids, **filters)),
+                         on_error=self.failed.emit)
+
+    def _filter(self, order, search="", status="all", group=None, priority=None,
+                due_on=None, due_from=None, due_to=None):
+        """Tasks matching the filters, in the given id order (None = display order)."""
+        if status not in db.STATUSES:
+            raise ValueError(f"unknown status {status!r}")
+
+        # start from the most selective index available
+        candidates = None
+        for ids in (
+            self._by_due.get(due_on, set()) if due_on else None,
+            self._by_group.get(group, set()) if group else None,
+            self._open if status == "open" else self._done if status == "done" else None,
+        ):
+            if ids is not None:
+                candidates = ids if candidates is None else candidates & ids
+
+        def keep(task):
+            if candidates is not None and task.id not in candidates:
+                return False
+            if priority and task.priority != db.normalize_priority(priority):
+                return False
+            if due_from and (task.due_date is None or task.due_date < due_from):
+                return False
+            if due_to and (task.due_date is None or task.due_date > due_to):
+                return False
+            return True
+
+        if order is None:
+            if search:
+                needle = search.lower()
+                order = [i for i in self._ordered_ids()
+                         if needle in f"{self._tasks[i].title}\n{self._tasks[i].description or ''}".lower()]
+            elif candidates is not None and len(candidates) < len(self._tasks) // 4:
+                order = [t.id for t in sorted((self._tasks[i] for i in candidates), key=_sort_key)]
+            else:
+                order = self._ordered_ids()
+
+        out = []
+        for tid in order:
+            task = self._tasks.get(tid)
+            if task is not None and keep(task):
+                out.append(task)
+        return out
+
+    def read(self, fn, *args, key=None, on_done=None, on_error=None):
+        """
+        Run a SQLite read fn(*args) on the workers' read pool (inline without
+        workers) and hand its result to on_done on the UI thread. A newer
+        read with the same key supersedes a pending one. Failures go to
+        on_error(message), else emit failed(message).
+        """
+        self._submit(fn, args, False, key, on_done, on_error)
+
+    def _submit(self, fn, args, serial, key, on_done, on_error):
+        on_error = on_error or self.failed.emit
+        if self.workers is None:
+            try:
+                result = fn(*args)
+            except Exception as e:
+                on_error(str(e) or type(e).__name__)
+                return
+            if on_done is not None:
+                on_done(result)
+            return
+        self.workers.run(fn, *args, key=key, serial=serial, on_done=on_done, on_error=on_error)
+
+    # -------------------- Writes (SQLite first, then memory) --------------------
+    def write(self, fn, *args, on_done=None):
+        """
+        Run fn(*args) on the workers' serial lane (inline without workers)
+        and hand its result to on_done on the UI thread. Failures emit
+        failed(message) instead.
+        """
+        self._submit(fn, args, True, None, on_done, None)
+
+    def add(self, title, description, due_date, priority="low", group=None, on_done=None):
+        def work():
+            return db.get_task(db.add_task(self.user_id, title, description, due_date, priority, group))
+
+        def done(task):
+            self._note_group(group)
+            if task is not None:
+                self._index(task)
+                self.tasks_added.emit([task])
+            if on_done is not None:
+                on_done(task)
+        self.write(work, on_done=done)
+
+    def add_many(self, tasks, on_done=None):
+        """Bulk insert (see db.add_tasks_bulk); on_done gets the new ids in order."""
+        tasks = list(tasks)
+
+        def work():
+            ids = db.add_tasks_bulk(self.user_id, tasks)
+            return ids, db.get_tasks_by_ids(ids)
+
+        def done(result):
+            ids, added = result
+            for task in tasks:
+                if len(task) > 4:
+                    self._note_group(task[4])
+            for task in added:
+                self._index(task)
+            if added:
+                self.tasks_added.emit(added)
+            if on_done is not None:
+                on_done(ids)
+        self.write(work, on_done=done)
+
+    def complete(self, task_id):
+        if task_id not in self._tasks:
+            return
+
+        def work():
+            return db.complete_task(task_id, self.user_id), db.get_task(task_id)
+
+        def done(result):
+            completed, task = result
+            if not completed:
+                return      # already done (or gone): nothing changed, no XP
+            old = self._unindex(task_id)
+            if task is not None:
+                self._index(task)
+                if old is not None:
+                    self.tasks_updated.emit([(old, task)])
+            self.xp += 10
+            self.xp_changed.emit(self.xp)
+        self.write(work, on_done=done)
+
+    def delete(self, task_id):
+        if task_id not in self._tasks:
+            return
+
+        def done(_):
+            task = self._unindex(task_id)
+            if task is not None:
+                self.tasks_removed.emit([task])
+        self.write(db.delete_task, task_id, on_done=done)
+
+    def delete_all(self):
+        def done(_):
+            removed = [self._tasks[i] for i in self._ordered_ids()]
+            for task in removed:
+                self._unindex(task.id)
+            if removed:
+                self.tasks_removed.emit(removed)
+        self.write(db.delete_all_tasks, self.user_id, on_done=done)
+
+    def reset_xp(self):
+        def done(_):
+            self.xp = 0
+            self.xp_changed.emit(0)
+        self.write(db.reset_xp, self.user_id, on_done=done)
+
+    def add_group(self, name):
+        name = (name or "").strip()
+        if name and name not in self.groups:
+            self.write(db.add_group, self.user_id, name, on_done=lambda _: self._note_group(name))
+
+    def _note_group(self, name):
+        name = (name or "").strip()
+        if not name or name in self.groups:
+            return
+        self.groups.append(name)
+        self.groups_changed.emit()
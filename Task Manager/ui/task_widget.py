@@ -5,17 +5,17 @@ from db.database import complete_task, delete_task
 class TaskWidget(QWidget):
     def __init__(self, task, parent_window):
         super().__init__()
-        self.task = task  # (id, user_id, title, description, complete, due_date)
+        self.task = task  # db.models.Task
         self.parent_window = parent_window
 
         self.layout = QHBoxLayout()
 
         # Add a visual status symbol (✅/❌)
-        status = "✅" if task[4] else "❌"
-        self.label = QLabel(f"{status} [{task[0]}] {task[2]}")  # e.g. "❌ [3] Wash dishes"
+        status = "✅" if task.completed else "❌"
+        self.label = QLabel(f"{status} [{task.id}] {task.title}")  # e.g. "❌ [3] Wash dishes"
 
         # Show a button for marking complete only if not already done
-        self.complete_btn = QPushButton("✔️ Done" if task[4] else "Mark Done")
+        self.complete_btn = QPushButton("✔️ Done" if task.completed else "Mark Done")
         self.delete_btn = QPushButton("Delete")
 
         self.layout.addWidget(self.label)
@@ -23,7 +23,7 @@ class TaskWidget(QWidget):
         self.layout.addWidget(self.delete_btn)
         self.setLayout(self.layout)
 
-        if not task[4]:
+        if not task.completed:
             self.complete_btn.clicked.connect(self.mark_done)
         else:
             self.complete_btn.setDisabled(True)
@@ -31,17 +31,17 @@ class TaskWidget(QWidget):
         self.delete_btn.clicked.connect(self.confirm_delete)
 
     def mark_done(self):
-        complete_task(self.task[0], self.task[1])  # task_id, user_id
+        complete_task(self.task.id, self.task.user_id)  # task_id, user_id
         self.parent_window.refresh_tasks()
 
     def confirm_delete(self):
         reply = QMessageBox.question(
             self,
             "Confirm Deletion",
-            f"Are you sure you want to delete '{self.task[2]}'?",
+            f"Are you sure you want to delete '{self.task.title}'?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            delete_task(self.task[0])
+            delete_task(self.task.id)
             self.parent_window.refresh_tasks()
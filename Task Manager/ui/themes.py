@@ -0,0 +1,231 @@
+# ui/themes.py
+"""
+Stylesheets. The app-wide one is built per (theme, render mode) by
+compiled_qss() and cached; the accent overrides are a separate small
+sheet (accent_qss) for the main window, so changing the accent repolishes
+that window only, not the whole application.
+"""
+import re
+from functools import lru_cache
+
+# "quality": the full look, drop shadows included (Aurora);
+# "performance": flat opaque colours, square corners, no shadow effects
+RENDER_MODES = ("quality", "performance")
+
+# Aurora: glassy cards on blue-violet gradient (QSS-safe)
+AURORA_QSS = """
+QWidget {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                stop:0 #0f1424, stop:0.5 #151a2d, stop:1 #1b213a);
+    color: #EAF2FF; font-size: 14px;
+}
+QLabel { color: #EAF2FF; }
+
+/* Glass cards */
+QLineEdit, QTextEdit, QListView, QComboBox, QCalendarWidget,
+QTabWidget::pane, QProgressBar {
+    background: rgba(255,255,255,0.06);
+    border: 1px solid rgba(255,255,255,0.12);
+    border-radius: 12px;
+    padding: 6px;
+}
+QCalendarWidget QWidget { background: transparent; color: #EAF2FF; }
+
+/* Inputs focus ring (just border color) */
+QLineEdit:focus, QTextEdit:focus, QListView:focus, QComboBox:focus {
+    border: 1px solid #7AA2F7;
+}
+
+/* Buttons: gradient; no CSS filters */
+QPushButton {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #4A5EEA, stop:1 #6ED3FF);
+    color: #ffffff; border: 0; border-radius: 10px; padding: 7px 12px;
+}
+QPushButton:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #5567f0, stop:1 #7ae0ff);
+}
+QPushButton:pressed {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #3d54d9, stop:1 #55c7f5);
+}
+
+/* Secondary/chip look when property flat=true */
+QPushButton[flat="true"] {
+    background: rgba(255,255,255,0.08); color: #EAF2FF;
+    border: 1px solid rgba(255,255,255,0.12);
+}
+QPushButton[flat="true"]:hover {
+    border: 1px solid rgba(122,162,247,0.45);
+    background: rgba(122,162,247,0.12);
+}
+QPushButton[flat="true"]:pressed {
+    background: rgba(122,162,247,0.22);
+}
+
+/* Tabs */
+QTabBar::tab {
+    background: rgba(255,255,255,0.08);
+    color: #DDE9FF; padding: 8px 14px;
+    border: 1px solid rgba(255,255,255,0.12);
+    border-top-left-radius: 10px; border-top-right-radius: 10px;
+    margin-right: 6px;
+}
+QTabBar::tab:selected {
+    background: rgba(122,162,247,0.18); color: #FFFFFF;
+    border: 1px solid rgba(122,162,247,0.35);
+}
+
+/* Lists & selection */
+QListView::item { padding: 6px; margin: 3px 4px; border-radius: 8px; }
+QListView::item:selected { background: rgba(122,162,247,0.35); color: #FFFFFF; }
+
+/* Combo popup */
+QComboBox QAbstractItemView {
+    background: rgba(20,25,45,0.98);
+    color: #EAF2FF; border: 1px solid rgba(255,255,255,0.12);
+    selection-background-color: rgba(122,162,247,0.35);
+}
+
+/* Progress */
+QProgressBar { text-align: center; height: 18px; }
+QProgressBar::chunk {
+    background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
+                stop:0 #8A7DFF, stop:1 #4AD0FF);
+    border-radius: 8px;
+}
+
+/* Calendar tweaks (Aurora) */
+QCalendarWidget {
+    background: transparent;
+    color: #EAF2FF;
+}
+QCalendarWidget QTableView {
+    background: rgba(255,255,255,0.05); /* soft slate instead of black */
+    alternate-background-color: transparent;
+    outline: 0;
+}
+QCalendarWidget QTableView:item {
+    padding: 6px;
+}
+QCalendarWidget QToolButton {
+    background: rgba(255,255,255,0.10);
+    border: 1px solid rgba(255,255,255,0.15);
+    border-radius: 8px;
+    padding: 4px 10px;
+}
+QCalendarWidget QToolButton:hover {
+    background: rgba(255,255,255,0.16);
+}
+QCalendarWidget QMenu {
+    background: rgba(20,25,45,0.98);
+    color: #EAF2FF;
+    border: 1px solid rgba(255,255,255,0.12);
+}
+QCalendarWidget QSpinBox, 
+QCalendarWidget QComboBox {
+    background: rgba(255,255,255,0.10);
+    border: 1px solid rgba(255,255,255,0.15);
+    color: #EAF2FF;
+    border-radius: 6px;
+    padding: 2px 6px;
+}
+"""
+
+LIGHT_QSS = """
+QWidget { background: #ffffff; color: #111111; font-size: 14px; }
+QLabel { color: #222222; }
+QLineEdit, QTextEdit, QListView {
+    background: #ffffff; color: #111111; border: 1px solid #cfcfcf; border-radius: 6px; padding: 6px;
+}
+QPushButton {
+    background: #f3f3f3; color: #111111; border: 1px solid #cfcfcf; border-radius: 8px; padding: 6px 10px;
+}
+QPushButton:pressed { background: #e0e0e0; }
+QTabWidget::pane { border: 1px solid #cfcfcf; border-radius: 8px; }
+QTabBar::tab {
+    background: #f6f6f6; padding: 8px 12px; border: 1px solid #cfcfcf; border-bottom: none; border-top-left-radius: 8px; border-top-right-radius: 8px;
+}
+QTabBar::tab:selected { background: #ffffff; }
+QComboBox {
+    background: #ffffff; color: #111111; border: 1px solid #cfcfcf; border-radius: 6px; padding: 4px 8px;
+}
+QComboBox QAbstractItemView { background: #ffffff; color: #111111; selection-background-color: #e6f0ff; }
+QProgressBar { border: 1px solid #cfcfcf; border-radius: 6px; height: 16px; text-align: center; }
+"""
+
+DARK_QSS = """
+QWidget { background: #121212; color: #e6e6e6; font-size: 14px; }
+QLabel { color: #e6e6e6; }
+QLineEdit, QTextEdit, QListView {
+    background: #1e1e1e; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 6px; padding: 6px;
+}
+QPushButton {
+    background: #232323; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 8px; padding: 6px 10px;
+}
+QPushButton:pressed { background: #333333; }
+QTabWidget::pane { border: 1px solid #3a3a3a; border-radius: 8px; }
+QTabBar::tab {
+    background: #1a1a1a; padding: 8px 12px; border: 1px solid #3a3a3a; border-bottom: none; border-top-left-radius: 8px; border-top-right-radius: 8px; color: #cccccc;
+}
+QTabBar::tab:selected { background: #121212; color: #ffffff; }
+QComboBox {
+    background: #1e1e1e; color: #e6e6e6; border: 1px solid #3a3a3a; border-radius: 6px; padding: 4px 8px;
+}
+QComboBox QAbstractItemView { background: #1e1e1e; color: #e6e6e6; selection-background-color: #2a3c55; }
+QListView::item:selected { background: #2a3c55; }
+QProgressBar { border: 1px solid #3a3a3a; border-radius: 6px; height: 16px; text-align: center; }
+"""
+
+_THEME_QSS = {"aurora": AURORA_QSS, "light": LIGHT_QSS, "dark": DARK_QSS}
+
+
+def theme_qss(theme):
+    """Application-wide stylesheet for a theme name (unknown names get Light)."""
+    return _THEME_QSS.get((theme or "").lower(), LIGHT_QSS)
+
+
+@lru_cache(maxsize=None)
+def accent_qss(accent):
+    """Accent overrides for the main window; they work across all themes."""
+    return f"""
+QLineEdit:focus, QTextEdit:focus, QListView:focus {{ border: 1px solid {accent}; }}
+QListView::item:selected {{ background: {accent}; color: white; }}
+QPushButton:hover {{ border: 1px solid {accent}; }}
+QProgressBar::chunk {{ background-color: {accent}; }}
+"""
+
+
+# --- Performance mode ---------------------------------------------------------
+
+# opaque colour that translucent backgrounds are pre-blended onto
+_FLAT_BASE = {"aurora": "#151a2d", "light": "#ffffff", "dark": "#1e1e1e"}
+
+_GRADIENT = re.compile(r"qlineargradient\([^)]*?stop:0\s+(#[0-9A-Fa-f]{6})[^)]*\)")
+_RGBA = re.compile(r"rgba\((\d+),\s*(\d+),\s*(\d+),\s*([\d.]+)\)")
+_RADIUS = re.compile(r"(border(?:-\w+)*-radius):\s*\d+px")
+
+
+def _flatten(qss, base):
+    """Gradients -> their first stop, rgba -> blended onto base, rounded corners -> square."""
+    br, bg, bb = (int(base[i:i + 2], 16) for i in (1, 3, 5))
+
+    def blend(m):
+        r, g, b, a = int(m[1]), int(m[2]), int(m[3]), float(m[4])
+        return "#%02x%02x%02x" % tuple(round(c * a + under * (1 - a))
+                                       for c, under in ((r, br), (g, bg), (b, bb)))
+
+    qss = _GRADIENT.sub(r"\1", qss)
+    qss = _RGBA.sub(blend, qss)
+    return _RADIUS.sub(r"\1: 0px", qss)
+
+
+@lru_cache(maxsize=None)
+def compiled_qss(theme, mode="quality"):
+    """The application stylesheet for a theme and render mode."""
+    theme = (theme or "").lower()
+    qss = theme_qss(theme)
+    if mode == "performance":
+        qss = _flatten(qss, _FLAT_BASE.get(theme, "#ffffff"))
+    return qss
@@ -0,0 +1,80 @@
+# ui/transfer_jobs.py
+import sqlite3
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from db import database as db
+from db import transfer
+
+
+def error_kind(e):
+    """"parse", "database", "io" or "error" for an exception from a transfer."""
+    if isinstance(e, sqlite3.Error):
+        return "database"
+    if isinstance(e, OSError):
+        return "io"
+    if isinstance(e, ValueError):   # JSON decoding, bad encoding
+        return "parse"
+    return "error"
+
+
+class _TransferJob(QThread):
+    """
+    Runs one db.transfer call off the UI thread. fn(progress, cancelled)
+    does the transfer; progress(done, total, rows) is re-emitted as the
+    progress signal and cancelled() reports cancel().
+    """
+
+    progress = pyqtSignal(int, int, int)   # done, total, rows so far
+    succeeded = pyqtSignal(dict)           # the transfer function's result
+    failed = pyqtSignal(dict)              # {"kind": see error_kind, "message", "rows" done before it}
+
+    def __init__(self, fn, parent=None):
+        super().__init__(parent)
+        self._fn = fn
+        self._cancel = False
+        self.rows = 0       # rows committed (import) or written (export) so far
+
+    def cancel(self):
+        self._cancel = True
+
+    def _cancelled(self):
+        return self._cancel
+
+    def _progress(self, done, total, rows):
+        self.rows = rows
+        self.progress.emit(done, total, rows)
+
+    def run(self):
+        try:
+            result = self._fn(self._progress, self._cancelled)
+        except Exception as e:
+            self.failed.emit({"kind": error_kind(e), "message": str(e) or type(e).__name__,
+                              "rows": self.rows})
+        else:
+            self.succeeded.emit(result)
+        finally:
+            db.release_thread_connection()
+
+
+class ImportJob(_TransferJob):
+    """transfer.import_file; progress is bytes read of the file, rows are committed tasks."""
+
+    def __init__(self, user_id, path, parent=None):
+        super().__init__(
+            lambda progress, cancelled: transfer.import_file(
+                user_id, path, progress=progress, cancelled=cancelled),
+            parent,
+        )
+
+
+class ExportJob(_TransferJob):
+    """transfer.export_file; progress is rows written."""
+
+    def __init__(self, user_id, username, path, fmt, parent=None):
+        super().__init__(
+            lambda progress, cancelled: transfer.export_file(
+                user_id, username, path, fmt,
+                progress=lambda done, total: progress(done, total, done), cancelled=cancelled),
+            parent,
+        )
@@ -0,0 +1,146 @@
+# ui/workers.py
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+# threads for read jobs; serial jobs (all writes) run one at a time, in submit order
+READ_THREADS = 2
+
+
+class _JobSignals(QObject):
+    # created on the UI thread, so emits from a pool thread arrive queued
+    finished = pyqtSignal(object, object, object)   # job, result, error message
+
+
+class Job(QRunnable):
+    """One call of fn(*args, **kwargs) on a pool thread."""
+
+    def __init__(self, fn, args, kwargs, key=None, on_done=None, on_error=None):
+        super().__init__()
+        self.setAutoDelete(False)   # the pool keeps the Python object until delivery
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.signals = _JobSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Drop the result; a job that has not started yet never runs."""
+        self._cancelled = True
+
+    def cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        if self._cancelled:
+            self.signals.finished.emit(self, None, None)
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.finished.emit(self, None, str(e) or type(e).__name__)
+        else:
+            self.signals.finished.emit(self, result, None)
+
+
+class WorkerPool(QObject):
+    """
+    Runs blocking calls (SQLite, file I/O) off the UI thread.
+
+    run() queues fn on the read pool, or on the single serial thread with
+    serial=True (every write goes there, so writes land in submit order),
+    and calls on_done(result) / on_error(message) back on the
+    UI thread. A job submitted with a key supersedes the pending job with
+    the same key: it is pulled from the queue if it has not started, and
+    its result is dropped if it has. busy_changed tracks whether anything
+    is still outstanding, for busy indicators.
+    """
+
+    busy_changed = pyqtSignal(bool)
+    failed = pyqtSignal(str)        # errors of jobs submitted without on_error
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._reads = QThreadPool(self)
+        self._reads.setMaxThreadCount(READ_THREADS)
+        self._serial = QThreadPool(self)
+        self._serial.setMaxThreadCount(1)
+        for pool in (self._reads, self._serial):
+            pool.setExpiryTimeout(-1)   # threads (and their SQLite readers) stay up
+        self._jobs = set()
+        self._keyed = {}            # key -> latest job
+        self.ran = 0
+        self.superseded = 0
+
+    # -------------------- Submitting --------------------
+    def run(self, fn, *args, key=None, serial=False, on_done=None, on_error=None, **kwargs):
+        """Queue fn(*args, **kwargs); returns the Job (see Job.cancel)."""
+        if key is not None:
+            old = self._keyed.get(key)
+            if old is not None:
+                self._drop(old)
+        job = Job(fn, args, kwargs, key, on_done, on_error)
+        job.signals.finished.connect(self._finished)
+        job.pool = self._serial if serial else self._reads
+        if key is not None:
+            self._keyed[key] = job
+        self._jobs.add(job)
+        if len(self._jobs) == 1:
+            self.busy_changed.emit(True)
+        job.pool.start(job)
+        return job
+
+    def cancel(self, key):
+        """Cancel the pending job under key, if any."""
+        job = self._keyed.get(key)
+        if job is not None:
+            self._drop(job)
+
+    def _drop(self, job):
+        job.cancel()
+        self.superseded += 1
+        if job.pool.tryTake(job):
+            # never started: no finished signal will come
+            self._forget(job)
+
+    # -------------------- Delivery --------------------
+    def _finished(self, job, result, error):
+        if job not in self._jobs:
+            return
+        self._forget(job)
+        if job.cancelled():
+            return
+        self.ran += 1
+        if error is None:
+            if job.on_done is not None:
+                job.on_done(result)
+        elif job.on_error is not None:
+            job.on_error(error)
+        else:
+            self.failed.emit(error)
+
+    def _forget(self, job):
+        self._jobs.discard(job)
+        if job.key is not None and self._keyed.get(job.key) is job:
+            del self._keyed[job.key]
+        if not self._jobs:
+            self.busy_changed.emit(False)
+
+    # -------------------- State --------------------
+    def busy(self):
+        return bool(self._jobs)
+
+    def pending(self, key):
+        return key in self._keyed
+
+    def wait(self, msecs=-1):
+        """Block until queued work is done (shutdown); callbacks run on the next event-loop turn."""
+        ok = self._serial.waitForDone(msecs)
+        return self._reads.waitForDone(msecs) and ok
+
+    def drain(self):
+        """wait(), then deliver every result now (scripts and benchmarks)."""
+        while self._jobs:
+            self.wait()
+            QCoreApplication.processEvents()
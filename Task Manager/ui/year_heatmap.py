@@ -0,0 +1,196 @@
+# ui/year_heatmap.py
+from datetime import date, timedelta
+
+from PyQt5.QtCore import Qt, QRectF, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QToolTip
+
+# task count at which a day reaches full strength
+FULL_COUNT = 6
+GAP = 2
+TOP_PAD = 18        # month labels
+
+_EMPTY = QColor(34, 42, 64, int(255*0.28))
+_OPEN = QColor(110, 118, 140)   # what an all-open day drifts towards
+
+
+def _blend(a, b, t):
+    return QColor(
+        round(a.red() + (b.red() - a.red()) * t),
+        round(a.green() + (b.green() - a.green()) * t),
+        round(a.blue() + (b.blue() - a.blue()) * t),
+    )
+
+
+class YearHeatmap(QWidget):
+    """
+    One year as a 53 x 7 grid of day cells (weeks across, Monday on top).
+
+    Shade strength follows the number of tasks due that day; hue runs
+    from grey (all open) to the accent colour (all done). Colours are
+    computed once per year/accent change; paintEvent only fills rects.
+    """
+
+    day_clicked = pyqtSignal(object)    # datetime.date
+
+    def __init__(self, counts, accent="#7AA2F7", parent=None):
+        super().__init__(parent)
+        self.counts = counts
+        self.accent = QColor(accent)
+        self.year = date.today().year
+        self._cells = []        # (date, column, row, QColor, total, done)
+        self._stale = True      # rebuilt on the next paint, so a hidden view costs nothing
+        counts.loaded.connect(lambda year: year == self.year and self._rebuild())
+        self.setMouseTracking(True)
+        self.setMinimumSize(self._left_pad() + 53 * 9, TOP_PAD + 7 * 9)
+
+    # -------------------- Data --------------------
+    def set_year(self, year):
+        if year != self.year:
+            self.year = year
+            self._rebuild()
+
+    def set_accent(self, hex_color):
+        self.accent = QColor(hex_color)
+        self._rebuild()
+
+    def refresh(self):
+        """Re-read the year's counts (cached until a task in that year changes)."""
+        self._rebuild()
+
+    def _rebuild(self):
+        self._stale = True
+        self.update()
+
+    def _build_cells(self):
+        counts = self.counts.get(self.year)
+        # still loading: draw an empty year now, the real one on loaded()
+        self._stale = counts is None
+        counts = counts or {}
+        jan1 = date(self.year, 1, 1)
+        start = jan1 - timedelta(days=jan1.weekday())
+        cells = []
+        day = jan1
+        one = timedelta(days=1)
+        while day.year == self.year:
+            total, incomplete = counts.get(day.isoformat(), (0, 0))
+            if total:
+                done = total - incomplete
+                color = _blend(_OPEN, self.accent, done / total)
+                color.setAlphaF(0.35 + 0.65 * min(total, FULL_COUNT) / FULL_COUNT)
+            else:
+                done = 0
+                color = _EMPTY
+            cells.append((day, (day - start).days // 7, day.weekday(), color, total, done))
+            day += one
+        self._cells = cells
+
+    # -------------------- Geometry --------------------
+    def _left_pad(self):
+        # room for the weekday labels
+        return self.fontMetrics().horizontalAdvance("Wed") + 8
+
+    def _cell_size(self):
+        w = (self.width() - self._left_pad()) / 53
+        h = (self.height() - TOP_PAD) / 7
+        return max(4.0, min(w, h))
+
+    def _cell_at(self, pos):
+        if self._stale:
+            self._build_cells()
+        size = self._cell_size()
+        left = self._left_pad()
+        col = int((pos.x() - left) // size)
+        row = int((pos.y() - TOP_PAD) // size)
+        if pos.x() < left or pos.y() < TOP_PAD or not 0 <= row < 7:
+            return None
+        for cell in self._cells[max(0, col * 7 - 7):col * 7 + 7]:
+            if cell[1] == col and cell[2] == row:
+                return cell
+        return None
+
+    # -------------------- Painting --------------------
+    def paintEvent(self, e):
+        if self._stale:
+            self._build_cells()
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
+        size = self._cell_size()
+        left = self._left_pad()
+        inner = size - GAP
+        text = self.palette().text().color()
+        dim = QColor(text)
+        dim.setAlphaF(0.6)
+
+        p.setPen(dim)
+        for label, row in (("Mon", 0), ("Wed", 2), ("Fri", 4)):
+            p.drawText(QRectF(0, TOP_PAD + row * size, left - 4, size),
+                       Qt.AlignRight | Qt.AlignVCenter, label)
+
+        p.setPen(Qt.NoPen)
+        today = date.today()
+        today_rect = None
+        for day, col, row, color, _total, _done in self._cells:
+            rect = QRectF(left + col * size, TOP_PAD + row * size, inner, inner)
+            p.setBrush(color)
+            p.drawRoundedRect(rect, 2, 2)
+            if day.day == 1:
+                p.setPen(dim)
+                p.drawText(QRectF(rect.left(), 0, size * 4, TOP_PAD - 2),
+                           Qt.AlignLeft | Qt.AlignBottom, day.strftime("%b"))
+                p.setPen(Qt.NoPen)
+            if day == today:
+                today_rect = rect
+        if today_rect is not None:
+            p.setBrush(Qt.NoBrush)
+            p.setPen(QPen(text, 1.5))
+            p.drawRoundedRect(today_rect, 2, 2)
+        p.end()
+
+    # -------------------- Mouse --------------------
+    def mouseMoveEvent(self, e):
+        cell = self._cell_at(e.pos())
+        if cell is None:
+            QToolTip.hideText()
+            return
+        day, _col, _row, _color, total, done = cell
+        tip = day.strftime("%a, %b %d, %Y") + (f"\n{total} due, {done} done" if total else "\nNo tasks")
+        QToolTip.showText(e.globalPos(), tip, self)
+
+    def mousePressEvent(self, e):
+        cell = self._cell_at(e.pos())
+        if cell is not None and e.button() == Qt.LeftButton:
+            self.day_clicked.emit(cell[0])
+
+
+class YearView(QWidget):
+    """YearHeatmap with previous/next year buttons."""
+
+    def __init__(self, counts, accent="#7AA2F7", parent=None):
+        super().__init__(parent)
+        self.heatmap = YearHeatmap(counts, accent)
+        prev_btn = QPushButton("◀")
+        next_btn = QPushButton("▶")
+        this_btn = QPushButton("This year")
+        for btn in (prev_btn, next_btn):
+            btn.setFixedWidth(36)
+        prev_btn.clicked.connect(lambda: self.show_year(self.heatmap.year - 1))
+        next_btn.clicked.connect(lambda: self.show_year(self.heatmap.year + 1))
+        this_btn.clicked.connect(lambda: self.show_year(date.today().year))
+        self.year_label = QLabel()
+        self.year_label.setAlignment(Qt.AlignCenter)
+        self.year_label.setStyleSheet("font-weight: 600;")
+
+        head = QHBoxLayout()
+        head.addWidget(prev_btn)
+        head.addWidget(self.year_label, 1)
+        head.addWidget(next_btn)
+        head.addWidget(this_btn)
+        lay = QVBoxLayout(self)
+        lay.addLayout(head)
+        lay.addWidget(self.heatmap, 1)
+        self.show_year(self.heatmap.year)
+
+    def show_year(self, year):
+        self.heatmap.set_year(year)
+        self.year_label.setText(str(year))